@@ -0,0 +1,141 @@
+"""Compare the CSV and SQLite inventory backends on a real catalogue.
+
+Runs search (autocomplete prefixes), lookup (full names) and checkout
+(update_stock + save per cart) against copies of the data, so the real
+files are never modified.
+
+Usage:
+    python benchmarks/backends.py [--csv data/barang.csv] [--db db/app.db]
+"""
+from __future__ import annotations
+import os
+import sys
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import time_each, time_once, write_results
+from config.manager import ConfigManager
+from models.inventory_repository import repository_class
+
+
+def build_db_from_csv(csv_path: Path, db_path: Path) -> None:
+    """Create a SQLite copy of the catalogue using the migration script's steps."""
+    from models.database_manager import DatabaseManager
+    from scripts.migrate_csv_to_sqlite import read_csv, transform, load_to_db
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    df, _ = transform(read_csv(csv_path))
+    load_to_db(db, df, batch_size=1000)
+
+
+def copy_db(src: Path, dst: Path) -> None:
+    """Copy a SQLite file consistently via the online backup API."""
+    with sqlite3.connect(str(src)) as s, sqlite3.connect(str(dst)) as d:
+        s.backup(d)
+
+
+def catalogue_names(db_path: Path) -> list[str]:
+    with sqlite3.connect(str(db_path)) as conn:
+        return [r[0] for r in conn.execute("SELECT name FROM items WHERE active=1")]
+
+
+def make_workload(names: list[str], queries: int, carts: int, cart_size: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    sample = [rng.choice(names) for _ in range(queries)] if names else []
+    prefixes = []
+    for name in sample:
+        # What autocomplete sends while typing: growing lower-case prefixes
+        word = name.lower()
+        for n in range(2, min(len(word), 8) + 1):
+            prefixes.append(word[:n])
+    cart_list = [[rng.choice(names) for _ in range(cart_size)] for _ in range(carts)] if names else []
+    return {"search": prefixes, "lookup": sample, "checkout": cart_list}
+
+
+def run_backend(source: str, config: ConfigManager, workload: dict) -> dict:
+    config._data.setdefault("data", {})["source"] = source
+    backend = repository_class(source)
+    open_ms, repo = time_once(lambda: backend.from_config(config))
+    # Second open hits warm caches (catalogue snapshot, OS page cache)
+    reopen_ms, repo = time_once(lambda: backend.from_config(config))
+
+    def checkout(cart):
+        for name in cart:
+            row = repo.get_item(name)
+            repo.update_stock(row["Item"], int(row["Stock"]) - 1)
+        repo.save()
+
+    return {
+        "open_ms": open_ms,
+        "reopen_ms": reopen_ms,
+        "search": time_each(repo.get_suggestions, workload["search"]),
+        "lookup": time_each(repo.get_item, workload["lookup"]),
+        "checkout": time_each(checkout, workload["checkout"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV vs SQLite inventory backends")
+    parser.add_argument('--csv', dest='csv_path', default=None, help='Catalogue CSV (default: from config)')
+    parser.add_argument('--db', dest='db_path', default=None, help='SQLite DB (default: migrate the CSV into a temp DB)')
+    parser.add_argument('--backends', default='csv,sqlite', help='Comma-separated backends to run')
+    parser.add_argument('--queries', type=int, default=200, help='Names sampled for search/lookup')
+    parser.add_argument('--carts', type=int, default=20, help='Checkouts to run')
+    parser.add_argument('--cart-size', type=int, default=5, help='Lines per checkout')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help='Results JSON path')
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    csv_src = Path(args.csv_path or (ROOT / cfg.csv_path)).resolve()
+    db_src = Path(args.db_path).resolve() if args.db_path else None
+
+    with tempfile.TemporaryDirectory(prefix='inv-bench-') as tmp:
+        tmp = Path(tmp)
+        csv_path, db_path = tmp / 'barang.csv', tmp / 'app.db'
+        shutil.copy2(csv_src, csv_path)
+        if db_src is not None and db_src.exists():
+            copy_db(db_src, db_path)
+        else:
+            build_db_from_csv(csv_path, db_path)
+
+        config = ConfigManager(tmp / 'config.json')
+        config._data.setdefault("data", {}).update({"csv_path": str(csv_path), "db_path": str(db_path)})
+        workload = make_workload(catalogue_names(db_path), args.queries, args.carts, args.cart_size, args.seed)
+
+        # Keep the catalogue cache and DB logs inside the temp dir
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            results = {"catalogue": {"csv": str(csv_src), "db": str(db_src or 'migrated from csv'), "items": len(catalogue_names(db_path))}}
+            for source in [s.strip() for s in args.backends.split(',') if s.strip()]:
+                try:
+                    results[source] = run_backend(source, config, workload)
+                except Exception as e:
+                    results[source] = {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            os.chdir(cwd)
+
+    out = write_results('backends', results, args.out)
+    for source in ('csv', 'sqlite'):
+        r = results.get(source)
+        if not r:
+            continue
+        if 'error' in r:
+            print(f"{source:7s} error: {r['error']}")
+            continue
+        print(f"{source:7s} open {r['open_ms']:.1f} ms | search p50 {r['search']['p50_ms']:.3f} ms p95 {r['search']['p95_ms']:.3f} ms"
+              f" | lookup p50 {r['lookup']['p50_ms']:.3f} ms | checkout p50 {r['checkout']['p50_ms']:.3f} ms")
+    print(f"results: {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Compare two benchmark result files and flag regressions.
+
+Every numeric `*_ms` value present in both files is compared, except the
+noisy max/p99/total summary fields unless `--all-stats` is given; a metric
+regresses when it grew by more than `--threshold` percent and by more than
+`--min-ms` milliseconds (to ignore noise on sub-millisecond timings).
+Exits with status 1 when any regression is found.
+
+Usage:
+    python benchmarks/compare.py logs/benchmarks/base.json logs/benchmarks/new.json
+"""
+from __future__ import annotations
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+# Summary fields dominated by single outliers
+NOISY_STATS = {"max_ms", "p99_ms", "total_ms"}
+
+
+def flatten(node: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """Yield (dotted.path, value) for every numeric `*_ms` leaf."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and str(key).endswith("_ms"):
+                yield path, float(value)
+            else:
+                yield from flatten(value, path)
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float, min_ms: float,
+            all_stats: bool = False) -> Dict[str, list]:
+    old = dict(flatten(base.get("results", base)))
+    cur = dict(flatten(new.get("results", new)))
+    if not all_stats:
+        old = {k: v for k, v in old.items() if k.rsplit(".", 1)[-1] not in NOISY_STATS}
+        cur = {k: v for k, v in cur.items() if k.rsplit(".", 1)[-1] not in NOISY_STATS}
+    report: Dict[str, list] = {"regressions": [], "improvements": [], "missing": sorted(set(old) - set(cur))}
+    for path in sorted(set(old) & set(cur)):
+        a, b = old[path], cur[path]
+        diff = b - a
+        pct = (diff / a * 100.0) if a else float("inf") if diff else 0.0
+        entry = {"metric": path, "base_ms": a, "new_ms": b, "change_pct": round(pct, 1)}
+        if diff > min_ms and pct > threshold:
+            report["regressions"].append(entry)
+        elif -diff > min_ms and -pct > threshold:
+            report["improvements"].append(entry)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON results")
+    parser.add_argument('base', help='Baseline results JSON')
+    parser.add_argument('new', help='New results JSON')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Regression threshold in percent')
+    parser.add_argument('--min-ms', type=float, default=0.5, help='Ignore absolute changes below this')
+    parser.add_argument('--all-stats', action='store_true', help='Also compare max/p99/total fields')
+    parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+    args = parser.parse_args()
+
+    base = json.loads(Path(args.base).read_text(encoding='utf-8'))
+    new = json.loads(Path(args.new).read_text(encoding='utf-8'))
+    report = compare(base, new, args.threshold, args.min_ms, args.all_stats)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for label in ("regressions", "improvements"):
+            print(f"{label}: {len(report[label])}")
+            for e in report[label]:
+                print(f"  {e['metric']}: {e['base_ms']:.3f} -> {e['new_ms']:.3f} ms ({e['change_pct']:+.1f}%)")
+        if report["missing"]:
+            print(f"missing in new run: {len(report['missing'])}")
+    sys.exit(1 if report["regressions"] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Reorder forecast for all items: vectorized engine vs a per-item Python loop.
+
+Builds (or reuses) the same history as `range_queries.py`, then times:
+
+- `cold`: `ReorderForecaster.forecast` with an empty cache (one grouped
+  query + NumPy over the items x days matrix)
+- `cached`: the same call again with no new transactions
+- `after_write`: one checkout later (the cache is invalidated, so this is
+  a full recomputation)
+- `loop`: the straightforward version: one query per item for its daily
+  OUT totals, mean/std in Python. It runs on `--loop-items` items and is
+  extrapolated to the catalogue.
+
+The loop's rates must match the engine's for the items it covered; a
+mismatch aborts the run.
+
+Usage:
+    python benchmarks/forecast.py --lines 2000000
+    python benchmarks/forecast.py --lines 200000 --db /tmp/hist.db   # reuse a generated DB
+"""
+from __future__ import annotations
+import sys
+import json
+import math
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import time_once, write_results
+from benchmarks.range_queries import build
+from models.checkout import CheckoutRepository
+from models.stock_history import epoch_day
+from reports.forecast import ReorderForecaster
+
+END = datetime(2026, 1, 1)
+
+
+def loop_rates(conn, item_ids, start_day: int, end_day: int):
+    """Per-item daily OUT totals and mean/std in plain Python (created before the window)."""
+    days = end_day - start_day + 1
+    rates = {}
+    for item_id in item_ids:
+        per_day = dict(conn.execute(
+            """
+            SELECT ti.created_day, SUM(ti.quantity)
+            FROM transaction_items ti JOIN transactions t ON t.id = ti.transaction_id
+            WHERE ti.item_id = ? AND ti.created_day BETWEEN ? AND ? AND t.transaction_type = 'OUT'
+            GROUP BY ti.created_day
+            """,
+            (item_id, start_day, end_day),
+        ).fetchall())
+        series = [per_day.get(d, 0) for d in range(start_day, end_day + 1)]
+        mean = sum(series) / days
+        rates[item_id] = (mean, math.sqrt(sum((q - mean) ** 2 for q in series) / days))
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the vectorized reorder forecast against a per-item loop")
+    parser.add_argument('--lines', type=int, default=2_000_000, help='transaction_items rows to generate')
+    parser.add_argument('--days', type=int, default=730, help='History length in days')
+    parser.add_argument('--items', type=int, default=20000, help='Catalogue size')
+    parser.add_argument('--window', type=int, default=28, help='Forecast window in days')
+    parser.add_argument('--loop-items', type=int, default=1000, help='Items timed with the per-item loop')
+    parser.add_argument('--db', default=None, help='Reuse/keep the generated DB at this path (one checkout is added)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help='Results JSON path (default: logs/benchmarks/forecast-<ts>.json)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='inv-forecast-') as tmp:
+        db_path = Path(args.db) if args.db else Path(tmp) / 'history.db'
+        build_ms, db = time_once(lambda: build(db_path, args.lines, args.days, args.items, args.seed, END))
+        # The generated history ends at END; forecast as of its last day
+        as_of = db.query_one("SELECT date(MAX(created_at)) FROM transactions")[0]
+        forecaster = ReorderForecaster(db, window_days=args.window)
+        cold_ms, frame = time_once(lambda: forecaster.forecast(as_of))
+        cached_ms, _ = time_once(lambda: forecaster.forecast(as_of))
+        code = db.query_one("SELECT code FROM items WHERE active = 1 ORDER BY id LIMIT 1")[0]
+        CheckoutRepository(db).checkout([(code, 1)], 'bench', allow_negative=True)
+        after_ms, frame = time_once(lambda: forecaster.forecast(as_of))
+
+        end_day = epoch_day(as_of)
+        start_day = end_day - args.window + 1
+        sample = frame["item_id"].head(args.loop_items).tolist()
+        with db.connect() as conn:
+            loop_ms, rates = time_once(lambda: loop_rates(conn, sample, start_day, end_day))
+        engine = frame.set_index("item_id")
+        for item_id, (mean, std) in rates.items():
+            row = engine.loc[item_id]
+            if abs(row["daily_rate"] - mean) > 1e-3 or abs(row["demand_std"] - std) > 1e-3:
+                raise SystemExit(f"item {item_id}: engine {row['daily_rate']}/{row['demand_std']} vs loop {mean}/{std}")
+
+        results = {
+            "lines": db.query_one("SELECT COUNT(*) FROM transaction_items")[0],
+            "items": len(frame),
+            "build_ms": build_ms,
+            "cold_ms": cold_ms,
+            "cached_ms": cached_ms,
+            "after_write_ms": after_ms,
+            "loop_ms": loop_ms,
+            "loop_items": len(sample),
+            "loop_all_items_ms_est": round(loop_ms * len(frame) / max(1, len(sample)), 1),
+            "suggestions": int((frame["suggested_qty"] > 0).sum()),
+        }
+
+    results["params"] = {k: v for k, v in vars(args).items() if k != 'out'}
+    out = write_results('forecast', results, args.out)
+    print(json.dumps({k: v for k, v in results.items() if k not in ('params', 'build_ms')}, indent=2))
+    print(f"results: {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""Synthetic data generators shaped like `data/barang.csv`.
+
+Catalogues use Indonesian grocery-style names ("Minyak Kita 1 l *12"),
+groups (BUMBU, PLASTIK, ...) and units (Krt, Sak, Bal, ...). Transaction
+histories keep `stock_before`/`stock_after` consistent with `items.current_stock`.
+All generators are deterministic for a given seed.
+"""
+from __future__ import annotations
+import calendar
+import csv
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+# group -> (base names, brands, sizes, units)
+VOCABULARY: Dict[str, tuple] = {
+    "BUMBU": (["Kecap", "Sambal", "Saos Tomat", "Terasi", "Masako", "Royco", "Lada", "Ketumbar", "Santan", "Garam", "Petis", "Penyedap"],
+              ["ABC", "Bango", "Sasa", "Indofood", "Kara", "Hoki", "Puger", "Ajinomoto"],
+              ["100 gr", "200 ml", "600 gr", "1 kg", "250 gr", "Renceng", "Sachet"], ["Krt", "Bal", "Sak", "Pcs"]),
+    "PLASTIK": (["Plastik Cetik", "Kantong Kresek", "Sedotan", "Mika", "Gelas Plastik", "Tisu", "Sendok Plastik"],
+                ["Pollo", "Raja Warna", "Dakon", "Lux", "See U", "Merak"],
+                ["7*10", "15*32", "kt5-20", "Putih", "Hitam", "Jumbo"], ["Sak", "Bal", "Krt"]),
+    "MINYAK": (["Minyak Goreng", "Minyak Kita", "Minyak Sania", "Minyak Letizia", "Mentega"],
+               ["Bimoli", "Filma", "Tropical", "Kita", "Blue Band"],
+               ["1 l", "2 l", "Btl", "Pouch", "18 l"], ["Krt", "Jrg"]),
+    "BERAS": (["Beras", "Beras Pandan Wangi", "Beras Merah", "Ketan"],
+              ["Bulog", "Rojo Lele", "Setra Ramos", "Maknyus"],
+              ["5kg", "10kg", "25 kg", "50 kg"], ["Sak"]),
+    "MINUMAN": (["Air Mineral", "Teh Botol", "Kopi Susu", "Sirup", "Jus"],
+                ["Aqua", "Sosro", "Redafan", "ABC", "Marjan"],
+                ["Gelas", "600 ml", "1.5 l", "Btl", "Kaleng"], ["Krt"]),
+    "KUE": (["Vanili Bubuk", "Pasta Cokelat", "Baking Powder", "Pewarna", "Meses"],
+            ["Kopoe", "Koepoe", "Ceres", "Colatta"],
+            ["35gr", "60 ml", "100 gr", "1 kg"], ["Krt"]),
+    "SABUN": (["Sabun Cuci", "Sabun Mandi", "Pepsodent", "Deterjen", "Pembersih Lantai"],
+              ["Rinso", "Lifebuoy", "Sunlight", "So Klin", "Wipol"],
+              ["190 gr", "800 ml", "3 kg", "12 kg", "Ember"], ["Krt", "Emb"]),
+    "MIE": (["Mie Instan", "Bihun", "Soun", "Mie Telor"],
+            ["Indomie", "Sedaap", "Naga", "Sarimi"],
+            ["Goreng", "Soto", "250gr", "Kari Ayam"], ["Krt", "Bal"]),
+    "KERUPUK": (["Kerupuk Udang", "Kerupuk Nasi", "Kerupuk Roda", "Emping"],
+                ["Maharasa", "Finna", "Sidoarjo"],
+                ["250 gr", "1 kg", "Mentah"], ["Bal", "Ikt"]),
+    "SAYUR": (["Bawang Merah", "Bawang Putih", "Bawang Bombai", "Kentang", "Wortel", "Cabai"],
+              ["Brebes", "Lokal", "Impor", "Dieng"],
+              ["20 kg", "25 kg", "10 kg"], ["Sak", "Kg", "Krj"]),
+    "AYAM": (["Sosis Ayam", "Nugget", "Ayam Potong", "Bakso Ayam", "Karage"],
+             ["Salam", "Fiesta", "So Good", "Champ"],
+             ["isi 16", "500 gr", "1 kg"], ["Krt", "Pcs"]),
+}
+
+FIRST_NAMES = ["Budi", "Siti", "Agus", "Dewi", "Rudi", "Wati", "Joko", "Rina", "Eko", "Sri"]
+
+
+PACKS = [f"*{n}" for n in (6, 10, 12, 20, 24, 30, 36, 40, 48, 50, 60, 72, 100, 144)]
+
+
+def generate_catalogue(n: int, seed: int = 42) -> List[Dict[str, object]]:
+    """Return `n` unique catalogue rows: {"name", "group", "unit", "stock"}."""
+    rng = random.Random(seed)
+    groups = list(VOCABULARY)
+    rows: List[Dict[str, object]] = []
+    seen = set()
+    while len(rows) < n:
+        group = rng.choice(groups)
+        bases, brands, sizes, units = VOCABULARY[group]
+        name = f"{rng.choice(bases)} {rng.choice(brands)} {rng.choice(sizes)} {rng.choice(PACKS)}"
+        if name in seen:
+            # Combinations run out long before 1M; disambiguate like real variants
+            name = f"{name} V{len(rows)}"
+        seen.add(name)
+        rows.append({"name": name, "group": group, "unit": rng.choice(units), "stock": rng.randint(0, 500)})
+    return rows
+
+
+def write_catalogue_csv(path: str | Path, rows: List[Dict[str, object]]) -> Path:
+    """Write rows in the `barang.csv` layout (Item,Group,Stock,Unit)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["Item", "Group", "Stock", "Unit"])
+        for r in rows:
+            w.writerow([r["name"], r["group"], r["stock"], r["unit"]])
+    return path
+
+
+def load_catalogue_db(db, rows: List[Dict[str, object]]) -> None:
+    """Insert groups and items into an initialized `DatabaseManager` database."""
+    with db.transaction() as conn:
+        group_ids = {}
+        for group in sorted({str(r["group"]) for r in rows}):
+            group_ids[group] = conn.execute("INSERT INTO product_groups (name) VALUES (?)", (group,)).lastrowid
+        conn.executemany(
+            "INSERT INTO items (code, name, group_id, unit, current_stock) VALUES (?, ?, ?, ?, ?)",
+            ((f"SKU-{i:07d}", r["name"], group_ids[str(r["group"])], r["unit"], r["stock"]) for i, r in enumerate(rows, start=1)),
+        )
+
+
+def generate_transactions(db, transactions: int, lines_per_transaction: int = 5, days: int = 365,
+                          in_ratio: float = 0.15, seed: int = 42, end: datetime | None = None) -> int:
+    """Append a synthetic OUT/IN history spread over `days` ending at `end`.
+
+    Stock chains (`stock_before`/`stock_after`) and `items.current_stock` stay
+    consistent. Returns the number of `transaction_items` rows written.
+    """
+    rng = random.Random(seed)
+    end = end or datetime.now().replace(microsecond=0)
+    start = end - timedelta(days=days)
+    span = int((end - start).total_seconds())
+    with db.transaction() as conn:
+        stock = dict(conn.execute("SELECT id, current_stock FROM items"))
+        if not stock:
+            return 0
+        ids = list(stock)
+        next_no = conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0] + 1
+        # Timestamps in order so the ledger is chronological
+        offsets = sorted(rng.randrange(span) for _ in range(transactions))
+        trx_rows, line_rows = [], []
+        for k, offset in enumerate(offsets):
+            trx_id = next_no + k
+            kind = "IN" if rng.random() < in_ratio else "OUT"
+            at = start + timedelta(seconds=offset)
+            created = at.strftime("%Y-%m-%d %H:%M:%S")
+            # created_at is UTC text like datetime('now'); the integer columns must agree
+            ts = calendar.timegm(at.timetuple())
+            trx_rows.append((trx_id, f"SYN-{trx_id:08d}", rng.choice(FIRST_NAMES), kind, created))
+            for item_id in rng.sample(ids, min(lines_per_transaction, len(ids))):
+                qty = rng.randint(1, 50) if kind == "IN" else rng.randint(1, 10)
+                before = stock[item_id]
+                after = before + qty if kind == "IN" else before - qty
+                stock[item_id] = after
+                line_rows.append((trx_id, item_id, qty, before, after, ts, ts // 86400))
+        conn.executemany(
+            "INSERT INTO transactions (id, transaction_number, person_name, transaction_type, created_at) VALUES (?, ?, ?, ?, ?)",
+            trx_rows,
+        )
+        conn.executemany(
+            "INSERT INTO transaction_items (transaction_id, item_id, quantity, stock_before, stock_after, created_ts, created_day) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            line_rows,
+        )
+        conn.executemany("UPDATE items SET current_stock=? WHERE id=?", ((v, k) for k, v in stock.items()))
+        # Items must predate their history for point-in-time queries
+        first = start.strftime("%Y-%m-%d %H:%M:%S")
+        conn.execute("UPDATE items SET created_at=? WHERE created_at > ?", (first, first))
+        return len(line_rows)
@@ -0,0 +1,76 @@
+"""Shared timing helpers for the benchmark scripts."""
+from __future__ import annotations
+import sys
+import json
+import time
+import platform
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+RESULTS_DIR = ROOT / 'logs' / 'benchmarks'
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def summarize(samples_s: Iterable[float]) -> Dict[str, Any]:
+    """Summarize durations in seconds as milliseconds stats."""
+    values = sorted(s * 1000.0 for s in samples_s)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 4),
+        "p50_ms": round(percentile(values, 50), 4),
+        "p95_ms": round(percentile(values, 95), 4),
+        "p99_ms": round(percentile(values, 99), 4),
+        "max_ms": round(values[-1], 4),
+        "total_ms": round(sum(values), 3),
+    }
+
+
+def time_each(fn: Callable[[Any], Any], inputs: Iterable[Any]) -> Dict[str, Any]:
+    """Call `fn` once per input and summarize per-call durations."""
+    samples = []
+    for value in inputs:
+        t0 = time.perf_counter()
+        fn(value)
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples)
+
+
+def time_once(fn: Callable[[], Any]) -> tuple[float, Any]:
+    """Return (elapsed_ms, result) for a single call."""
+    t0 = time.perf_counter()
+    result = fn()
+    return round((time.perf_counter() - t0) * 1000.0, 3), result
+
+
+def environment() -> Dict[str, Any]:
+    import sqlite3
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sqlite": sqlite3.sqlite_version,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def write_results(name: str, results: Dict[str, Any], out: str | Path | None = None) -> Path:
+    """Write results JSON (default: logs/benchmarks/<name>-<timestamp>.json)."""
+    if out is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        out = RESULTS_DIR / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"benchmark": name, "environment": environment(), "results": results}, indent=2), encoding='utf-8')
+    return out
@@ -0,0 +1,206 @@
+"""Load test for the inventory HTTP/JSON server.
+
+Simulates many handhelds and tills on localhost, each holding one
+keep-alive connection and issuing a mix of barcode lookups, searches,
+stock queries and checkouts back to back. Reports throughput, status
+counts and per-endpoint latency.
+
+By default a server is started in a background thread on a generated
+catalogue in a temporary database; pass --url to drive a running
+`scripts/serve_inventory.py` instead (only lookups/searches/stock then use
+codes that exist there: SKU-0000001.. from the generated catalogue).
+
+Usage:
+    python benchmarks/load_test.py --clients 50 --seconds 10
+    python benchmarks/load_test.py --url http://127.0.0.1:8765 --clients 100
+    python benchmarks/load_test.py --mix checkout --commit-max-commands 1   # one commit per sale
+"""
+from __future__ import annotations
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import summarize, write_results
+from benchmarks.generators import generate_catalogue, load_catalogue_db
+
+# Share of each operation in the request mix
+MIXES = {
+    "default": (("lookup", 0.70), ("search", 0.15), ("stock", 0.10), ("checkout", 0.05)),
+    # Burst of sales from every client: exercises the group-commit writer
+    "checkout": (("checkout", 1.0),),
+}
+SEARCH_TERMS = ["kecap", "minyak kita", "beras 25", "bawang merah", "indomie goreng", "sabun", "plastik", "aqua"]
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        payload = json.loads(await self.reader.readexactly(length)) if length else None
+        return status, payload
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+def pick(rng: random.Random, mix) -> str:
+    r = rng.random()
+    for name, share in mix:
+        if r < share:
+            return name
+        r -= share
+    return mix[0][0]
+
+
+async def run_client(n: int, host: str, port: int, codes: list, deadline: float, samples, statuses, seed: int, mix):
+    rng = random.Random(seed + n)
+    client = Client(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            op = pick(rng, mix)
+            if op == "lookup":
+                args = ("GET", f"/api/items/barcode/{quote(rng.choice(codes))}")
+            elif op == "search":
+                args = ("GET", f"/api/items/search?q={quote(rng.choice(SEARCH_TERMS))}&limit=20")
+            elif op == "stock":
+                args = ("GET", "/api/stock?keys=" + ",".join(quote(c) for c in rng.sample(codes, 5)))
+            else:
+                lines = [{"key": c, "qty": rng.randint(1, 3)} for c in rng.sample(codes, rng.randint(1, 5))]
+                args = ("POST", "/api/checkout", {"person_name": f"till-{n}", "lines": lines, "allow_negative": True})
+            t0 = time.perf_counter()
+            try:
+                status, _ = await client.request(*args)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                status = type(e).__name__
+                await client.close()
+                client = Client(host, port)
+            samples[op].append(time.perf_counter() - t0)
+            statuses[f"{op}:{status}"] += 1
+    finally:
+        await client.close()
+
+
+async def drive(host: str, port: int, clients: int, seconds: float, codes: list, seed: int, mix) -> dict:
+    samples, statuses = defaultdict(list), Counter()
+    started = time.perf_counter()
+    deadline = started + seconds
+    await asyncio.gather(*(run_client(n, host, port, codes, deadline, samples, statuses, seed, mix) for n in range(clients)))
+    elapsed = time.perf_counter() - started
+    total = sum(len(v) for v in samples.values())
+    return {
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(total / elapsed, 1) if elapsed else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+        "latency": {op: summarize(v) for op, v in sorted(samples.items())},
+    }
+
+
+def start_local_server(db_path: Path, items: int, workers: int, batch_window_ms: float, seed: int,
+                       commit_interval_ms: float = 5.0, commit_max_commands: int = 64):
+    """Start an InventoryService on 127.0.0.1 in a background thread; returns (port, codes)."""
+    from models.database_manager import DatabaseManager
+    from server.http import HttpServer
+    from server.service import InventoryService, enable_wal
+
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    load_catalogue_db(db, generate_catalogue(items, seed=seed))
+    enable_wal(db)
+    codes = [r[0] for r in db.query_all("SELECT code FROM items")]
+    service = InventoryService(
+        db, workers=workers, batch_window_ms=batch_window_ms, max_pending=10_000,
+        commit_interval_ms=commit_interval_ms, commit_max_commands=commit_max_commands,
+    )
+    ready = threading.Event()
+    bound = {}
+
+    def run():
+        async def main():
+            server = HttpServer(service.handle)
+            bound["port"] = (await server.start("127.0.0.1", 0))[1]
+            ready.set()
+            await server.serve_forever()
+        asyncio.run(main())
+
+    threading.Thread(target=run, name="inventory-server", daemon=True).start()
+    ready.wait()
+    return bound["port"], codes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the inventory server with concurrent simulated clients")
+    parser.add_argument('--url', default=None, help='Running server to test (default: start one on a temp DB)')
+    parser.add_argument('--clients', type=int, default=50, help='Concurrent keep-alive clients')
+    parser.add_argument('--seconds', type=float, default=10.0, help='Test duration')
+    parser.add_argument('--items', type=int, default=20000, help='Catalogue size for the local server')
+    parser.add_argument('--workers', type=int, default=4, help='DB worker threads for the local server')
+    parser.add_argument('--batch-window-ms', type=float, default=2.0, help='Lookup batching window for the local server')
+    parser.add_argument('--mix', choices=sorted(MIXES), default='default', help='Request mix')
+    parser.add_argument('--commit-interval-ms', type=float, default=5.0, help='Group-commit window for the local server')
+    parser.add_argument('--commit-max-commands', type=int, default=64,
+                        help='Writes per group commit for the local server (1 = one commit per sale)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help='Results JSON path (default: logs/benchmarks/load_test-<ts>.json)')
+    args = parser.parse_args()
+
+    params = {k: v for k, v in vars(args).items() if k != 'out'}
+    with tempfile.TemporaryDirectory(prefix='inv-load-') as tmp:
+        if args.url:
+            parts = urlsplit(args.url)
+            host, port = parts.hostname or "127.0.0.1", parts.port or 80
+            codes = [f"SKU-{i:07d}" for i in range(1, args.items + 1)]
+        else:
+            host = "127.0.0.1"
+            port, codes = start_local_server(
+                Path(tmp) / 'load.db', args.items, args.workers, args.batch_window_ms, args.seed,
+                args.commit_interval_ms, args.commit_max_commands,
+            )
+        results = asyncio.run(drive(host, port, args.clients, args.seconds, codes, args.seed, MIXES[args.mix]))
+
+    results["params"] = params
+    out = write_results('load_test', results, args.out)
+    print(json.dumps({k: results[k] for k in ("requests", "requests_per_s", "statuses")}, indent=2))
+    print(f"results: {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Memory footprint of the in-process catalogue representations.
+
+Builds each representation from the same generated CSV and reports the
+memory it retains (tracemalloc: current after load minus before, with the
+object kept alive), the peak during load, and (from a separate untraced
+load) load time and suggestion latency:
+
+- dataframe: `InventoryManager.read_csv` + lower-cased name index (pandas)
+- dicts: a list of row dicts, as `ItemsRepository.search` returns them
+- store: `ItemStore.read_csv` (array-backed columns, packed name buffer)
+
+Usage:
+    python benchmarks/memory.py --items 100000,1000000
+"""
+from __future__ import annotations
+import gc
+import sys
+import csv
+import random
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import time_each, time_once, write_results
+from benchmarks.generators import generate_catalogue, write_catalogue_csv
+
+
+def load_dataframe(path: Path):
+    from models.inventory_manager import InventoryManager
+    df = InventoryManager.read_csv(path)
+    names_lower = df["Item"].astype(str).str.lower()
+
+    def suggest(keyword):
+        return list(df[names_lower.str.contains(keyword, regex=False, na=False)]["Item"])
+    return (df, names_lower), suggest
+
+
+def load_dicts(path: Path):
+    with path.open(newline="", encoding="utf-8") as f:
+        rows = [
+            {"id": n, "name": r["Item"], "group": r["Group"], "unit": r["Unit"], "current_stock": int(r["Stock"])}
+            for n, r in enumerate(csv.DictReader(f), start=1)
+        ]
+
+    def suggest(keyword):
+        return [r["name"] for r in rows if keyword in r["name"].lower()]
+    return rows, suggest
+
+
+def load_store(path: Path):
+    from models.item_store import ItemStore
+    store = ItemStore.read_csv(path)
+    return store, store.get_suggestions
+
+
+REPRESENTATIONS = {"dataframe": load_dataframe, "dicts": load_dicts, "store": load_store}
+
+
+def measure(loader, path: Path, prefixes: list) -> dict:
+    # Timings from an untraced load; tracemalloc slows allocation-heavy code
+    load_ms, (obj, suggest) = time_once(lambda: loader(path))
+    out = {"load_ms": load_ms, "suggestions": time_each(suggest, prefixes)}
+    del obj, suggest
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    obj = loader(path)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    out["retained_mb"] = round((current - before) / 1e6, 2)
+    out["peak_mb"] = round((peak - before) / 1e6, 2)
+    del obj
+    gc.collect()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare catalogue memory: DataFrame vs dicts vs ItemStore")
+    parser.add_argument('--items', default='100000,1000000', help='Comma-separated catalogue sizes')
+    parser.add_argument('--queries', type=int, default=20, help='Suggestion lookups per representation')
+    parser.add_argument('--only', default=','.join(REPRESENTATIONS), help='Comma-separated representations')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help='Results JSON path (default: logs/benchmarks/memory-<ts>.json)')
+    args = parser.parse_args()
+
+    selected = [s.strip() for s in args.only.split(',') if s.strip()]
+    results = {"params": {"queries": args.queries, "seed": args.seed}}
+    for size in [int(s) for s in args.items.split(',') if s.strip()]:
+        with tempfile.TemporaryDirectory(prefix='inv-mem-') as tmp:
+            rows = generate_catalogue(size, seed=args.seed)
+            path = write_catalogue_csv(Path(tmp) / 'barang.csv', rows)
+            rng = random.Random(args.seed)
+            prefixes = [str(rng.choice(rows)["name"]).lower()[:5] for _ in range(args.queries)]
+            del rows
+            per_size = {"csv_mb": round(path.stat().st_size / 1e6, 2)}
+            for name in selected:
+                try:
+                    per_size[name] = measure(REPRESENTATIONS[name], path, prefixes)
+                except ImportError as e:
+                    per_size[name] = {"error": f"{type(e).__name__}: {e}"}
+                print(f"items={size} {name}: {per_size[name].get('retained_mb', per_size[name].get('error'))}", flush=True)
+        results[f"items_{size}"] = per_size
+
+    out = write_results('memory', results, args.out)
+    print(f"results: {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Date-range queries: TEXT timestamps vs the integer `*_ts`/`created_day` columns.
+
+Builds a synthetic history of `--lines` transaction lines over `--days`
+days, then times each report-style query written both ways on random
+windows:
+
+- text: join `transactions`, filter `created_at` strings, group by `date()`
+- int: filter and group on `transaction_items.created_day` (no join, no
+  per-row date parsing), or on `transactions.created_ts`
+
+Both forms must return the same rows; a mismatch aborts the run.
+
+Usage:
+    python benchmarks/range_queries.py --lines 2000000
+    python benchmarks/range_queries.py --lines 200000 --repeat 5 --db /tmp/hist.db   # reuse a generated DB
+"""
+from __future__ import annotations
+import sys
+import json
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import summarize, time_once, write_results
+from benchmarks.generators import generate_catalogue, load_catalogue_db, generate_transactions
+from models.database_manager import DatabaseManager
+from models.stock_history import TS_FORMAT, epoch_day, to_epoch
+
+LINES_PER_TRANSACTION = 5
+
+# name -> (text form, integer form); both take :start/:end (and :item) as
+# TEXT timestamps, :start_day/:end_day, :start_ts/:end_ts
+QUERIES = {
+    "week_total": (
+        """
+        SELECT COUNT(*), SUM(ti.quantity)
+        FROM transaction_items ti JOIN transactions t ON t.id = ti.transaction_id
+        WHERE t.created_at >= :start AND t.created_at < :end
+        """,
+        """
+        SELECT COUNT(*), SUM(quantity)
+        FROM transaction_items
+        WHERE created_day >= :start_day AND created_day < :end_day
+        """,
+    ),
+    "daily_totals_90d": (
+        """
+        SELECT date(t.created_at) AS day, COUNT(*), SUM(ti.quantity)
+        FROM transaction_items ti JOIN transactions t ON t.id = ti.transaction_id
+        WHERE t.created_at >= :start AND t.created_at < :end
+        GROUP BY day ORDER BY day
+        """,
+        """
+        SELECT date(created_day * 86400, 'unixepoch') AS day, COUNT(*), SUM(quantity)
+        FROM transaction_items
+        WHERE created_day >= :start_day AND created_day < :end_day
+        GROUP BY created_day ORDER BY created_day
+        """,
+    ),
+    "item_daily_1y": (
+        """
+        SELECT date(t.created_at) AS day, SUM(ti.quantity)
+        FROM transaction_items ti JOIN transactions t ON t.id = ti.transaction_id
+        WHERE ti.item_id = :item AND t.created_at >= :start AND t.created_at < :end
+        GROUP BY day ORDER BY day
+        """,
+        """
+        SELECT date(created_day * 86400, 'unixepoch') AS day, SUM(quantity)
+        FROM transaction_items
+        WHERE item_id = :item AND created_day >= :start_day AND created_day < :end_day
+        GROUP BY created_day ORDER BY created_day
+        """,
+    ),
+    "transactions_day": (
+        "SELECT COUNT(*) FROM transactions WHERE created_at >= :start AND created_at < :end",
+        "SELECT COUNT(*) FROM transactions WHERE created_ts >= :start_ts AND created_ts < :end_ts",
+    ),
+}
+WINDOW_DAYS = {"week_total": 7, "daily_totals_90d": 90, "item_daily_1y": 365, "transactions_day": 1}
+
+
+def build(db_path: Path, lines: int, days: int, items: int, seed: int, end: datetime) -> DatabaseManager:
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    if db.query_one("SELECT COUNT(*) FROM transaction_items")[0] == 0:
+        load_catalogue_db(db, generate_catalogue(items, seed=seed))
+        remaining, chunk = lines // LINES_PER_TRANSACTION, 100_000
+        # Chunks of consecutive periods keep memory flat and history ordered
+        span = timedelta(days=days)
+        step = span * chunk / max(1, remaining)
+        start, n = end - span, 0
+        while remaining > 0:
+            count = min(chunk, remaining)
+            n += 1
+            generate_transactions(db, count, LINES_PER_TRANSACTION, days=max(1, step.days), seed=seed + n,
+                                  end=min(end, start + step * n))
+            remaining -= count
+        db.execute("ANALYZE")
+    return db
+
+
+def window(rng: random.Random, first: datetime, last: datetime, days: int) -> dict:
+    latest = max(first, last - timedelta(days=days))
+    start = first + timedelta(days=rng.randrange(max(1, (latest - first).days + 1)))
+    start = start.replace(hour=0, minute=0, second=0)
+    end = start + timedelta(days=days)
+    return {
+        "start": start.strftime(TS_FORMAT), "end": end.strftime(TS_FORMAT),
+        "start_day": epoch_day(start.date()), "end_day": epoch_day(end.date()),
+        "start_ts": to_epoch(start), "end_ts": to_epoch(end),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time date-range queries on TEXT vs integer timestamp columns")
+    parser.add_argument('--lines', type=int, default=2_000_000, help='transaction_items rows to generate')
+    parser.add_argument('--days', type=int, default=730, help='History length in days')
+    parser.add_argument('--items', type=int, default=20000, help='Catalogue size')
+    parser.add_argument('--repeat', type=int, default=20, help='Random windows per query')
+    parser.add_argument('--db', default=None, help='Reuse/keep the generated DB at this path')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help='Results JSON path (default: logs/benchmarks/range_queries-<ts>.json)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='inv-range-') as tmp:
+        db_path = Path(args.db) if args.db else Path(tmp) / 'history.db'
+        build_ms, db = time_once(lambda: build(db_path, args.lines, args.days, args.items, args.seed,
+                                               datetime(2026, 1, 1)))
+        first, last, lines = db.query_one(
+            "SELECT (SELECT MIN(created_at) FROM transactions), (SELECT MAX(created_at) FROM transactions),"
+            " (SELECT COUNT(*) FROM transaction_items)"
+        )
+        first, last = datetime.strptime(first, TS_FORMAT), datetime.strptime(last, TS_FORMAT)
+        rng = random.Random(args.seed)
+        item_ids = [r[0] for r in db.query_all("SELECT id FROM items")]
+        results = {"lines": lines, "build_ms": build_ms, "queries": {}}
+        with db.connect() as conn:
+            for name, (text_sql, int_sql) in QUERIES.items():
+                samples = {"text": [], "int": []}
+                for _ in range(args.repeat):
+                    params = window(rng, first, last, WINDOW_DAYS[name])
+                    params["item"] = rng.choice(item_ids)
+                    out = {}
+                    # Alternate which form runs first so neither always gets a warm cache
+                    order = ("text", "int") if rng.random() < 0.5 else ("int", "text")
+                    for form in order:
+                        sql = text_sql if form == "text" else int_sql
+                        ms, out[form] = time_once(lambda: conn.execute(sql, params).fetchall())
+                        samples[form].append(ms / 1000.0)
+                    if out["text"] != out["int"]:
+                        raise SystemExit(f"{name}: results differ for {params}: {out['text'][:3]} vs {out['int'][:3]}")
+                text, integer = summarize(samples["text"]), summarize(samples["int"])
+                results["queries"][name] = {
+                    "text": text,
+                    "int": integer,
+                    "speedup_p50": round(text["p50_ms"] / integer["p50_ms"], 2) if integer["p50_ms"] else None,
+                }
+
+    results["params"] = {k: v for k, v in vars(args).items() if k != 'out'}
+    out = write_results('range_queries', results, args.out)
+    print(json.dumps({
+        "lines": lines,
+        "p50_ms": {k: (v["text"]["p50_ms"], v["int"]["p50_ms"], v["speedup_p50"]) for k, v in results["queries"].items()},
+    }, indent=2))
+    print(f"results: {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""Repeatable benchmark suite over synthetic catalogues and histories.
+
+Each size gets a fresh temp directory with a generated CSV and SQLite DB,
+then the selected scenarios are timed and written to one JSON file that
+`benchmarks/compare.py` can diff against a previous run.
+
+Usage:
+    python benchmarks/run.py --items 1000,100000 --transactions 20000
+    python benchmarks/run.py --scenarios search,reports --out logs/benchmarks/base.json
+"""
+from __future__ import annotations
+import os
+import sys
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import time_each, time_once, write_results
+from benchmarks.generators import generate_catalogue, write_catalogue_csv, load_catalogue_db, generate_transactions
+from models.database_manager import DatabaseManager
+from models.items_repository import ItemsRepository
+
+
+class Context:
+    """Generated data and workload shared by the scenarios of one size."""
+
+    def __init__(self, tmp: Path, items: int, transactions: int, queries: int, seed: int):
+        self.tmp = tmp
+        self.rows = generate_catalogue(items, seed=seed)
+        self.csv_path = write_catalogue_csv(tmp / 'barang.csv', self.rows)
+        self.db = DatabaseManager(str(tmp / 'db' / 'app.db'))
+        self.db.initialize()
+        load_catalogue_db(self.db, self.rows)
+        self.ledger_rows = generate_transactions(self.db, transactions, seed=seed)
+        rng = random.Random(seed)
+        self.names = [str(rng.choice(self.rows)["name"]) for _ in range(queries)]
+        # Autocomplete sends growing lower-case prefixes of what the user types
+        self.prefixes = [n.lower()[:k] for n in self.names for k in (2, 4, 6)]
+        self.carts = [[str(rng.choice(self.rows)["name"]) for _ in range(5)] for _ in range(max(1, queries // 10))]
+
+
+def scenario_suggestions(ctx: Context) -> dict:
+    """`InventoryManager.get_suggestions` on the CSV catalogue (pandas)."""
+    from models.inventory_manager import InventoryManager
+    load_ms, manager = time_once(lambda: InventoryManager(str(ctx.csv_path)))
+    cached_ms, manager = time_once(lambda: InventoryManager(str(ctx.csv_path)))
+    return {
+        "load_ms": load_ms,
+        "load_cached_ms": cached_ms,
+        "get_suggestions": time_each(manager.get_suggestions, ctx.prefixes),
+        "get_item": time_each(manager.get_item, ctx.names),
+    }
+
+
+def scenario_search(ctx: Context) -> dict:
+    """`ItemsRepository.search` and exact-name lookups on SQLite."""
+    repo = ItemsRepository(ctx.db)
+    return {
+        "search": time_each(repo.search, ctx.prefixes),
+        "get_by_name": time_each(repo.get_by_name, ctx.names),
+    }
+
+
+def scenario_checkout(ctx: Context) -> dict:
+    """Checkout through both backends, as POSApp performs it."""
+    from models.inventory_repository import SqliteInventoryRepository, CsvInventoryRepository
+
+    def run(repo):
+        def checkout(cart):
+            for name in cart:
+                row = repo.get_item(name)
+                repo.update_stock(row["Item"], int(row["Stock"]) - 1)
+            repo.save()
+        return time_each(checkout, ctx.carts)
+
+    out = {"sqlite": run(SqliteInventoryRepository(ItemsRepository(ctx.db)))}
+    try:
+        from models.inventory_manager import InventoryManager
+        out["csv"] = run(CsvInventoryRepository(InventoryManager(str(ctx.csv_path))))
+    except ImportError as e:
+        out["csv"] = {"error": f"{type(e).__name__}: {e}"}
+    return out
+
+
+def scenario_migration(ctx: Context) -> dict:
+    """`scripts/migrate_csv_to_sqlite.py` read/transform/load into a new DB."""
+    from scripts.migrate_csv_to_sqlite import read_csv, transform, load_to_db
+    db = DatabaseManager(str(ctx.tmp / 'db' / 'migrated.db'))
+    db.initialize()
+    read_ms, src = time_once(lambda: read_csv(ctx.csv_path))
+    transform_ms, (df, _) = time_once(lambda: transform(src))
+    load_ms, summary = time_once(lambda: load_to_db(db, df))
+    return {"read_ms": read_ms, "transform_ms": transform_ms, "load_ms": load_ms, "inserted": summary["inserted"]}
+
+
+def scenario_reports(ctx: Context) -> dict:
+    """Report-style aggregate queries over the transaction history."""
+    from models.stock_history import StockHistoryRepository
+    from models.reconciliation import StockReconciler
+    with ctx.db.connect() as conn:
+        last_day = conn.execute("SELECT date(MAX(created_at)) FROM transactions").fetchone()[0] or '2000-01-01'
+    queries = {
+        "movement_by_product_30d": (
+            """
+            SELECT ti.item_id,
+                   SUM(CASE WHEN t.transaction_type='OUT' THEN ti.quantity ELSE 0 END),
+                   SUM(CASE WHEN t.transaction_type='IN' THEN ti.quantity ELSE 0 END)
+            FROM transaction_items ti JOIN transactions t ON t.id = ti.transaction_id
+            WHERE t.created_at >= date(?, '-30 days')
+            GROUP BY ti.item_id
+            """, (last_day,)),
+        "movement_by_day": (
+            """
+            SELECT date(t.created_at), COUNT(*), SUM(ti.quantity)
+            FROM transaction_items ti JOIN transactions t ON t.id = ti.transaction_id
+            GROUP BY date(t.created_at)
+            """, ()),
+        "transaction_history_7d": (
+            """
+            SELECT t.id, t.transaction_number, t.person_name, COUNT(ti.id), SUM(ti.quantity)
+            FROM transactions t JOIN transaction_items ti ON ti.transaction_id = t.id
+            WHERE t.created_at >= date(?, '-7 days')
+            GROUP BY t.id
+            """, (last_day,)),
+    }
+    out: Dict[str, object] = {}
+    for name, (sql, params) in queries.items():
+        out[name] = time_each(lambda _: ctx.db.query_all(sql, params), range(3))
+    history = StockHistoryRepository(ctx.db)
+    out["stock_levels_at_no_snapshot_ms"], _ = time_once(lambda: history.stock_levels_at(last_day))
+    out["take_snapshot_ms"], _ = time_once(lambda: history.take_snapshot(last_day))
+    out["stock_levels_at_snapshot_ms"], _ = time_once(lambda: history.stock_levels_at(last_day))
+    out["reconcile_full_ms"], _ = time_once(lambda: StockReconciler(ctx.db).run(full=True))
+    out["reconcile_incremental_ms"], _ = time_once(lambda: StockReconciler(ctx.db).run())
+    return out
+
+
+def scenario_stocktake(ctx: Context) -> dict:
+    """Bulk stocktake over every item (counts keyed by item code)."""
+    from models.stocktake import StocktakeRepository
+    rng = random.Random(7)
+    counts = [(f"SKU-{i:07d}", rng.randint(0, 500)) for i in range(1, len(ctx.rows) + 1)]
+    repo = StocktakeRepository(ctx.db)
+    dry_ms, _ = time_once(lambda: repo.apply_counts(counts, dry_run=True))
+    apply_ms, summary = time_once(lambda: repo.apply_counts(counts))
+    return {"dry_run_ms": dry_ms, "apply_ms": apply_ms, "items_adjusted": summary["items_adjusted"]}
+
+
+SCENARIOS: Dict[str, Callable[[Context], dict]] = {
+    "suggestions": scenario_suggestions,
+    "search": scenario_search,
+    "checkout": scenario_checkout,
+    "migration": scenario_migration,
+    "reports": scenario_reports,
+    "stocktake": scenario_stocktake,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite on synthetic data")
+    parser.add_argument('--items', default='1000,10000', help='Comma-separated catalogue sizes (1k-1M)')
+    parser.add_argument('--transactions', type=int, default=5000, help='Synthetic transactions per size')
+    parser.add_argument('--queries', type=int, default=100, help='Sampled names for search/lookup')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated scenarios')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help='Results JSON path (default: logs/benchmarks/suite-<ts>.json)')
+    args = parser.parse_args()
+
+    selected = [s.strip() for s in args.scenarios.split(',') if s.strip()]
+    unknown = [s for s in selected if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    results: Dict[str, object] = {"params": {"transactions": args.transactions, "queries": args.queries, "seed": args.seed}}
+    cwd = os.getcwd()
+    for size in [int(s) for s in args.items.split(',') if s.strip()]:
+        with tempfile.TemporaryDirectory(prefix='inv-suite-') as tmp:
+            tmp = Path(tmp)
+            # Caches and logs written relative to cwd stay in the temp dir
+            os.chdir(tmp)
+            try:
+                setup_ms, ctx = time_once(lambda: Context(tmp, size, args.transactions, args.queries, args.seed))
+                per_size: Dict[str, object] = {"setup_ms": setup_ms, "ledger_rows": ctx.ledger_rows}
+                for name in selected:
+                    try:
+                        per_size[name] = SCENARIOS[name](ctx)
+                    except ImportError as e:
+                        per_size[name] = {"error": f"{type(e).__name__}: {e}"}
+                    print(f"items={size} {name}: done", flush=True)
+            finally:
+                os.chdir(cwd)
+        results[f"items_{size}"] = per_size
+
+    out = write_results('suite', results, args.out)
+    print(f"results: {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""Cost of editing past transactions on a large synthetic history.
+
+Builds (or reuses) the same history as `range_queries.py`, then edits one
+line of transactions at several ages with `TransactionEditRepository`
+(quantity +1) and times each edit. For comparison it times one replay:
+recomputing every stock chain over the whole history with a window
+function, read-only, which is the least a replay-based edit would cost.
+
+An edit only rewrites the touched items' entries after the transaction.
+Its time should follow `lines_shifted` (the age) and stay flat as
+`--lines` grows; the replay grows with the history.
+
+After the edits every touched item's chain must still be continuous and
+end at `items.current_stock`. A line added to an earlier transaction must
+also leave a full reconciliation without mismatches for its item: two
+checkouts, then the second item is added to the first. Otherwise the run
+aborts.
+
+Usage:
+    python benchmarks/transaction_edits.py --lines 2000000
+    python benchmarks/transaction_edits.py --lines 200000 --db /tmp/hist.db   # reuse a generated DB
+"""
+from __future__ import annotations
+import sys
+import json
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import summarize, time_once, write_results
+from benchmarks.range_queries import build
+from models.checkout import CheckoutRepository
+from models.reconciliation import StockReconciler
+from models.transaction_edits import TransactionEditRepository
+
+AGES_DAYS = (1, 30, 180, 365, 700)
+
+REPLAY_SQL = """
+    SELECT COUNT(*), SUM(running)
+    FROM (
+        SELECT SUM(CASE t.transaction_type WHEN 'OUT' THEN -ti.quantity ELSE ti.quantity END)
+                   OVER (PARTITION BY ti.item_id ORDER BY ti.created_ts, ti.transaction_id, ti.id) AS running
+        FROM transaction_items ti JOIN transactions t ON t.id = ti.transaction_id
+    )
+"""
+
+
+def chain_breaks(conn, item_ids) -> int:
+    """Lines whose stock_before differs from the previous line's stock_after, plus wrong current stock."""
+    marks = ",".join("?" * len(item_ids))
+    breaks = conn.execute(
+        f"""
+        SELECT COUNT(*) FROM (
+            SELECT stock_before, LAG(stock_after) OVER (PARTITION BY item_id ORDER BY created_ts, transaction_id, id) AS prev
+            FROM transaction_items WHERE item_id IN ({marks})
+        )
+        WHERE prev IS NOT NULL AND prev != stock_before
+        """,
+        item_ids,
+    ).fetchone()[0]
+    wrong_current = conn.execute(
+        f"""
+        SELECT COUNT(*) FROM items i
+        WHERE i.id IN ({marks})
+          AND i.current_stock != (SELECT stock_after FROM transaction_items ti WHERE ti.item_id = i.id
+                                  ORDER BY created_ts DESC, transaction_id DESC, id DESC LIMIT 1)
+        """,
+        item_ids,
+    ).fetchone()[0]
+    return int(breaks) + int(wrong_current)
+
+
+def added_line_mismatches(db, editor) -> list:
+    """Checkout A, checkout B, add B to the first sale; full reconciliation mismatches of A and B.
+
+    A and B are new items, so these lines are their first ledger entries and
+    B's opening balance depends on the ledger order.
+    """
+    codes = ["BENCH-EDIT-A", "BENCH-EDIT-B"]
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO items (code, name, current_stock) VALUES (?, ?, 100)",
+            [(code, code) for code in codes],
+        )
+    checkouts = CheckoutRepository(db)
+    first = checkouts.checkout([(codes[0], 1)], 'bench', allow_negative=True)
+    checkouts.checkout([(codes[1], 1)], 'bench', allow_negative=True)
+    editor.edit(first["transaction_id"], [(codes[0], 1), (codes[1], 2)], "bench", "benchmark", allow_negative=True)
+    item_ids = {r[0] for r in db.query_all("SELECT id FROM items WHERE code IN (?, ?)", tuple(codes))}
+    return [m for m in StockReconciler(db).run(full=True)["mismatches"] if m["item_id"] in item_ids]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time delta-only edits of past transactions")
+    parser.add_argument('--lines', type=int, default=2_000_000, help='transaction_items rows to generate')
+    parser.add_argument('--days', type=int, default=730, help='History length in days')
+    parser.add_argument('--items', type=int, default=20000, help='Catalogue size')
+    parser.add_argument('--repeat', type=int, default=10, help='Edits per age')
+    parser.add_argument('--db', default=None, help='Reuse/keep the generated DB at this path (edits modify it)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help='Results JSON path (default: logs/benchmarks/transaction_edits-<ts>.json)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='inv-edits-') as tmp:
+        db_path = Path(args.db) if args.db else Path(tmp) / 'history.db'
+        build_ms, db = time_once(lambda: build(db_path, args.lines, args.days, args.items, args.seed,
+                                               datetime(2026, 1, 1)))
+        editor = TransactionEditRepository(db)
+        last_ts, lines = db.query_one(
+            "SELECT (SELECT MAX(created_ts) FROM transactions), (SELECT COUNT(*) FROM transaction_items)"
+        )
+        with db.connect() as conn:
+            replay_ms, _ = time_once(lambda: conn.execute(REPLAY_SQL).fetchall())
+        results = {"lines": lines, "build_ms": build_ms, "replay_ms": replay_ms, "ages": {}}
+        touched = set()
+        for age in AGES_DAYS:
+            target = last_ts - age * 86400
+            edit_s, shifted = [], []
+            trx_ids = [
+                r[0]
+                for r in db.query_all(
+                    "SELECT id FROM transactions WHERE created_ts >= ? AND voided_at IS NULL ORDER BY created_ts LIMIT ?",
+                    (target, args.repeat),
+                )
+            ]
+            for trx_id in trx_ids:
+                trx = editor.get(trx_id)
+                new_lines = [(str(l["code"]), l["qty"] + (1 if n == 0 else 0)) for n, l in enumerate(trx["items"])]
+                ms, result = time_once(lambda: editor.edit(trx_id, new_lines, "bench", "benchmark", allow_negative=True))
+                edit_s.append(ms / 1000.0)
+                shifted.append(result["lines_shifted"])
+                touched.update(i["item_id"] for i in result["items"])
+            results["ages"][f"{age}d"] = {
+                "edit": summarize(edit_s),
+                "lines_shifted_mean": round(sum(shifted) / max(1, len(shifted)), 1),
+            }
+
+        with db.connect() as conn:
+            broken = chain_breaks(conn, sorted(touched))
+        if broken:
+            raise SystemExit(f"Stock chain broken in {broken} place(s) after the edits")
+        reconcile_ms, mismatches = time_once(lambda: added_line_mismatches(db, editor))
+        if mismatches:
+            raise SystemExit(f"Full reconciliation disagrees after adding a line to an earlier sale: {mismatches}")
+        results["full_reconcile_ms"] = reconcile_ms
+
+    results["params"] = {k: v for k, v in vars(args).items() if k != 'out'}
+    out = write_results('transaction_edits', results, args.out)
+    print(json.dumps({
+        "lines": lines,
+        "replay_ms": replay_ms,
+        "edit p50_ms, lines shifted": {k: (v["edit"]["p50_ms"], v["lines_shifted_mean"]) for k, v in results["ages"].items()},
+    }, indent=2))
+    print(f"results: {out}")
+
+
+if __name__ == '__main__':
+    main()
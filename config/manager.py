@@ -9,7 +9,33 @@ from utils.constants import (
     DEFAULT_PRINTER_TIMEOUT,
     DEFAULT_CSV_PATH,
     DEFAULT_DB_PATH,
+    DEFAULT_DATA_SOURCE,
+    DEFAULT_WATCH_INTERVAL_MS,
     DEFAULT_UNIT,
+    DEFAULT_SLOW_QUERY_MS,
+    DEFAULT_METRICS_DUMP_INTERVAL_S,
+    DEFAULT_SEARCH_FUZZY,
+    DEFAULT_SUGGESTION_LIMIT,
+    DEFAULT_SERVER_HOST,
+    DEFAULT_SERVER_PORT,
+    DEFAULT_SERVER_DB_WORKERS,
+    DEFAULT_SERVER_MAX_PENDING,
+    DEFAULT_SERVER_BATCH_WINDOW_MS,
+    DEFAULT_SERVER_KEEPALIVE_S,
+    DEFAULT_COMMIT_INTERVAL_MS,
+    DEFAULT_COMMIT_MAX_COMMANDS,
+    DEFAULT_BACKUP_ENABLED,
+    DEFAULT_BACKUP_DIR,
+    DEFAULT_BACKUP_INTERVAL_H,
+    DEFAULT_BACKUP_KEEP,
+    DEFAULT_BACKUP_COMPRESS,
+    DEFAULT_BACKUP_PAGES_PER_STEP,
+    DEFAULT_MAINTENANCE_ENABLED,
+    DEFAULT_MAINTENANCE_IDLE_MINUTES,
+    DEFAULT_MAINTENANCE_INTERVAL_H,
+    DEFAULT_MAINTENANCE_VACUUM_PAGES,
+    DEFAULT_MAINTENANCE_CONVERT_MAX_MB,
+    DEFAULT_MAINTENANCE_LOG_KEEP_DAYS,
     TITLE_CONFIG_ERROR,
 )
 
@@ -39,7 +65,7 @@ class ConfigManager:
                     "app_name": APP_DEFAULT_NAME,
                     "company_name": "",
                     "printer": {"port": DEFAULT_PRINTER_PORT, "baudrate": DEFAULT_PRINTER_BAUDRATE, "timeout": DEFAULT_PRINTER_TIMEOUT},
-                    "data": {"csv_path": DEFAULT_CSV_PATH, "db_path": DEFAULT_DB_PATH, "default_unit": DEFAULT_UNIT},
+                    "data": {"csv_path": DEFAULT_CSV_PATH, "db_path": DEFAULT_DB_PATH, "source": DEFAULT_DATA_SOURCE, "default_unit": DEFAULT_UNIT},
                 }
                 self.save()
                 return
@@ -52,7 +78,7 @@ class ConfigManager:
                 "app_name": APP_DEFAULT_NAME,
                 "company_name": "",
                 "printer": {"port": DEFAULT_PRINTER_PORT, "baudrate": DEFAULT_PRINTER_BAUDRATE, "timeout": DEFAULT_PRINTER_TIMEOUT},
-                "data": {"csv_path": DEFAULT_CSV_PATH, "db_path": DEFAULT_DB_PATH, "default_unit": DEFAULT_UNIT},
+                "data": {"csv_path": DEFAULT_CSV_PATH, "db_path": DEFAULT_DB_PATH, "source": DEFAULT_DATA_SOURCE, "default_unit": DEFAULT_UNIT},
             }
             self.save()
         except Exception as e:
@@ -103,10 +129,160 @@ class ConfigManager:
 
     @property
     def db_path(self) -> str:
-        """Path to the SQLite database file (future migration)."""
+        """Path to the SQLite database file."""
         return self._data.get("data", {}).get("db_path", DEFAULT_DB_PATH)
 
+    @property
+    def data_source(self) -> str:
+        """Inventory backend: "csv" (pandas/CSV), "sqlite" (ItemsRepository) or "compact" (CSV in ItemStore)."""
+        return self._data.get("data", {}).get("source", DEFAULT_DATA_SOURCE)
+
+    @property
+    def watch_interval_ms(self) -> int:
+        """How often the POS checks the database for other connections' commits (0 disables)."""
+        return int(self._data.get("data", {}).get("watch_interval_ms", DEFAULT_WATCH_INTERVAL_MS))
+
     @property
     def default_unit(self) -> str:
         """Default unit string when an item row lacks a Unit value."""
         return self._data.get("data", {}).get("default_unit", DEFAULT_UNIT)
+
+    @property
+    def search_fuzzy(self) -> bool:
+        """Rank suggestions with multi-token, typo-tolerant matching (needs NumPy)."""
+        return bool(self._data.get("search", {}).get("fuzzy", DEFAULT_SEARCH_FUZZY))
+
+    @property
+    def suggestion_limit(self) -> int:
+        """Maximum number of autocomplete suggestions."""
+        return int(self._data.get("search", {}).get("suggestion_limit", DEFAULT_SUGGESTION_LIMIT))
+
+    @property
+    def server_host(self) -> str:
+        """Interface the inventory server listens on (127.0.0.1 = this PC only)."""
+        return self._data.get("server", {}).get("host", DEFAULT_SERVER_HOST)
+
+    @property
+    def server_port(self) -> int:
+        """TCP port of the inventory server."""
+        return int(self._data.get("server", {}).get("port", DEFAULT_SERVER_PORT))
+
+    @property
+    def server_db_workers(self) -> int:
+        """Threads running database calls for the inventory server."""
+        return int(self._data.get("server", {}).get("db_workers", DEFAULT_SERVER_DB_WORKERS))
+
+    @property
+    def server_max_pending(self) -> int:
+        """Database calls queued or running before the server answers 503."""
+        return int(self._data.get("server", {}).get("max_pending", DEFAULT_SERVER_MAX_PENDING))
+
+    @property
+    def server_batch_window_ms(self) -> float:
+        """How long barcode lookups wait to be coalesced into one query (milliseconds)."""
+        return float(self._data.get("server", {}).get("batch_window_ms", DEFAULT_SERVER_BATCH_WINDOW_MS))
+
+    @property
+    def server_keepalive_s(self) -> float:
+        """Idle seconds before a keep-alive connection is closed."""
+        return float(self._data.get("server", {}).get("keepalive_s", DEFAULT_SERVER_KEEPALIVE_S))
+
+    @property
+    def commit_interval_ms(self) -> float:
+        """Longest a write waits for others to share its commit (milliseconds)."""
+        return float(self._data.get("server", {}).get("commit_interval_ms", DEFAULT_COMMIT_INTERVAL_MS))
+
+    @property
+    def commit_max_commands(self) -> int:
+        """Writes per group commit before flushing early (1 = one commit per write)."""
+        return int(self._data.get("server", {}).get("commit_max_commands", DEFAULT_COMMIT_MAX_COMMANDS))
+
+    @property
+    def backup_enabled(self) -> bool:
+        """Back up the SQLite database in the background while the POS runs."""
+        return bool(self._data.get("backup", {}).get("enabled", DEFAULT_BACKUP_ENABLED))
+
+    @property
+    def backup_dir(self) -> str:
+        """Directory for database backups."""
+        return self._data.get("backup", {}).get("dir", DEFAULT_BACKUP_DIR)
+
+    @property
+    def backup_interval_h(self) -> float:
+        """Hours between backups (0 disables scheduled backups)."""
+        return float(self._data.get("backup", {}).get("interval_h", DEFAULT_BACKUP_INTERVAL_H))
+
+    @property
+    def backup_keep(self) -> int:
+        """Number of verified backups to keep; older ones are deleted."""
+        return int(self._data.get("backup", {}).get("keep", DEFAULT_BACKUP_KEEP))
+
+    @property
+    def backup_compress(self) -> bool:
+        """Gzip backups."""
+        return bool(self._data.get("backup", {}).get("compress", DEFAULT_BACKUP_COMPRESS))
+
+    @property
+    def backup_pages_per_step(self) -> int:
+        """Pages copied per backup step; smaller steps hold the read lock for less time."""
+        return int(self._data.get("backup", {}).get("pages_per_step", DEFAULT_BACKUP_PAGES_PER_STEP))
+
+    @property
+    def maintenance_enabled(self) -> bool:
+        """Refresh planner statistics and reclaim free pages when idle and on exit."""
+        return bool(self._data.get("maintenance", {}).get("enabled", DEFAULT_MAINTENANCE_ENABLED))
+
+    @property
+    def maintenance_idle_minutes(self) -> float:
+        """Minutes without keyboard/mouse input before maintenance may run."""
+        return float(self._data.get("maintenance", {}).get("idle_minutes", DEFAULT_MAINTENANCE_IDLE_MINUTES))
+
+    @property
+    def maintenance_interval_h(self) -> float:
+        """Minimum hours between idle maintenance runs."""
+        return float(self._data.get("maintenance", {}).get("interval_h", DEFAULT_MAINTENANCE_INTERVAL_H))
+
+    @property
+    def maintenance_vacuum_pages(self) -> int:
+        """Free pages reclaimed per run (0 = all)."""
+        return int(self._data.get("maintenance", {}).get("vacuum_pages", DEFAULT_MAINTENANCE_VACUUM_PAGES))
+
+    @property
+    def maintenance_convert_max_mb(self) -> float:
+        """Largest DB (MB) an idle run switches to incremental auto-vacuum with a full VACUUM (0 = never)."""
+        return float(self._data.get("maintenance", {}).get("convert_max_mb", DEFAULT_MAINTENANCE_CONVERT_MAX_MB))
+
+    @property
+    def maintenance_log_keep_days(self) -> float:
+        """Days of low-stock events kept by maintenance (0 = keep all)."""
+        return float(self._data.get("maintenance", {}).get("log_keep_days", DEFAULT_MAINTENANCE_LOG_KEEP_DAYS))
+
+    @property
+    def slow_query_ms(self) -> float:
+        """Queries slower than this (milliseconds) are logged with SQL and params."""
+        return float(self._data.get("diagnostics", {}).get("slow_query_ms", DEFAULT_SLOW_QUERY_MS))
+
+    @property
+    def metrics_dump_interval_s(self) -> float:
+        """Seconds between metrics dumps to logs/metrics.json (0 disables)."""
+        return float(self._data.get("diagnostics", {}).get("metrics_dump_interval_s", DEFAULT_METRICS_DUMP_INTERVAL_S))
+
+    @property
+    def profile_window_s(self) -> float:
+        """Profile the first N seconds after startup (0 disables)."""
+        return float(self._data.get("diagnostics", {}).get("profile_window_s", 0))
+
+    @property
+    def profile_action(self) -> str:
+        """Action to profile once after startup ("checkout", "search", "load"; empty disables)."""
+        return self._data.get("diagnostics", {}).get("profile_action", "") or ""
+
+    @property
+    def log_level(self) -> str:
+        """Root logging level name (e.g. INFO, WARNING)."""
+        return str(self._data.get("logging", {}).get("level", "INFO")).upper()
+
+    @property
+    def log_json(self) -> bool:
+        """Write logs/app.log as JSON lines instead of text."""
+        return bool(self._data.get("logging", {}).get("json", False))
@@ -1,30 +1,41 @@
+import argparse
 import logging
-from logging.handlers import RotatingFileHandler
-from pathlib import Path
 from tkinter import Tk
+from config.manager import ConfigManager
 from ui.pos_app import POSApp
-from utils.constants import LOGS_DIR, APP_LOG_FILE
+from utils.constants import LOGS_DIR
+from utils.logging_setup import setup_logging
+from utils.profiling import PROFILER, PROFILE_ACTIONS
 
-# Setup logging (file-based with rotation)
-logs_dir = Path(LOGS_DIR)
-logs_dir.mkdir(exist_ok=True)
-log_file = logs_dir / APP_LOG_FILE
+parser = argparse.ArgumentParser(description="Inventory POS")
+parser.add_argument("--profile-window", type=float, metavar="SECONDS", default=None,
+                    help="Profile startup and the first SECONDS of use (cProfile + tracemalloc into logs/)")
+parser.add_argument("--profile-action", choices=PROFILE_ACTIONS, default=None,
+                    help="Profile the next run of this action")
+args = parser.parse_args()
 
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-
-# Avoid duplicate handlers if reloaded
-if not logger.handlers:
-    file_handler = RotatingFileHandler(log_file, maxBytes=512_000, backupCount=3, encoding="utf-8")
-    console_handler = logging.StreamHandler()
-    fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
-    file_handler.setFormatter(fmt)
-    console_handler.setFormatter(fmt)
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+# Setup logging: records are queued and written by a background listener
+config = ConfigManager()
+setup_logging(LOGS_DIR, level=config.log_level, json_lines=config.log_json)
 
 logging.info("Application starting")
 
+# Command-line switches override diagnostics.profile_* in config
+if args.profile_window:
+    PROFILER.start("window")
+
 root = Tk()
 app = POSApp(root)
+profile_window = args.profile_window if args.profile_window is not None else app.config.profile_window_s
+if profile_window:
+    if not PROFILER.running:
+        PROFILER.start("window")
+    root.after(int(profile_window * 1000), PROFILER.stop)
+profile_action = args.profile_action or app.config.profile_action
+if profile_action in PROFILE_ACTIONS:
+    app.arm_profile(profile_action, notify=False)
+elif profile_action:
+    logging.warning("Ignoring unknown diagnostics.profile_action %r", profile_action)
 root.mainloop()
+app.shutdown()
+PROFILER.stop()
@@ -0,0 +1,266 @@
+"""Archive old transaction history into per-year SQLite files.
+
+`transactions` and `transaction_items` only grow, and every index and
+backup pays for that history. `TransactionArchive.archive` moves the rows
+created before a cutoff into one file per year (`<db>-<year>.db` in the
+archive directory) and records the year in `archive_years`, so the hot
+database keeps only the recent period.
+
+`spanning(start, end)` opens a connection that ATTACHes the archive files
+a date range needs and creates TEMP views `all_transactions`,
+`all_transaction_items` and `all_stock_ledger`. Each view is a UNION ALL of
+the hot table and the attached years. A range inside the hot period
+attaches nothing, and the views then read the hot tables only.
+
+A move has two steps. First the rows are copied into the archive file and
+committed. Then they are deleted from the hot database, but only rows the
+archive already has. A crash between the two steps leaves rows in both
+places, which the next run clears. No row is lost.
+"""
+from __future__ import annotations
+import logging
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .database_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_TABLES = ("transactions", "transaction_items")
+
+
+def _start_of(value: str | date | datetime) -> str:
+    """Timestamp text for the start of a date (archive cutoffs are exclusive)."""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return f"{value.isoformat()} 00:00:00"
+    text = str(value).strip()
+    return f"{text} 00:00:00" if len(text) == 10 else text
+
+
+def _year_of(value: str | date | datetime) -> int:
+    return value.year if isinstance(value, date) else int(str(value).strip()[:4])
+
+
+class TransactionArchive:
+    """Move old transactions into yearly archive files and query across them."""
+
+    def __init__(self, db: DatabaseManager, archive_dir: str | Path | None = None):
+        self.db = db
+        self.archive_dir = Path(archive_dir) if archive_dir is not None else db.db_path.parent / "archive"
+
+    def path_for(self, year: int) -> Path:
+        return self.archive_dir / f"{self.db.db_path.stem}-{int(year)}.db"
+
+    def years(self) -> List[Dict[str, Any]]:
+        """Archived years with their row counts and time range, oldest first."""
+        with self.db.connect() as conn:
+            cur = conn.execute("SELECT * FROM archive_years ORDER BY year")
+            cols = [d[0] for d in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    def archived_through(self) -> Optional[str]:
+        """`created_at` of the newest archived transaction, or None."""
+        row = self.db.query_one("SELECT MAX(last_at) FROM archive_years")
+        return row[0] if row else None
+
+    def archive(self, before: str | date | datetime) -> List[Dict[str, Any]]:
+        """Move transactions created before `before` into their years' archive files.
+
+        The newest transaction (and the one owning the newest line) always
+        stays, so SQLite never hands out an archived id again.
+
+        Returns:
+            One summary per year touched.
+        """
+        cutoff = _start_of(before)
+        with self.db.connect() as conn:
+            keep = self._keep_id(conn)
+            years = [
+                int(r[0])
+                for r in conn.execute(
+                    "SELECT DISTINCT substr(created_at, 1, 4) FROM transactions WHERE created_at < ? AND id < ? ORDER BY 1",
+                    (cutoff, keep),
+                )
+            ]
+        results = []
+        for year in years:
+            end = min(f"{year + 1}-01-01 00:00:00", cutoff)
+            results.append(self._move_year(year, f"{year}-01-01 00:00:00", end))
+        return results
+
+    @staticmethod
+    def _keep_id(conn: sqlite3.Connection) -> int:
+        row = conn.execute(
+            """
+            SELECT MIN(COALESCE((SELECT MAX(id) FROM transactions), 0),
+                       COALESCE((SELECT transaction_id FROM transaction_items ORDER BY id DESC LIMIT 1), 0))
+            """
+        ).fetchone()
+        return int(row[0])
+
+    def _move_year(self, year: int, start: str, end: str) -> Dict[str, Any]:
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(year)
+        schema = f"archive_{year}"
+        with self.db.connect() as conn:
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (str(path),))
+            columns = self._ensure_tables(conn, schema)
+            trx_cols = ", ".join(columns["transactions"])
+            ti_cols = ", ".join(columns["transaction_items"])
+            in_range = "created_at >= :start AND created_at < :end AND id < :keep"
+            params = {"start": start, "end": end, "keep": self._keep_id(conn)}
+
+            # Step 1: copy into the archive file and commit it on its own
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                f"INSERT OR IGNORE INTO {schema}.transactions ({trx_cols}) "
+                f"SELECT {trx_cols} FROM main.transactions WHERE {in_range}",
+                params,
+            )
+            conn.execute(
+                f"INSERT OR IGNORE INTO {schema}.transaction_items ({ti_cols}) "
+                f"SELECT {ti_cols} FROM main.transaction_items "
+                f"WHERE transaction_id IN (SELECT id FROM main.transactions WHERE {in_range})",
+                params,
+            )
+            conn.commit()
+
+            # Step 2: delete from the hot database what the archive now holds
+            conn.execute("BEGIN IMMEDIATE")
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM main.change_log").fetchone()[0]
+            lines = conn.execute(
+                f"""
+                DELETE FROM main.transaction_items
+                WHERE transaction_id IN (SELECT id FROM main.transactions WHERE {in_range})
+                  AND EXISTS (SELECT 1 FROM {schema}.transaction_items a WHERE a.id = transaction_items.id)
+                """,
+                params,
+            ).rowcount
+            moved = conn.execute(
+                f"""
+                DELETE FROM main.transactions
+                WHERE {in_range}
+                  AND EXISTS (SELECT 1 FROM {schema}.transactions a WHERE a.id = transactions.id)
+                  AND NOT EXISTS (SELECT 1 FROM main.transaction_items ti WHERE ti.transaction_id = transactions.id)
+                """,
+                params,
+            ).rowcount
+            # Archiving is not a deletion: keep the branch's change log from
+            # shipping these rows to the central database as deletes
+            conn.execute(
+                "DELETE FROM main.change_log WHERE seq > ? AND op = 'D' AND table_name IN ('transactions', 'transaction_items')",
+                (seq,),
+            )
+            conn.execute(
+                f"""
+                INSERT INTO main.archive_years (year, file_name, first_at, last_at, transactions, transaction_items, archived_at)
+                SELECT :year, :file_name, MIN(created_at), MAX(created_at), COUNT(*),
+                       (SELECT COUNT(*) FROM {schema}.transaction_items), datetime('now')
+                FROM {schema}.transactions
+                WHERE 1
+                ON CONFLICT (year) DO UPDATE SET
+                    file_name = excluded.file_name, first_at = excluded.first_at, last_at = excluded.last_at,
+                    transactions = excluded.transactions, transaction_items = excluded.transaction_items,
+                    archived_at = excluded.archived_at
+                """,
+                {"year": year, "file_name": path.name},
+            )
+            conn.commit()
+        logger.info("Archived %d transactions (%d lines) from %s..%s into %s", moved, lines, start, end, path)
+        return {"year": year, "file": str(path), "from": start, "to": end, "transactions": moved, "transaction_items": lines}
+
+    @staticmethod
+    def _ensure_tables(conn: sqlite3.Connection, schema: str) -> Dict[str, List[str]]:
+        """Create the archived tables in `schema` (or add columns the hot ones have gained).
+
+        Archive tables keep the hot tables' columns and primary keys but no
+        foreign keys: the items they reference live in the hot database.
+        Returns the hot tables' column names.
+        """
+        columns = {}
+        for table in ARCHIVED_TABLES:
+            info = conn.execute(f"PRAGMA main.table_info({table})").fetchall()
+            existing = {r[1] for r in conn.execute(f"PRAGMA {schema}.table_info({table})")}
+            if not existing:
+                decls = ", ".join(
+                    f"{name} {ctype}" + (" PRIMARY KEY" if pk else " NOT NULL" if notnull else "")
+                    for _cid, name, ctype, notnull, _default, pk in info
+                )
+                conn.execute(f"CREATE TABLE {schema}.{table} ({decls})")
+            else:
+                for _cid, name, ctype, *_ in info:
+                    if name not in existing:
+                        conn.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN {name} {ctype}")
+            columns[table] = [r[1] for r in info]
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_transactions_created ON transactions(created_at)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_trx_items_trx ON transaction_items(transaction_id)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_trx_items_item_day ON transaction_items(item_id, created_day)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_trx_items_day ON transaction_items(created_day, item_id, quantity)")
+        return columns
+
+    def covers(self, since: str | date | datetime) -> bool:
+        """True if archived transactions exist after `since` (history queries need `spanning`)."""
+        last = self.archived_through()
+        return last is not None and last > _start_of(since)
+
+    def years_between(self, start: str | date | datetime | None = None, end: str | date | datetime | None = None) -> List[int]:
+        sql = "SELECT year FROM archive_years WHERE 1 = 1"
+        params: List[int] = []
+        if start is not None:
+            sql += " AND year >= ?"
+            params.append(_year_of(start))
+        if end is not None:
+            sql += " AND year <= ?"
+            params.append(_year_of(end))
+        return [int(r[0]) for r in self.db.query_all(sql + " ORDER BY year", params)]
+
+    @contextmanager
+    def spanning(self, start: str | date | datetime | None = None, end: str | date | datetime | None = None) -> Iterator[sqlite3.Connection]:
+        """Connection whose `all_*` TEMP views cover the hot tables plus the archived years in [start, end].
+
+        Raises:
+            ValueError: If the range needs more archive files than SQLite can attach.
+        """
+        years = self.years_between(start, end)
+        with self.db.connect() as conn:
+            limit = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+            if len(years) > limit:
+                raise ValueError(f"Range spans {len(years)} archived years; at most {limit} can be attached, narrow it")
+            schemas = []
+            for year in years:
+                path = self.path_for(year)
+                if not path.exists():
+                    raise FileNotFoundError(f"Archive for {year} is missing: {path}")
+                schema = f"archive_{year}"
+                conn.execute(f"ATTACH DATABASE ? AS {schema}", (str(path),))
+                columns = self._ensure_tables(conn, schema)
+                schemas.append(schema)
+            if not schemas:
+                columns = {t: [r[1] for r in conn.execute(f"PRAGMA main.table_info({t})")] for t in ARCHIVED_TABLES}
+            self._create_views(conn, schemas, columns)
+            yield conn
+
+    @staticmethod
+    def _create_views(conn: sqlite3.Connection, schemas: List[str], columns: Dict[str, List[str]]) -> None:
+        for table in ARCHIVED_TABLES:
+            cols = ", ".join(columns[table])
+            parts = [f"SELECT {cols} FROM main.{table}"] + [f"SELECT {cols} FROM {s}.{table}" for s in schemas]
+            conn.execute(f"DROP VIEW IF EXISTS temp.all_{table}")
+            conn.execute(f"CREATE TEMP VIEW all_{table} AS " + " UNION ALL ".join(parts))
+        # Same shape as main.stock_ledger; adjustments are never archived
+        parts = ["SELECT item_id, created_at, source, transaction_id, entry_id, delta FROM main.stock_ledger"] + [
+            f"""
+            SELECT ti.item_id, t.created_at, 'T', t.id, ti.id,
+                   CASE t.transaction_type WHEN 'OUT' THEN -ti.quantity ELSE ti.quantity END
+            FROM {s}.transaction_items ti
+            JOIN {s}.transactions t ON t.id = ti.transaction_id
+            """
+            for s in schemas
+        ]
+        conn.execute("DROP VIEW IF EXISTS temp.all_stock_ledger")
+        conn.execute("CREATE TEMP VIEW all_stock_ledger AS " + " UNION ALL ".join(parts))
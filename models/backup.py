@@ -0,0 +1,261 @@
+"""Online SQLite backups with rotation and verification.
+
+Copying a live database file can catch it mid-write and produce a corrupt
+backup. `BackupManager.run` uses the SQLite online backup API instead,
+copying `pages_per_step` pages at a time and sleeping between steps, so
+tills can keep committing while a backup runs (a write during the backup
+makes SQLite restart the copy rather than block the writer; after
+`max_restarts` restarts the rest is copied in one pass).
+
+Each backup is verified before it counts: the copy (decompressed again if
+compression is on, exactly as a restore would read it) must pass
+`PRAGMA integrity_check`. Only verified backups are kept, newest `keep`.
+`BackupScheduler` runs this on a daemon thread, never on the UI thread.
+"""
+from __future__ import annotations
+import gzip
+import logging
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = ".db"
+GZ_SUFFIX = ".db.gz"
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+class BackupManager:
+    """Create, verify, rotate and restore backups of one database file."""
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        backup_dir: str | Path,
+        keep: int = 7,
+        compress: bool = True,
+        pages_per_step: int = 256,
+        step_sleep_ms: float = 5.0,
+        max_restarts: int = 3,
+    ):
+        self.db_path = Path(db_path)
+        self.backup_dir = Path(backup_dir)
+        self.keep = max(1, keep)
+        self.compress = compress
+        self.pages_per_step = max(1, pages_per_step)
+        self.step_sleep_s = max(0.0, step_sleep_ms) / 1000.0
+        self.max_restarts = max(0, max_restarts)
+
+    @property
+    def prefix(self) -> str:
+        return f"{self.db_path.stem}-"
+
+    def backups(self) -> List[Path]:
+        """Existing backups, newest first."""
+        if not self.backup_dir.exists():
+            return []
+        found = [p for p in self.backup_dir.glob(f"{self.prefix}*") if p.name.endswith((SUFFIX, GZ_SUFFIX))]
+        return sorted(found, key=lambda p: p.name, reverse=True)
+
+    def last_backup_time(self) -> Optional[float]:
+        latest = self.backups()
+        return latest[0].stat().st_mtime if latest else None
+
+    def run(self) -> Dict[str, Any]:
+        """Back up, verify and rotate; returns a summary.
+
+        Raises:
+            FileNotFoundError: If the database does not exist.
+            RuntimeError: If the copy fails verification (it is discarded).
+        """
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Database not found: {self.db_path}")
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        final = self.backup_dir / f"{self.prefix}{stamp}{GZ_SUFFIX if self.compress else SUFFIX}"
+        part = self.backup_dir / f"{self.prefix}{stamp}{SUFFIX}.part"
+        started = time.perf_counter()
+        steps = restarts = 0
+        last_remaining = None
+
+        def progress(status, remaining, total):
+            nonlocal steps, restarts, last_remaining
+            steps += 1
+            if last_remaining is not None and remaining > last_remaining:
+                restarts += 1
+                if restarts > self.max_restarts:
+                    raise _TooManyRestarts()
+            last_remaining = remaining
+
+        src = sqlite3.connect(str(self.db_path))
+        dst = sqlite3.connect(str(part))
+        try:
+            try:
+                src.backup(dst, pages=self.pages_per_step, progress=progress, sleep=self.step_sleep_s)
+            except _TooManyRestarts:
+                # Writes keep landing between steps; copy in one pass under a
+                # single read lock instead (writers are not blocked in WAL mode)
+                logger.info("Backup restarted %d times, copying in one pass", restarts)
+                src.backup(dst, pages=-1)
+            pages = dst.execute("PRAGMA page_count").fetchone()[0]
+        finally:
+            dst.close()
+            src.close()
+        copy_ms = (time.perf_counter() - started) * 1000.0
+        try:
+            if self.compress:
+                gz_part = final.with_name(final.name + ".part")
+                with part.open("rb") as f_in, gzip.open(gz_part, "wb", compresslevel=6) as f_out:
+                    shutil.copyfileobj(f_in, f_out, 1 << 20)
+                part.unlink()
+                part = gz_part
+            check = self.verify(part)
+            if check != "ok":
+                raise RuntimeError(f"Backup failed integrity_check: {check}")
+            part.replace(final)
+        except Exception:
+            part.unlink(missing_ok=True)
+            raise
+        removed = self.rotate()
+        total_ms = (time.perf_counter() - started) * 1000.0
+        METRICS.record("backup.copy", copy_ms)
+        METRICS.record("backup.total", total_ms)
+        summary = {
+            "file": str(final),
+            "pages": pages,
+            "steps": steps,
+            "restarts": restarts,
+            "bytes": final.stat().st_size,
+            "copy_ms": round(copy_ms, 1),
+            "total_ms": round(total_ms, 1),
+            "removed": [str(p) for p in removed],
+        }
+        logger.info("Backup %s: %d pages in %d steps, %d bytes, %.0f ms", final.name, pages, steps, summary["bytes"], total_ms)
+        return summary
+
+    def verify(self, path: str | Path) -> str:
+        """Run `PRAGMA integrity_check` on a backup; returns "ok" or the problems found.
+
+        Compressed backups are decompressed to a temporary file first, the
+        same way `restore` reads them.
+        """
+        path = Path(path)
+        with tempfile.TemporaryDirectory(prefix="inv-verify-", dir=self.backup_dir if self.backup_dir.exists() else None) as tmp:
+            try:
+                db_file = self._plain_copy(path, Path(tmp))
+            except (OSError, EOFError) as e:
+                return f"unreadable: {e}"
+            conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+            try:
+                rows = conn.execute("PRAGMA integrity_check").fetchall()
+            except sqlite3.DatabaseError as e:
+                return str(e)
+            finally:
+                conn.close()
+        return "; ".join(str(r[0]) for r in rows)
+
+    def rotate(self) -> List[Path]:
+        """Delete all but the newest `keep` backups (and stale partial files)."""
+        removed = []
+        for p in self.backups()[self.keep:]:
+            p.unlink(missing_ok=True)
+            removed.append(p)
+        for p in self.backup_dir.glob(f"{self.prefix}*.part"):
+            # Left by a crash mid-backup; a running backup's file is younger
+            if time.time() - p.stat().st_mtime > 3600:
+                p.unlink(missing_ok=True)
+                removed.append(p)
+        return removed
+
+    def restore(self, backup: str | Path, target: str | Path | None = None) -> Path:
+        """Verify a backup, then copy it into `target` (default: the live DB) with the backup API.
+
+        Close the POS and stop the server before restoring over the live DB.
+
+        Raises:
+            RuntimeError: If the backup fails verification.
+        """
+        backup = Path(backup)
+        target = Path(target) if target is not None else self.db_path
+        check = self.verify(backup)
+        if check != "ok":
+            raise RuntimeError(f"Refusing to restore {backup.name}: {check}")
+        with tempfile.TemporaryDirectory(prefix="inv-restore-") as tmp:
+            src = sqlite3.connect(str(self._plain_copy(backup, Path(tmp))))
+            dst = sqlite3.connect(str(target))
+            try:
+                src.backup(dst)
+            finally:
+                dst.close()
+                src.close()
+        logger.info("Restored %s into %s", backup, target)
+        return target
+
+    @staticmethod
+    def _plain_copy(path: Path, tmp_dir: Path) -> Path:
+        if not path.name.endswith((".gz", ".gz.part")):
+            return path
+        out = tmp_dir / "restore.db"
+        with gzip.open(path, "rb") as f_in, out.open("wb") as f_out:
+            shutil.copyfileobj(f_in, f_out, 1 << 20)
+        return out
+
+
+class BackupScheduler:
+    """Run `BackupManager.run` on a daemon thread whenever the newest backup is older than `interval_h`.
+
+    Checks on start and then every `check_s` seconds, so a till switched off
+    overnight still gets its backup soon after it starts.
+    """
+
+    def __init__(self, manager: BackupManager, interval_h: float = 24.0, check_s: float = 600.0):
+        self.manager = manager
+        self.interval_s = interval_h * 3600.0
+        self.check_s = check_s
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def due(self) -> bool:
+        last = self.manager.last_backup_time()
+        return last is None or time.time() - last >= self.interval_s
+
+    def start(self) -> None:
+        self.stop()
+        if self.interval_s <= 0:
+            return
+        self._stop = threading.Event()
+
+        def run(stop):
+            # Let startup finish before the first check
+            delay = min(60.0, self.check_s)
+            while not stop.wait(delay):
+                delay = self.check_s
+                if not self.manager.db_path.exists() or not self.due():
+                    continue
+                try:
+                    self.last_result = self.manager.run()
+                    self.last_error = None
+                except Exception as e:
+                    self.last_error = str(e)
+                    logger.exception("Scheduled backup of %s failed", self.manager.db_path)
+
+        self._thread = threading.Thread(target=run, args=(self._stop,), name="db-backup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread = None
@@ -0,0 +1,110 @@
+from __future__ import annotations
+import os
+import pickle
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from utils.constants import CACHE_DIR, CATALOGUE_CACHE_FILE
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogueCache:
+    """Binary snapshot of the item catalogue and its search index.
+
+    The snapshot is keyed by the source file's resolved path, mtime and size
+    (plus an optional extra token such as a schema version), so loading it
+    is only a pickle read while the source is unchanged.
+    """
+
+    # Bump when the payload layout changes
+    FORMAT_VERSION = 1
+    # Serializes writers of the temp file (stores may run on background threads)
+    _write_lock = threading.Lock()
+
+    def __init__(
+        self,
+        source: str | Path,
+        cache_dir: str | Path = CACHE_DIR,
+        token: Any = None,
+        filename: str = CATALOGUE_CACHE_FILE,
+    ):
+        """Create a cache for the given source file.
+
+        Args:
+            source: Data file the catalogue is built from.
+            cache_dir: Directory holding the snapshot file.
+            token: Extra value folded into the key (e.g. schema version).
+            filename: Snapshot file name, so different payload types don't evict each other.
+        """
+        self.source = Path(source)
+        self.path = Path(cache_dir) / filename
+        self.token = token
+
+    def key(self) -> Optional[tuple]:
+        """Return the current key of the source, or None if it does not exist."""
+        try:
+            st = self.source.stat()
+        except OSError:
+            return None
+        return (self.FORMAT_VERSION, str(self.source.resolve()), st.st_mtime_ns, st.st_size, self.token)
+
+    def is_fresh(self) -> bool:
+        """True if a snapshot exists for the current source key (header check only)."""
+        key = self.key()
+        if key is None or not self.path.exists():
+            return False
+        try:
+            with self.path.open("rb") as f:
+                return pickle.load(f) == key
+        except Exception:
+            return False
+
+    def load(self) -> Optional[Any]:
+        """Return the cached payload, or None when missing, stale or unreadable."""
+        key = self.key()
+        if key is None or not self.path.exists():
+            return None
+        try:
+            with self.path.open("rb") as f:
+                if pickle.load(f) != key:
+                    return None
+                return pickle.load(f)
+        except Exception:
+            logger.warning("Ignoring unreadable catalogue cache at %s", self.path, exc_info=True)
+            return None
+
+    def store(self, payload: Any, key: Optional[tuple] = None) -> None:
+        """Write the payload under the source key (atomic replace).
+
+        Args:
+            payload: Object to pickle.
+            key: Source key the payload was built from (default: current).
+                If the source has changed since, nothing is written; the
+                store for the newer file follows.
+        """
+        current = self.key()
+        if current is None or (key is not None and key != current):
+            return
+        # Write the payload's own key: if the source changes during the
+        # write, the snapshot is merely stale, never mislabelled
+        key = current if key is None else key
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._write_lock:
+                with tmp.open("wb") as f:
+                    # Key first so freshness checks don't unpickle the payload
+                    pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self.path)
+        except Exception:
+            logger.warning("Failed writing catalogue cache to %s", self.path, exc_info=True)
+
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,177 @@
+"""Per-row change events for commits made by other connections.
+
+Tills, the inventory server and scripts all write the same database file,
+so a view holding item rows (the POS cart's Stock column, the low-stock
+indicator) goes stale as soon as another process commits. Re-reading
+everything on a timer costs a query per row per tick.
+
+`ChangeWatcher.poll` keeps one connection open and reads
+`PRAGMA data_version` on it. The pragma costs no I/O and changes only when
+another connection has committed. When it moves, the watcher reads the
+`change_log` entries (see `CDC_TABLES`) after the last sequence number it
+has seen, collapses repeated changes of a row, and fetches the current
+values of just those rows. Subscribers then get one event per changed row:
+
+    {"table": "items", "id": 12, "op": "U", "row": {...current values...}}
+
+`op` is "I" (inserted since the last poll), "U" or "D". `row` is None for
+deletes. Idle polls therefore cost one pragma, and busy polls cost time
+proportional to the rows that changed.
+"""
+from __future__ import annotations
+import logging
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.metrics import METRICS, timed
+from .database_manager import CDC_TABLES, DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+Event = Dict[str, Any]
+# Rows are fetched by id in chunks below SQLite's default variable limit
+FETCH_CHUNK = 500
+
+
+class ChangeWatcher:
+    """Poll `PRAGMA data_version` and dispatch change events for the rows that changed.
+
+    `poll()` must always be called from the same thread, for example a Tk
+    `after` loop or the thread `start()` creates. The watcher's connection
+    belongs to that thread.
+    """
+
+    def __init__(self, db: DatabaseManager, max_changes: int = 5000):
+        self.db = db
+        self.max_changes = max_changes
+        self.data_version: Optional[int] = None
+        self.last_seq: Optional[int] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._subscribers: List[Tuple[Callable[[List[Event]], None], Optional[frozenset]]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[List[Event]], None], tables: Optional[Iterable[str]] = None) -> None:
+        """Call `callback(events)` with each non-empty batch of changes to `tables` (default: all)."""
+        wanted = None if tables is None else frozenset(tables)
+        unknown = (wanted or frozenset()) - set(CDC_TABLES)
+        if unknown:
+            raise ValueError(f"Not tracked in change_log: {', '.join(sorted(unknown))}")
+        self._subscribers.append((callback, wanted))
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Autocommit, so no read transaction stays open between polls
+            self._conn = sqlite3.connect(str(self.db.db_path), isolation_level=None)
+            self.data_version = int(self._conn.execute("PRAGMA data_version").fetchone()[0])
+            # Start from "now": only changes committed after the watcher opened
+            self.last_seq = int(self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0])
+        return self._conn
+
+    def changed(self) -> bool:
+        """True if another connection has committed since the last call."""
+        conn = self._connection()
+        version = int(conn.execute("PRAGMA data_version").fetchone()[0])
+        if version == self.data_version:
+            return False
+        self.data_version = version
+        return True
+
+    def poll(self) -> List[Event]:
+        """Dispatch and return the change events since the last poll (none if nothing was committed)."""
+        if not self.changed():
+            return []
+        with timed("watcher.poll"):
+            conn = self._connection()
+            touched: Dict[str, Dict[int, str]] = {}
+            # A burst larger than max_changes is read in several chunks and
+            # merged, so each row still yields one event
+            while self._read_changes(conn, touched):
+                pass
+            events: List[Event] = []
+            for table, ops in touched.items():
+                rows = self._current_rows(conn, table, list(ops))
+                for row_id, op in ops.items():
+                    row = rows.get(row_id)
+                    events.append({"table": table, "id": row_id, "op": "D" if row is None else op, "row": row})
+        if not events:
+            return []
+        METRICS.record("watcher.events", float(len(events)))
+        for callback, wanted in list(self._subscribers):
+            selected = events if wanted is None else [e for e in events if e["table"] in wanted]
+            if not selected:
+                continue
+            try:
+                callback(selected)
+            except Exception:
+                logger.exception("Change subscriber failed")
+        return events
+
+    def _read_changes(self, conn: sqlite3.Connection, touched: Dict[str, Dict[int, str]]) -> bool:
+        """Add up to max_changes log entries to `touched` ({table: {row id: op}}); True if more remain."""
+        changes = conn.execute(
+            "SELECT seq, table_name, row_id, op FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?",
+            (self.last_seq, self.max_changes),
+        ).fetchall()
+        if not changes:
+            return False
+        self.last_seq = int(changes[-1][0])
+        wanted = self._wanted_tables()
+        for _seq, table, row_id, op in changes:
+            if wanted is not None and table not in wanted:
+                continue
+            ops = touched.setdefault(table, {})
+            # "I" sticks: a row inserted and then updated since the last poll is new
+            if ops.get(row_id) != "I":
+                ops[row_id] = op
+        return len(changes) == self.max_changes
+
+    def _wanted_tables(self) -> Optional[frozenset]:
+        """Tables some subscriber listens to; None if one listens to all."""
+        wanted: set = set()
+        for _callback, tables in self._subscribers:
+            if tables is None:
+                return None
+            wanted |= tables
+        return frozenset(wanted)
+
+    @staticmethod
+    def _current_rows(conn: sqlite3.Connection, table: str, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        rows: Dict[int, Dict[str, Any]] = {}
+        for i in range(0, len(ids), FETCH_CHUNK):
+            part = ids[i:i + FETCH_CHUNK]
+            cur = conn.execute(f"SELECT * FROM {table} WHERE id IN ({','.join('?' * len(part))})", part)
+            cols = [d[0] for d in cur.description]
+            for r in cur.fetchall():
+                row = dict(zip(cols, r))
+                rows[row["id"]] = row
+        return rows
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def start(self, interval_s: float = 1.0) -> None:
+        """Poll on a daemon thread every `interval_s`; subscribers are called on that thread."""
+        self.stop()
+        self._stop = threading.Event()
+
+        def run(stop):
+            try:
+                while not stop.wait(interval_s):
+                    try:
+                        self.poll()
+                    except sqlite3.Error:
+                        logger.exception("Change watcher poll failed")
+            finally:
+                self.close()
+
+        self._thread = threading.Thread(target=run, args=(self._stop,), name="db-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread = None
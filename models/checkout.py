@@ -0,0 +1,163 @@
+from __future__ import annotations
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .database_manager import DatabaseManager
+from .items_repository import resolve_item_keys
+from .receiving import DeliveryLine, next_transaction_number, normalize_line
+
+logger = logging.getLogger(__name__)
+
+CheckoutLine = Tuple[str, int, Optional[int]]
+
+
+def normalize_checkout_line(line: DeliveryLine) -> CheckoutLine:
+    """(key, qty, item_id) from a delivery-style line.
+
+    A dict line may carry "item_id" (the POS cart does), which is used
+    instead of looking up the key; the key is then only shown in errors.
+    """
+    if isinstance(line, dict) and line.get("item_id") is not None:
+        item_id = int(line["item_id"])
+        key, qty = normalize_line({**line, "key": line.get("key") or f"#{item_id}"})
+        return key, qty, item_id
+    key, qty = normalize_line(line)
+    return key, qty, None
+
+
+class CheckoutRepository:
+    """Record sales as `OUT` transactions.
+
+    Cart lines are resolved to items in one set-based lookup (code, barcode,
+    then name) and the stock decrement is relative (`current_stock - qty`)
+    under the write lock, so two tills selling the same item never overwrite
+    each other's stock.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def checkout(
+        self,
+        lines: Iterable[DeliveryLine],
+        person_name: str,
+        notes: str | None = None,
+        allow_negative: bool = False,
+    ) -> Dict[str, Any]:
+        """Commit one cart as an `OUT` transaction in one database transaction.
+
+        Args:
+            lines: (key, qty) tuples or dicts with "key" (or code/barcode/name)
+                and "qty"; a dict with "item_id" is not looked up by key.
+            person_name: Cashier or till name.
+            notes: Stored on the transaction.
+            allow_negative: Sell even if stock would drop below zero.
+
+        Returns:
+            {"transaction_id", "transaction_number", "total_qty",
+             "items": [{item_id, name, unit, qty, stock_before, stock_after}]}
+
+        Raises:
+            ValueError: If person_name is empty, a key or item_id does not resolve, or
+                stock is insufficient and allow_negative is False.
+        """
+        person_name = (person_name or "").strip()
+        if not person_name:
+            raise ValueError("Person name is required")
+        rows = [normalize_checkout_line(line) for line in lines]
+        if not rows:
+            raise ValueError("Cart is empty")
+        with self.db.transaction(immediate=True) as conn:
+            return self.write(conn, rows, person_name, notes, allow_negative)
+
+    def write(
+        self,
+        conn,
+        rows: List[CheckoutLine],
+        person_name: str,
+        notes: str | None = None,
+        allow_negative: bool = False,
+    ) -> Dict[str, Any]:
+        """Resolve and write normalized (key, qty, item_id) rows on an open write transaction."""
+        # Temp tables are kept for the connection's lifetime and emptied per
+        # cart: dropping them is a schema change that re-prepares every
+        # cached statement, which dominates on a long-lived writer connection
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS checkout_lines (line INTEGER PRIMARY KEY, key TEXT NOT NULL, qty INTEGER NOT NULL, item_id INTEGER)"
+        )
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS checkout_delta (item_id INTEGER PRIMARY KEY, qty INTEGER NOT NULL, first_line INTEGER NOT NULL)"
+        )
+        conn.execute("DELETE FROM temp.checkout_lines")
+        conn.execute("DELETE FROM temp.checkout_delta")
+        conn.executemany("INSERT INTO temp.checkout_lines (key, qty, item_id) VALUES (?, ?, ?)", rows)
+        resolve_item_keys(conn, "temp.checkout_lines")
+        unresolved = [
+            r[0]
+            for r in conn.execute(
+                "SELECT key FROM temp.checkout_lines WHERE item_id IS NULL OR item_id NOT IN (SELECT id FROM items) ORDER BY line"
+            )
+        ]
+        if unresolved:
+            raise ValueError(f"Unknown item(s): {', '.join(unresolved[:10])}")
+        conn.execute(
+            """
+            INSERT INTO temp.checkout_delta (item_id, qty, first_line)
+            SELECT item_id, SUM(qty), MIN(line) FROM temp.checkout_lines GROUP BY item_id
+            """
+        )
+        if not allow_negative:
+            short = conn.execute(
+                """
+                SELECT i.name, i.current_stock, d.qty
+                FROM temp.checkout_delta d JOIN items i ON i.id = d.item_id
+                WHERE i.current_stock < d.qty
+                ORDER BY d.first_line
+                """
+            ).fetchall()
+            if short:
+                detail = ", ".join(f"{name} (stock {stock}, qty {qty})" for name, stock, qty in short[:10])
+                raise ValueError(f"Insufficient stock: {detail}")
+        number = next_transaction_number(conn, "OUT")
+        cur = conn.execute(
+            "INSERT INTO transactions (transaction_number, person_name, transaction_type, notes) VALUES (?, ?, 'OUT', ?)",
+            (number, person_name, notes),
+        )
+        trx_id = int(cur.lastrowid)
+        conn.execute(
+            """
+            INSERT INTO transaction_items (transaction_id, item_id, quantity, stock_before, stock_after, created_ts, created_day)
+            SELECT t.id, d.item_id, d.qty, i.current_stock, i.current_stock - d.qty, t.created_ts, t.created_day
+            FROM temp.checkout_delta d
+            JOIN items i ON i.id = d.item_id
+            JOIN transactions t ON t.id = ?
+            ORDER BY d.first_line
+            """,
+            (trx_id,),
+        )
+        cur = conn.execute(
+            """
+            SELECT ti.item_id, i.name, i.unit, ti.quantity AS qty, ti.stock_before, ti.stock_after
+            FROM transaction_items ti JOIN items i ON i.id = ti.item_id
+            WHERE ti.transaction_id = ?
+            ORDER BY ti.id
+            """,
+            (trx_id,),
+        )
+        cols = [c[0] for c in cur.description]
+        items = [dict(zip(cols, r)) for r in cur.fetchall()]
+        conn.execute(
+            """
+            UPDATE items
+            SET current_stock = current_stock - (SELECT qty FROM temp.checkout_delta d WHERE d.item_id = items.id),
+                updated_at = datetime('now')
+            WHERE id IN (SELECT item_id FROM temp.checkout_delta)
+            """
+        )
+        logger.info("Checkout %s by %s: %d items, %d units", number, person_name, len(items), sum(i["qty"] for i in items))
+        return {
+            "transaction_id": trx_id,
+            "transaction_number": number,
+            "total_qty": sum(int(i["qty"]) for i in items),
+            "items": items,
+        }
@@ -1,10 +1,14 @@
 import sqlite3
 import logging
+import time
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Iterable, Optional
 
 from config.manager import ConfigManager
+from utils.constants import DEFAULT_SLOW_QUERY_MS
+from utils.metrics import METRICS
+from utils.logging_setup import is_configured, setup_logging
 
 
 DDL_STATEMENTS = [
@@ -17,6 +21,69 @@ DDL_STATEMENTS = [
         created_at TEXT NOT NULL DEFAULT (datetime('now'))
     );
     """,
+    """CREATE INDEX IF NOT EXISTS idx_product_groups_parent ON product_groups(parent_id);""",
+    # product_group_closure: one row per (ancestor, descendant) pair incl. self at depth 0
+    """
+    CREATE TABLE IF NOT EXISTS product_group_closure (
+        ancestor_id INTEGER NOT NULL,
+        descendant_id INTEGER NOT NULL,
+        depth INTEGER NOT NULL,
+        PRIMARY KEY (ancestor_id, descendant_id)
+    ) WITHOUT ROWID;
+    """,
+    """CREATE INDEX IF NOT EXISTS idx_group_closure_desc ON product_group_closure(descendant_id, depth);""",
+    # Backfill groups created before the closure table existed (no-op once populated)
+    """
+    INSERT OR IGNORE INTO product_group_closure (ancestor_id, descendant_id, depth)
+    WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM product_groups
+        UNION ALL
+        SELECT t.ancestor_id, g.id, t.depth + 1
+        FROM tree t JOIN product_groups g ON g.parent_id = t.descendant_id
+    )
+    SELECT ancestor_id, descendant_id, depth FROM tree;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_groups_closure_insert
+    AFTER INSERT ON product_groups
+    BEGIN
+        INSERT INTO product_group_closure (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, NEW.id, depth + 1 FROM product_group_closure WHERE descendant_id = NEW.parent_id
+        UNION ALL
+        SELECT NEW.id, NEW.id, 0;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_groups_closure_no_cycle
+    BEFORE UPDATE OF parent_id ON product_groups
+    WHEN NEW.parent_id IN (SELECT descendant_id FROM product_group_closure WHERE ancestor_id = NEW.id)
+    BEGIN
+        SELECT RAISE(ABORT, 'product group cannot be moved under itself');
+    END;
+    """,
+    # Move: detach the subtree from its old ancestors, then attach it under the new parent
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_groups_closure_move
+    AFTER UPDATE OF parent_id ON product_groups
+    WHEN OLD.parent_id IS NOT NEW.parent_id
+    BEGIN
+        DELETE FROM product_group_closure
+        WHERE descendant_id IN (SELECT descendant_id FROM product_group_closure WHERE ancestor_id = NEW.id)
+          AND ancestor_id IN (SELECT ancestor_id FROM product_group_closure WHERE descendant_id = NEW.id AND depth > 0);
+        INSERT INTO product_group_closure (ancestor_id, descendant_id, depth)
+        SELECT up.ancestor_id, down.descendant_id, up.depth + down.depth + 1
+        FROM product_group_closure up
+        JOIN product_group_closure down ON down.ancestor_id = NEW.id
+        WHERE up.descendant_id = NEW.parent_id;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_groups_closure_delete
+    AFTER DELETE ON product_groups
+    BEGIN
+        DELETE FROM product_group_closure WHERE descendant_id = OLD.id OR ancestor_id = OLD.id;
+    END;
+    """,
     # items (barcode NOT UNIQUE per user), code UNIQUE
     """
     CREATE TABLE IF NOT EXISTS items (
@@ -27,13 +94,16 @@ DDL_STATEMENTS = [
         unit TEXT NOT NULL DEFAULT 'pcs',
         barcode TEXT UNIQUE,
         current_stock INTEGER NOT NULL DEFAULT 0,
+        min_stock INTEGER,
         active INTEGER NOT NULL DEFAULT 1,
         created_at TEXT NOT NULL DEFAULT (datetime('now')),
-        updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+        updated_at TEXT NOT NULL DEFAULT (datetime('now')),
+        updated_ts INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', updated_at) AS INTEGER)) VIRTUAL
     );
     """,
     # indexes
     """CREATE INDEX IF NOT EXISTS idx_items_name ON items(name);""",
+    """CREATE INDEX IF NOT EXISTS idx_items_group ON items(group_id);""",
     """CREATE INDEX IF NOT EXISTS idx_items_code ON items(code);""",
     """CREATE INDEX IF NOT EXISTS idx_items_barcode ON items(barcode);""",
     # transactions
@@ -44,7 +114,10 @@ DDL_STATEMENTS = [
         person_name TEXT NOT NULL,
         transaction_type TEXT NOT NULL CHECK (transaction_type IN ('OUT','IN','ADJUST')),
         notes TEXT,
-        created_at TEXT NOT NULL DEFAULT (datetime('now'))
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        created_ts INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', created_at) AS INTEGER)) VIRTUAL,
+        created_day INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', created_at) AS INTEGER) / 86400) VIRTUAL,
+        voided_at TEXT
     );
     """,
     # transaction_items
@@ -55,11 +128,14 @@ DDL_STATEMENTS = [
         item_id INTEGER NOT NULL REFERENCES items(id),
         quantity INTEGER NOT NULL,
         stock_before INTEGER NOT NULL,
-        stock_after INTEGER NOT NULL
+        stock_after INTEGER NOT NULL,
+        created_ts INTEGER,
+        created_day INTEGER
     );
     """,
     # index for transaction_items
     """CREATE INDEX IF NOT EXISTS idx_trx_items_trx ON transaction_items(transaction_id);""",
+    """CREATE INDEX IF NOT EXISTS idx_transactions_created ON transactions(created_at);""",
     # stock_adjustments
     """
     CREATE TABLE IF NOT EXISTS stock_adjustments (
@@ -69,41 +145,370 @@ DDL_STATEMENTS = [
         new_stock INTEGER NOT NULL,
         adjustment INTEGER NOT NULL,
         reason TEXT,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        created_ts INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', created_at) AS INTEGER)) VIRTUAL,
+        created_day INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', created_at) AS INTEGER) / 86400) VIRTUAL
+    );
+    """,
+    """CREATE INDEX IF NOT EXISTS idx_stock_adj_item ON stock_adjustments(item_id, created_at);""",
+    # stock_ledger: every stock movement as a signed delta (OUT negative, IN/ADJUST signed as stored).
+    # Ledger order is (created_at, source, transaction_id, entry_id); transaction_id is NULL for adjustments.
+    """
+    CREATE VIEW IF NOT EXISTS stock_ledger AS
+    SELECT ti.item_id AS item_id,
+           t.created_at AS created_at,
+           'T' AS source,
+           t.id AS transaction_id,
+           ti.id AS entry_id,
+           CASE t.transaction_type WHEN 'OUT' THEN -ti.quantity ELSE ti.quantity END AS delta
+    FROM transaction_items ti
+    JOIN transactions t ON t.id = ti.transaction_id
+    UNION ALL
+    SELECT item_id, created_at, 'A', NULL, id, adjustment
+    FROM stock_adjustments;
+    """,
+    # stock_snapshots: per-item stock at the end of a period (as_of is inclusive)
+    """
+    CREATE TABLE IF NOT EXISTS stock_snapshots (
+        id INTEGER PRIMARY KEY,
+        item_id INTEGER NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+        as_of TEXT NOT NULL,
+        period TEXT NOT NULL CHECK (period IN ('day','week')),
+        stock INTEGER NOT NULL,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        UNIQUE (item_id, as_of)
+    );
+    """,
+    """CREATE INDEX IF NOT EXISTS idx_stock_snapshots_as_of ON stock_snapshots(as_of);""",
+    # reconciliation: expected stock per item derived from the ledger
+    """
+    CREATE TABLE IF NOT EXISTS stock_reconciliation (
+        item_id INTEGER PRIMARY KEY REFERENCES items(id) ON DELETE CASCADE,
+        expected_stock INTEGER NOT NULL,
+        mismatch INTEGER NOT NULL DEFAULT 0,
+        checked_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    """,
+    """CREATE INDEX IF NOT EXISTS idx_stock_recon_mismatch ON stock_reconciliation(mismatch) WHERE mismatch = 1;""",
+    # reconciliation_checkpoints: ledger position covered by each run
+    """
+    CREATE TABLE IF NOT EXISTS reconciliation_checkpoints (
+        id INTEGER PRIMARY KEY,
+        last_trx_item_id INTEGER NOT NULL,
+        last_adjustment_id INTEGER NOT NULL,
+        last_item_id INTEGER NOT NULL,
+        mode TEXT NOT NULL CHECK (mode IN ('full','incremental')),
+        entries_processed INTEGER NOT NULL,
+        items_checked INTEGER NOT NULL,
+        mismatches INTEGER NOT NULL,
         created_at TEXT NOT NULL DEFAULT (datetime('now'))
     );
     """,
+    # low stock: the partial index is the low-stock set (NULL min_stock = no alert)
+    """CREATE INDEX IF NOT EXISTS idx_items_low_stock ON items(current_stock - min_stock) WHERE current_stock <= min_stock;""",
+    # low_stock_events: threshold crossings, written by triggers for any writer
+    """
+    CREATE TABLE IF NOT EXISTS low_stock_events (
+        id INTEGER PRIMARY KEY,
+        item_id INTEGER NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+        is_low INTEGER NOT NULL,
+        stock INTEGER NOT NULL,
+        min_stock INTEGER,
+        created_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_items_low_stock_insert
+    AFTER INSERT ON items
+    WHEN NEW.current_stock <= NEW.min_stock
+    BEGIN
+        INSERT INTO low_stock_events (item_id, is_low, stock, min_stock)
+        VALUES (NEW.id, 1, NEW.current_stock, NEW.min_stock);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_items_low_stock_update
+    AFTER UPDATE OF current_stock, min_stock ON items
+    WHEN COALESCE(OLD.current_stock <= OLD.min_stock, 0) != COALESCE(NEW.current_stock <= NEW.min_stock, 0)
+    BEGIN
+        INSERT INTO low_stock_events (item_id, is_low, stock, min_stock)
+        VALUES (NEW.id, COALESCE(NEW.current_stock <= NEW.min_stock, 0), NEW.current_stock, NEW.min_stock);
+    END;
+    """,
+    # catalogue_version: bumped whenever the searchable name set changes, so
+    # in-memory search indexes rebuild only then (stock writes don't bump it)
+    """
+    CREATE TABLE IF NOT EXISTS catalogue_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    );
+    """,
+    """INSERT OR IGNORE INTO catalogue_version (id, version) VALUES (1, 0);""",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_items_catalogue_insert
+    AFTER INSERT ON items
+    BEGIN
+        UPDATE catalogue_version SET version = version + 1 WHERE id = 1;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_items_catalogue_update
+    AFTER UPDATE OF name, active ON items
+    WHEN OLD.name IS NOT NEW.name OR OLD.active IS NOT NEW.active
+    BEGIN
+        UPDATE catalogue_version SET version = version + 1 WHERE id = 1;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_items_catalogue_delete
+    AFTER DELETE ON items
+    BEGIN
+        UPDATE catalogue_version SET version = version + 1 WHERE id = 1;
+    END;
+    """,
 ]
 
+# Change-data-capture log for branch replication (schema v7). Triggers record
+# which row changed, not its values: the exporter reads the current row, so
+# repeated updates of one item ship once and added columns need no new triggers.
+CDC_TABLES = ("items", "transactions", "transaction_items", "stock_adjustments")
+
+DDL_STATEMENTS += [
+    """
+    CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        op TEXT NOT NULL CHECK (op IN ('I','U','D')),
+        changed_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    """,
+    # replication_marks: highest seq each branch's central DB has acknowledged (schema v12);
+    # DatabaseMaintenance prunes change_log up to the lowest one
+    """
+    CREATE TABLE IF NOT EXISTS replication_marks (
+        branch TEXT PRIMARY KEY,
+        acked_seq INTEGER NOT NULL,
+        acked_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    """,
+    # Rows that existed before the log was created are logged once as inserts
+    # (sqlite_sequence gets its change_log row with the first logged change)
+    "INSERT INTO change_log (table_name, row_id, op)\n"
+    + "\nUNION ALL\n".join(
+        f"SELECT '{t}', id, 'I' FROM {t} WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'change_log')"
+        for t in CDC_TABLES
+    )
+    + ";",
+]
+for _table in CDC_TABLES:
+    for _event, _op, _row in (("INSERT", "I", "NEW"), ("UPDATE", "U", "NEW"), ("DELETE", "D", "OLD")):
+        DDL_STATEMENTS.append(
+            f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cdc_{_table}_{_event.lower()}
+    AFTER {_event} ON {_table}
+    BEGIN
+        INSERT INTO change_log (table_name, row_id, op) VALUES ('{_table}', {_row}.id, '{_op}');
+    END;
+    """
+        )
+
+# Transaction history moved to per-year archive files (schema v8); see models/archive.py
+DDL_STATEMENTS += [
+    """
+    CREATE TABLE IF NOT EXISTS archive_years (
+        year INTEGER PRIMARY KEY,
+        file_name TEXT NOT NULL,
+        first_at TEXT,
+        last_at TEXT,
+        transactions INTEGER NOT NULL DEFAULT 0,
+        transaction_items INTEGER NOT NULL DEFAULT 0,
+        archived_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    """,
+]
+
+# Integer timestamps (schema v9): epoch seconds (`*_ts`) and UTC day numbers
+# (`created_day` = ts / 86400) beside the TEXT columns, which stay the source
+# of truth. They are virtual generated columns, stored only in their indexes;
+# transaction_items has no timestamp of its own, so it stores its
+# transaction's values (written by checkout/receiving, else by trigger).
+DDL_STATEMENTS += [
+    """CREATE INDEX IF NOT EXISTS idx_transactions_created_ts ON transactions(created_ts);""",
+    # Covers per-day and per-day-per-item quantity totals without table reads
+    """CREATE INDEX IF NOT EXISTS idx_trx_items_day ON transaction_items(created_day, item_id, quantity);""",
+    """CREATE INDEX IF NOT EXISTS idx_trx_items_item_day ON transaction_items(item_id, created_day);""",
+    # (item_id, created_day) covers lookups by item_id
+    """DROP INDEX IF EXISTS idx_trx_items_item;""",
+    """CREATE INDEX IF NOT EXISTS idx_stock_adj_day ON stock_adjustments(created_day);""",
+    """DROP INDEX IF EXISTS idx_items_updated;""",
+    """CREATE INDEX IF NOT EXISTS idx_items_updated_ts ON items(updated_ts);""",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_trx_items_created
+    AFTER INSERT ON transaction_items
+    WHEN NEW.created_ts IS NULL
+    BEGIN
+        UPDATE transaction_items
+        SET (created_ts, created_day) = (SELECT created_ts, created_day FROM transactions WHERE id = NEW.transaction_id)
+        WHERE id = NEW.id;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_created_at
+    AFTER UPDATE OF created_at ON transactions
+    BEGIN
+        UPDATE transaction_items SET created_ts = NEW.created_ts, created_day = NEW.created_day
+        WHERE transaction_id = NEW.id;
+    END;
+    """,
+    # Compatibility view: one row per line with both the TEXT timestamp and
+    # the integer columns, plus the day as 'YYYY-MM-DD' text
+    """
+    CREATE VIEW IF NOT EXISTS transaction_lines AS
+    SELECT ti.id, ti.transaction_id, ti.item_id, t.transaction_type, ti.quantity,
+           CASE t.transaction_type WHEN 'OUT' THEN -ti.quantity ELSE ti.quantity END AS delta,
+           ti.stock_before, ti.stock_after,
+           t.created_at, ti.created_ts, ti.created_day,
+           date(ti.created_day * 86400, 'unixepoch') AS day
+    FROM transaction_items ti
+    JOIN transactions t ON t.id = ti.transaction_id;
+    """,
+]
+
+# Edits and voids of recorded transactions (schema v10); see models/transaction_edits.py.
+# No foreign key to transactions: the audit trail stays when a year is archived.
+DDL_STATEMENTS += [
+    """
+    CREATE TABLE IF NOT EXISTS transaction_edits (
+        id INTEGER PRIMARY KEY,
+        transaction_id INTEGER NOT NULL,
+        transaction_number TEXT NOT NULL,
+        item_id INTEGER NOT NULL REFERENCES items(id),
+        old_quantity INTEGER NOT NULL,
+        new_quantity INTEGER NOT NULL,
+        stock_delta INTEGER NOT NULL,
+        person_name TEXT NOT NULL,
+        reason TEXT,
+        created_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    """,
+    """CREATE INDEX IF NOT EXISTS idx_trx_edits_trx ON transaction_edits(transaction_id);""",
+]
+
+# Last number handed out per `<kind>-YYYYMMDD-` prefix (schema v13); see
+# models/receiving.next_transaction_number. MAX(transaction_number) cannot
+# find it past 9999 a day: "...-10000" sorts below "...-9999".
+DDL_STATEMENTS += [
+    """
+    CREATE TABLE IF NOT EXISTS transaction_counters (
+        prefix TEXT PRIMARY KEY,
+        last_seq INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    """,
+]
+
+_EPOCH = "INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', {col}) AS INTEGER)) VIRTUAL"
+_DAY = "INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', {col}) AS INTEGER) / 86400) VIRTUAL"
+
+# Columns added after a table's first release: (table, column, declaration).
+# Applied with ALTER TABLE before DDL_STATEMENTS so indexes and triggers on
+# them can be created; new databases get them from CREATE TABLE directly.
+ADDED_COLUMNS = [
+    ("items", "min_stock", "INTEGER"),  # schema v4
+    # schema v9
+    ("items", "updated_ts", _EPOCH.format(col="updated_at")),
+    ("transactions", "created_ts", _EPOCH.format(col="created_at")),
+    ("transactions", "created_day", _DAY.format(col="created_at")),
+    ("stock_adjustments", "created_ts", _EPOCH.format(col="created_at")),
+    ("stock_adjustments", "created_day", _DAY.format(col="created_at")),
+    ("transaction_items", "created_ts", "INTEGER"),
+    ("transaction_items", "created_day", "INTEGER"),
+    ("transactions", "voided_at", "TEXT"),  # schema v10
+]
+
+# Views whose columns changed after release: (view, newest column). Views are
+# created IF NOT EXISTS, so an existing one without the column is dropped
+# before DDL_STATEMENTS recreate it.
+CHANGED_VIEWS = [
+    ("stock_ledger", "transaction_id"),  # schema v11
+]
+
+# Fills a stored column when _add_columns adds it to an existing table
+BACKFILLS = {
+    ("transaction_items", "created_day"): """
+        UPDATE transaction_items
+        SET (created_ts, created_day) = (SELECT t.created_ts, t.created_day FROM transactions t WHERE t.id = transaction_items.transaction_id)
+    """,
+}
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection that times `execute`/`executemany` into METRICS as `db.<verb>`.
+
+    Statements slower than `slow_query_ms` are logged with their SQL and params.
+    Timings cover statement execution up to the first row, not later fetches.
+    """
+
+    slow_query_ms: float = DEFAULT_SLOW_QUERY_MS
+
+    def _record(self, sql: str, params: Any, started: float) -> None:
+        ms = (time.perf_counter() - started) * 1000.0
+        verb = sql.lstrip().split(None, 1)[0].lower() if sql.strip() else "sql"
+        METRICS.record(f"db.{verb}", ms)
+        if ms >= self.slow_query_ms:
+            logging.getLogger(__name__).warning(
+                "Slow query (%.1f ms): %s | params=%r", ms, " ".join(sql.split()), params
+            )
+
+    def execute(self, sql, parameters=(), /):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record(sql, parameters, started)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._record(sql, "<many>", started)
+
 
 class DatabaseManager:
     """Lightweight SQLite manager with schema initialization.
 
-    Not wired into the app yet; safe to import and call `initialize()` to create schema.
+    Backs the SQLite inventory backend, the HTTP server and the reporting and
+    maintenance scripts. `initialize()` creates the schema or migrates an
+    older database to `SCHEMA_VERSION`; it is safe to call on every start.
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, slow_query_ms: Optional[float] = None):
         if db_path is None:
             cfg = ConfigManager()
             db_path = cfg.db_path
+            if slow_query_ms is None:
+                slow_query_ms = cfg.slow_query_ms
         self.db_path = Path(db_path)
+        self.slow_query_ms = float(DEFAULT_SLOW_QUERY_MS if slow_query_ms is None else slow_query_ms)
         # Ensure directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        # Setup logging to file
-        logs_dir = self.db_path.parent.parent / 'logs'
-        logs_dir.mkdir(parents=True, exist_ok=True)
+        # Standalone use (scripts): log to file via the shared queue pipeline.
+        # The app configures logging itself; never add a second file handler.
         self._logger = logging.getLogger(__name__)
-        if not self._logger.handlers:
-            fh = logging.FileHandler(str(logs_dir / 'app.log'), encoding='utf-8')
-            fmt = logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s')
-            fh.setFormatter(fmt)
-            self._logger.addHandler(fh)
-            self._logger.setLevel(logging.INFO)
+        if not is_configured() and not logging.getLogger().handlers:
+            setup_logging(self.db_path.parent.parent / 'logs', console=False)
         # Schema versioning
-        self.SCHEMA_VERSION = 1
+        self.SCHEMA_VERSION = 13
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), factory=InstrumentedConnection)
+        conn.slow_query_ms = self.slow_query_ms
+        return conn
 
     @contextmanager
     def connect(self):
-        conn = sqlite3.connect(str(self.db_path))
+        conn = self._open()
         try:
             # Foreign keys enforcement
             conn.execute("PRAGMA foreign_keys = ON;")
@@ -130,11 +535,21 @@ class DatabaseManager:
             cur = conn.execute(sql, tuple(params or ()))
             return cur.fetchall()
 
+    def watcher(self, max_changes: int = 5000) -> "ChangeWatcher":
+        """Change events for commits to this database; see models/change_watcher.py."""
+        from .change_watcher import ChangeWatcher
+        return ChangeWatcher(self, max_changes=max_changes)
+
     def initialize(self) -> None:
         """Create tables and indexes if they don't exist."""
         self._logger.info(f"Initializing database at {self.db_path}")
         try:
             with self.connect() as conn:
+                if conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0:
+                    # Only takes effect before the first table; see models/maintenance.py
+                    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                self._add_columns(conn)
+                self._drop_changed_views(conn)
                 for stmt in DDL_STATEMENTS:
                     conn.executescript(stmt)
                 # Schema version table
@@ -157,18 +572,55 @@ class DatabaseManager:
             self._logger.exception(f"Database initialization failed: {e}")
             raise
 
+    def _add_columns(self, conn: sqlite3.Connection) -> None:
+        """Add ADDED_COLUMNS missing from existing tables (idempotent)."""
+        for table, column, decl in ADDED_COLUMNS:
+            # table_xinfo: generated columns are hidden from table_info
+            cols = {r[1] for r in conn.execute(f"PRAGMA table_xinfo({table})")}
+            if cols and column not in cols:
+                self._logger.info(f"Adding column {table}.{column}")
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+                if (table, column) in BACKFILLS:
+                    self._backfill(conn, table, BACKFILLS[(table, column)])
+
+    def _drop_changed_views(self, conn: sqlite3.Connection) -> None:
+        """Drop CHANGED_VIEWS created before their newest column (recreated by the DDL)."""
+        for view, column in CHANGED_VIEWS:
+            cols = {r[1] for r in conn.execute(f"PRAGMA table_info({view})")}
+            if cols and column not in cols:
+                self._logger.info(f"Recreating view {view}")
+                conn.execute(f"DROP VIEW {view}")
+
+    def _backfill(self, conn: sqlite3.Connection, table: str, sql: str) -> None:
+        """Run a backfill UPDATE without logging every row to change_log.
+
+        Replication ships current rows anyway; a migration rewriting every
+        row must not queue the whole table for the next sync.
+        """
+        has_log = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_log'").fetchone()
+        seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0] if has_log else 0
+        started = time.perf_counter()
+        rows = conn.execute(sql).rowcount
+        if has_log:
+            conn.execute("DELETE FROM change_log WHERE seq > ? AND table_name = ? AND op = 'U'", (seq, table))
+        self._logger.info("Backfilled %s: %d rows in %.0f ms", table, rows, (time.perf_counter() - started) * 1000.0)
+
     @contextmanager
-    def transaction(self):
+    def transaction(self, immediate: bool = False):
         """Context manager for an explicit transaction.
 
+        Args:
+            immediate: Take the write lock at BEGIN, so values read inside
+                the transaction cannot change before its writes.
+
         Usage:
             with db.transaction() as conn:
                 conn.execute(...)
         """
-        conn = sqlite3.connect(str(self.db_path))
+        conn = self._open()
         try:
             conn.execute("PRAGMA foreign_keys = ON;")
-            conn.execute("BEGIN;")
+            conn.execute("BEGIN IMMEDIATE;" if immediate else "BEGIN;")
             yield conn
             conn.commit()
         except Exception:
@@ -0,0 +1,221 @@
+"""Single-writer group commit for stock-changing commands.
+
+Several tills writing the same SQLite file each pay for the write lock and
+an fsync per sale. `GroupCommitWriter` owns the only write connection: callers
+put checkout, receiving and adjustment commands on a queue and get a future;
+one thread drains the queue into group transactions (flushed after
+`interval_ms` or `max_commands`, whichever comes first) and resolves every
+future with that command's result once the group is durable.
+
+Each command runs inside its own SAVEPOINT, so a rejected command (unknown
+item, insufficient stock) is rolled back alone and reported to its caller
+while the rest of the group commits.
+"""
+from __future__ import annotations
+import queue
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .checkout import CheckoutLine, CheckoutRepository, normalize_checkout_line
+from .database_manager import DatabaseManager
+from .receiving import DeliveryLine, ReceivingRepository, normalize_line, whole_number
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def normalize_adjustment(key: Any, delta: Any = None, new_stock: Any = None) -> Tuple[str, Optional[int], Optional[int]]:
+    """(key, delta, new_stock) with the given amount checked to be a whole number.
+
+    Raises:
+        ValueError: If the key is empty, not exactly one of delta/new_stock
+            is given, or the amount is not a whole number.
+    """
+    if key is None or str(key).strip() == "":
+        raise ValueError("Item key is required")
+    if (delta is None) == (new_stock is None):
+        raise ValueError("Give exactly one of delta or new_stock")
+    name, value = ("delta", delta) if delta is not None else ("new_stock", new_stock)
+    try:
+        value = whole_number(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a whole number, got {value!r}")
+    return (str(key).strip(), value, None) if delta is not None else (str(key).strip(), None, value)
+
+
+def write_adjustment(conn, key: str, delta: Optional[int] = None, new_stock: Optional[int] = None, reason: Optional[str] = None) -> Dict[str, Any]:
+    """Adjust one item's stock by `delta` or to `new_stock` on an open write transaction.
+
+    Returns:
+        {"item_id", "name", "stock_before", "stock_after"}
+    """
+    key, delta, new_stock = normalize_adjustment(key, delta, new_stock)
+    row = conn.execute(
+        """
+        SELECT id, name, current_stock FROM items
+        WHERE id = COALESCE(
+            (SELECT id FROM items WHERE code = ?),
+            (SELECT id FROM items WHERE barcode = ?),
+            (SELECT id FROM items WHERE name = ? ORDER BY id LIMIT 1)
+        )
+        """,
+        (key, key, key),
+    ).fetchone()
+    if row is None:
+        raise ValueError(f"Unknown item: {key}")
+    item_id, name, before = row[0], row[1], int(row[2])
+    after = before + delta if delta is not None else new_stock
+    if after != before:
+        conn.execute(
+            "INSERT INTO stock_adjustments (item_id, old_stock, new_stock, adjustment, reason) VALUES (?, ?, ?, ?, ?)",
+            (item_id, before, after, after - before, reason),
+        )
+        conn.execute("UPDATE items SET current_stock=?, updated_at=datetime('now') WHERE id=?", (after, item_id))
+    return {"item_id": item_id, "name": name, "stock_before": before, "stock_after": after}
+
+
+class GroupCommitWriter:
+    """Serialize writes through one thread and commit them in groups.
+
+    Usage:
+        writer = GroupCommitWriter(db).start()
+        result = writer.checkout([("SKU-1", 2)], "till-2")          # blocks until committed
+        future = writer.submit("receive", lines=[...], person_name="Budi")
+        writer.stop()
+    """
+
+    def __init__(self, db: DatabaseManager, interval_ms: float = 5.0, max_commands: int = 64):
+        self.db = db
+        self.interval_s = max(0.0, interval_ms) / 1000.0
+        self.max_commands = max(1, max_commands)
+        self.queue: "queue.Queue[Any]" = queue.Queue()
+        self.checkouts = CheckoutRepository(db)
+        self.receiving = ReceivingRepository(db)
+        self.handlers: Dict[str, Callable[..., Dict[str, Any]]] = {
+            "checkout": self._checkout,
+            "receive": self._receive,
+            "adjust": write_adjustment,
+        }
+        self.groups = 0
+        self.commands = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "GroupCommitWriter":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Commit everything already queued, then stop the writer thread."""
+        if self._thread is not None:
+            self.queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, kind: str, **kwargs) -> Future:
+        """Queue a command; the future resolves after its group commits.
+
+        Arguments are validated here, so malformed commands fail in the
+        caller without reaching the writer.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown command: {kind}")
+        if kind in ("checkout", "receive"):
+            kwargs["person_name"] = (kwargs.get("person_name") or "").strip()
+            if not kwargs["person_name"]:
+                raise ValueError("Person name is required")
+            normalize = normalize_checkout_line if kind == "checkout" else normalize_line
+            kwargs["lines"] = [normalize(line) for line in kwargs.get("lines") or []]
+            if not kwargs["lines"]:
+                raise ValueError("No lines given")
+        elif kind == "adjust":
+            kwargs["key"], kwargs["delta"], kwargs["new_stock"] = normalize_adjustment(
+                kwargs.get("key"), kwargs.get("delta"), kwargs.get("new_stock")
+            )
+        future: Future = Future()
+        self.queue.put((kind, kwargs, future, time.perf_counter()))
+        return future
+
+    def checkout(self, lines: Iterable[DeliveryLine], person_name: str, notes: str | None = None, allow_negative: bool = False) -> Dict[str, Any]:
+        return self.submit("checkout", lines=lines, person_name=person_name, notes=notes, allow_negative=allow_negative).result()
+
+    def receive(self, lines: Iterable[DeliveryLine], person_name: str, notes: str | None = None, skip_unresolved: bool = False) -> Dict[str, Any]:
+        return self.submit("receive", lines=lines, person_name=person_name, notes=notes, skip_unresolved=skip_unresolved).result()
+
+    def adjust(self, key: str, delta: Optional[int] = None, new_stock: Optional[int] = None, reason: Optional[str] = None) -> Dict[str, Any]:
+        return self.submit("adjust", key=key, delta=delta, new_stock=new_stock, reason=reason).result()
+
+    def _checkout(self, conn, lines: List[CheckoutLine], person_name: str, notes=None, allow_negative=False):
+        return self.checkouts.write(conn, lines, person_name, notes, allow_negative)
+
+    def _receive(self, conn, lines: List[Tuple[str, int]], person_name: str, notes=None, skip_unresolved=False):
+        return self.receiving.write(conn, lines, person_name, notes, skip_unresolved)
+
+    def _run(self) -> None:
+        with self.db.connect() as conn:
+            stopping = False
+            while not stopping:
+                first = self.queue.get()
+                if first is _STOP:
+                    break
+                group = [first]
+                deadline = time.perf_counter() + self.interval_s
+                while len(group) < self.max_commands:
+                    remaining = deadline - time.perf_counter()
+                    try:
+                        cmd = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if cmd is _STOP:
+                        stopping = True
+                        break
+                    group.append(cmd)
+                # A caller may have cancelled its future while it was queued
+                # (e.g. a server handler cancelled at shutdown): skip the
+                # command; once running, the future can no longer be cancelled
+                group = [cmd for cmd in group if cmd[2].set_running_or_notify_cancel()]
+                if group:
+                    self._commit(conn, group)
+
+    def _commit(self, conn, group: list) -> None:
+        started = time.perf_counter()
+        outcomes: List[Tuple[bool, Any]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for kind, kwargs, _future, _queued in group:
+                conn.execute("SAVEPOINT cmd")
+                try:
+                    outcomes.append((True, self.handlers[kind](conn, **kwargs)))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO cmd")
+                    outcomes.append((False, e))
+                conn.execute("RELEASE cmd")
+            conn.commit()
+        except Exception as e:
+            logger.exception("Group commit of %d commands failed", len(group))
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            outcomes = [(False, e)] * len(group)
+        done = time.perf_counter()
+        METRICS.record("writer.group_commit", (done - started) * 1000.0)
+        METRICS.record("writer.group_size", float(len(group)))
+        self.groups += 1
+        self.commands += len(group)
+        for (ok, value), (_kind, _kwargs, future, queued) in zip(outcomes, group):
+            METRICS.record("writer.latency", (done - queued) * 1000.0)
+            try:
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+            except Exception:
+                # Delivering one outcome must never stop the writer thread
+                logger.exception("Could not deliver the outcome of a %s command", _kind)
@@ -1,6 +1,9 @@
 import logging
+import threading
 import pandas as pd
 from tkinter import messagebox
+from models.catalogue_cache import CatalogueCache
+from utils.metrics import timed
 from utils.constants import TITLE_INVENTORY_ERROR, TITLE_SAVE_ERROR
 
 logger = logging.getLogger(__name__)
@@ -11,37 +14,110 @@ class InventoryManager:
     Attributes:
         path: Path to the CSV file.
         df: In-memory pandas DataFrame of inventory rows.
+        names_lower: Lower-cased Item column used as the search index.
+        matcher: `NameMatcher` over the Item column when fuzzy search is on.
     """
-    def __init__(self, path):
-        """Initialize the manager and load inventory from CSV.
+    def __init__(self, path, fuzzy=False, suggestion_limit=50):
+        """Initialize the manager and load inventory from the cache or CSV.
 
         Args:
             path: CSV file path.
+            fuzzy: Rank suggestions with multi-token, typo-tolerant matching.
+            suggestion_limit: Maximum fuzzy suggestions returned.
         """
         self.path = path
+        self.cache = CatalogueCache(path)
+        self.fuzzy = fuzzy
+        self.suggestion_limit = suggestion_limit
         self.df = pd.DataFrame()
+        self.names_lower = pd.Series(dtype=str)
+        self.matcher = None
         self.load()
 
+    @staticmethod
+    def read_csv(path):
+        """Read and validate the inventory CSV.
+
+        Raises:
+            ValueError: If the required columns are missing.
+        """
+        df = pd.read_csv(path)
+        if not {"Item", "Stock"}.issubset(df.columns):
+            raise ValueError("Missing required columns in CSV")
+        return df
+
+    @staticmethod
+    def cache_is_fresh(path):
+        """True if the catalogue cache matches the CSV at `path`."""
+        return CatalogueCache(path).is_fresh()
+
+    @staticmethod
+    def build_matcher(df):
+        """Fuzzy name matcher over the Item column (None if the column is missing)."""
+        from models.name_matcher import NameMatcher
+        return NameMatcher(df["Item"].astype(str).tolist()) if "Item" in df.columns else None
+
+    @classmethod
+    def warm_cache(cls, path, fuzzy=False):
+        """Parse the CSV and write the catalogue cache without touching the UI.
+
+        Safe to run in a background thread; errors are left to `load`.
+        """
+        cache = CatalogueCache(path)
+        if cache.is_fresh():
+            return
+        df = cls.read_csv(path)
+        payload = {"df": df, "names_lower": df["Item"].astype(str).str.lower()}
+        if fuzzy:
+            payload["matcher"] = cls.build_matcher(df)
+        cache.store(payload)
+        logger.info("Rebuilt catalogue cache for %s (%d rows)", path, len(df))
+
+    def reindex(self):
+        """Rebuild the lower-cased name index (and fuzzy matcher) from the DataFrame."""
+        if "Item" in self.df.columns:
+            self.names_lower = self.df["Item"].astype(str).str.lower()
+        else:
+            self.names_lower = pd.Series(dtype=str)
+        self.matcher = self.build_matcher(self.df) if self.fuzzy else None
+
+    def _payload(self):
+        return {"df": self.df, "names_lower": self.names_lower, "matcher": self.matcher}
+
+    @timed("inventory.csv_load")
     def load(self):
-        """Load the inventory from disk, creating a new file if missing.
+        """Load the inventory from the cache or disk, creating a new file if missing.
 
         Ensures required columns exist; logs and shows user-friendly
         messages on errors and initializes an empty structure on failure.
         """
         try:
+            payload = self.cache.load()
+            if payload is not None:
+                self.df = payload["df"]
+                self.names_lower = payload["names_lower"]
+                self.matcher = payload.get("matcher") if self.fuzzy else None
+                if self.fuzzy and self.matcher is None:
+                    # Cache written with fuzzy search off
+                    self.matcher = self.build_matcher(self.df)
+                    self.cache.store(self._payload())
+                logger.info("Loaded inventory from cache for %s (%d rows)", self.path, len(self.df))
+                return
             try:
-                self.df = pd.read_csv(self.path)
-                if not {"Item", "Stock"}.issubset(self.df.columns):
-                    raise ValueError("Missing required columns in CSV")
+                self.df = self.read_csv(self.path)
+                self.reindex()
+                self.cache.store(self._payload())
                 logger.info("Loaded inventory from %s (%d rows)", self.path, len(self.df))
             except FileNotFoundError:
                 logger.warning("Inventory file not found at %s. Creating a new one.", self.path)
                 self.df = pd.DataFrame({"Item": [], "Stock": [], "Unit": []})
+                self.reindex()
                 self.save()
             except Exception as e:
                 logger.exception("Failed reading inventory from %s", self.path)
                 messagebox.showerror(TITLE_INVENTORY_ERROR, f"Failed to read inventory at {self.path}. Initializing empty list.\n{e}")
                 self.df = pd.DataFrame({"Item": [], "Stock": [], "Unit": []})
+                self.reindex()
         except Exception as e:
             logger.exception("Inventory load failed")
             messagebox.showerror(TITLE_INVENTORY_ERROR, f"Import failed:\n{e}")
@@ -49,7 +125,9 @@ class InventoryManager:
     def get_suggestions(self, keyword):
         """Return a list of item name suggestions matching the keyword.
 
-        Matching is case-insensitive plain text against the Item column.
+        Matching is case-insensitive plain text against the Item column
+        (via the pre-lowered name index), or ranked multi-token fuzzy
+        matching when `fuzzy` is on.
 
         Args:
             keyword: Text typed by the user.
@@ -64,8 +142,9 @@ class InventoryManager:
             return []
         if "Item" not in self.df.columns:
             return []
-        col = self.df["Item"].astype(str)
-        matches = self.df[col.str.contains(keyword, case=False, regex=False, na=False)]
+        if self.matcher is not None:
+            return list(self.df["Item"].iloc[self.matcher.search(keyword, self.suggestion_limit)])
+        matches = self.df[self.names_lower.str.contains(keyword.lower(), regex=False, na=False)]
         return list(matches["Item"]) if not matches.empty else []
 
     def get_item(self, keyword):
@@ -84,8 +163,12 @@ class InventoryManager:
             return None
         if "Item" not in self.df.columns:
             return None
-        col = self.df["Item"].astype(str)
-        matches = self.df[col.str.contains(keyword, case=False, regex=False, na=False)]
+        matches = self.df[self.names_lower.str.contains(keyword.lower(), regex=False, na=False)]
+        if matches.empty and self.matcher is not None:
+            # Multi-token matches ("bawang 25") only; a typo is shown as a
+            # suggestion, never sold without the cashier seeing it
+            best = self.matcher.search(keyword, 1, typos=False)
+            return self.df.iloc[best[0]] if best else None
         return matches.iloc[0] if not matches.empty else None
 
     def update_stock(self, item_name, new_stock):
@@ -97,10 +180,26 @@ class InventoryManager:
         """
         self.df.loc[self.df["Item"] == item_name, "Stock"] = new_stock
 
+    def store_cache_async(self):
+        """Re-key the snapshot to the saved CSV on a background thread.
+
+        Pickling the DataFrame and matcher takes longer than writing the CSV,
+        so it stays off the UI thread. The frame is copied and the key taken
+        now; if the CSV is saved again first, this store is skipped.
+        """
+        key = self.cache.key()
+        payload = {"df": self.df.copy(), "names_lower": self.names_lower, "matcher": self.matcher}
+        threading.Thread(
+            target=self.cache.store, args=(payload,), kwargs={"key": key}, name="catalogue-cache", daemon=True
+        ).start()
+
+    @timed("inventory.csv_save")
     def save(self):
         """Persist the inventory DataFrame to the CSV file."""
         try:
             self.df.to_csv(self.path, index=False)
+            # Re-key the snapshot to the new file so the next start skips parsing
+            self.store_cache_async()
             logger.info("Saved inventory to %s (%d rows)", self.path, len(self.df))
         except Exception as e:
             logger.exception("Failed saving inventory to %s", self.path)
@@ -0,0 +1,266 @@
+from __future__ import annotations
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Tuple
+
+from config.manager import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+# (key, item name, stock shown in the cart, qty); key is what `get_item` returned as "Key"
+CartLine = Tuple[Any, str, int, int]
+
+
+class InventoryRepository(ABC):
+    """Storage-independent inventory interface used by the POS UI.
+
+    `get_item` returns a mapping with "Item", "Stock" and "Unit" keys so the
+    UI does not depend on the backend's row type. Backends whose item names
+    are not unique also return "Key", which the cart passes back to
+    `checkout`.
+    """
+
+    @classmethod
+    def is_ready(cls, config: ConfigManager) -> bool:
+        """True if opening the backend is cheap (no slow load pending)."""
+        return True
+
+    @classmethod
+    def warm(cls, config: ConfigManager) -> None:
+        """Prepare the backend in a background thread (must not touch the UI)."""
+
+    @classmethod
+    @abstractmethod
+    def from_config(cls, config: ConfigManager) -> "InventoryRepository":
+        """Open the backend configured in `config`."""
+
+    @staticmethod
+    def source_key(config: ConfigManager) -> tuple:
+        """Identify the data the backend reads; reload only when this changes."""
+        if config.data_source == "sqlite":
+            return ("sqlite", config.db_path)
+        if config.data_source == "compact":
+            return ("compact", config.csv_path)
+        return ("csv", config.csv_path)
+
+    @abstractmethod
+    def get_suggestions(self, keyword: str) -> List[str]:
+        """Return item names matching the keyword."""
+
+    @abstractmethod
+    def get_item(self, keyword: str) -> Optional[Any]:
+        """Return the best matching item row or None."""
+
+    @abstractmethod
+    def update_stock(self, item_name: str, new_stock: int) -> None:
+        """Set the stock of the named item."""
+
+    @abstractmethod
+    def save(self) -> None:
+        """Persist pending changes."""
+
+    def checkout(self, lines: List[CartLine], person_name: str) -> None:
+        """Record the sale of a cart.
+
+        File backends hold this till's copy of the stock, so each line is
+        written as cart stock - qty and the file saved once.
+        """
+        for _key, item_name, stock, qty in lines:
+            self.update_stock(item_name, int(stock) - int(qty))
+        self.save()
+
+
+class CsvInventoryRepository(InventoryRepository):
+    """CSV backend: proxies the pandas-based `InventoryManager`."""
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    @classmethod
+    def is_ready(cls, config: ConfigManager) -> bool:
+        from models.inventory_manager import InventoryManager
+        return InventoryManager.cache_is_fresh(config.csv_path)
+
+    @classmethod
+    def warm(cls, config: ConfigManager) -> None:
+        from models.inventory_manager import InventoryManager
+        InventoryManager.warm_cache(config.csv_path, fuzzy=config.search_fuzzy)
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> "CsvInventoryRepository":
+        # Imported lazily: pandas is only needed for the CSV backend
+        from models.inventory_manager import InventoryManager
+        return cls(InventoryManager(config.csv_path, fuzzy=config.search_fuzzy, suggestion_limit=config.suggestion_limit))
+
+    def get_suggestions(self, keyword: str) -> List[str]:
+        return self.manager.get_suggestions(keyword)
+
+    def get_item(self, keyword: str) -> Optional[Any]:
+        return self.manager.get_item(keyword)
+
+    def update_stock(self, item_name: str, new_stock: int) -> None:
+        self.manager.update_stock(item_name, new_stock)
+
+    def save(self) -> None:
+        self.manager.save()
+
+
+class CompactInventoryRepository(InventoryRepository):
+    """CSV backend on the array-backed `ItemStore`: low memory, no pandas.
+
+    The store is snapshotted with `CatalogueCache` like the pandas backend,
+    under its own file name.
+    """
+
+    def __init__(self, store, path: str, default_unit: str = ""):
+        self.store = store
+        self.path = path
+        self.default_unit = default_unit
+
+    @staticmethod
+    def _cache(path: str):
+        from models.catalogue_cache import CatalogueCache
+        from utils.constants import COMPACT_CACHE_FILE
+        return CatalogueCache(path, filename=COMPACT_CACHE_FILE)
+
+    @classmethod
+    def _load_store(cls, config: ConfigManager):
+        from models.item_store import ItemStore
+        cache = cls._cache(config.csv_path)
+        store = cache.load()
+        if store is None:
+            try:
+                store = ItemStore.read_csv(config.csv_path, default_unit=config.default_unit)
+            except FileNotFoundError:
+                logger.warning("Inventory file not found at %s. Creating a new one.", config.csv_path)
+                store = ItemStore.from_rows([])
+                store.write_csv(config.csv_path)
+            cache.store(store)
+            logger.info("Rebuilt compact catalogue for %s (%d rows, %d bytes)", config.csv_path, len(store), store.nbytes())
+        return store
+
+    @classmethod
+    def is_ready(cls, config: ConfigManager) -> bool:
+        return cls._cache(config.csv_path).is_fresh()
+
+    @classmethod
+    def warm(cls, config: ConfigManager) -> None:
+        cls._load_store(config)
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> "CompactInventoryRepository":
+        return cls(cls._load_store(config), config.csv_path, config.default_unit)
+
+    def get_suggestions(self, keyword: str) -> List[str]:
+        return self.store.get_suggestions(keyword)
+
+    def get_item(self, keyword: str) -> Optional[dict]:
+        return self.store.get_item(keyword)
+
+    def update_stock(self, item_name: str, new_stock: int) -> None:
+        if not self.store.update_stock(item_name, new_stock):
+            raise ValueError(f"Item not found: {item_name}")
+
+    def save(self) -> None:
+        self.store.write_csv(self.path)
+        # Re-key the snapshot to the rewritten file
+        self._cache(self.path).store(self.store)
+
+
+class SqliteInventoryRepository(InventoryRepository):
+    """SQLite backend: wraps `ItemsRepository`; writes are committed immediately."""
+
+    def __init__(self, items, suggestion_limit: int = 50, fuzzy: bool = False):
+        self.items = items
+        self.suggestion_limit = suggestion_limit
+        self.fuzzy = fuzzy
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> "SqliteInventoryRepository":
+        from models.database_manager import DatabaseManager
+        from models.items_repository import ItemsRepository
+        db = DatabaseManager(config.db_path, slow_query_ms=config.slow_query_ms)
+        db.initialize()
+        return cls(ItemsRepository(db), suggestion_limit=config.suggestion_limit, fuzzy=config.search_fuzzy)
+
+    @staticmethod
+    def _to_row(item: dict) -> dict:
+        return {
+            "Key": item["id"], "Item": item["name"], "Stock": item["current_stock"],
+            "Unit": item["unit"], "MinStock": item.get("min_stock"),
+        }
+
+    def get_suggestions(self, keyword: str) -> List[str]:
+        if keyword is None:
+            return []
+        keyword = str(keyword).strip()
+        if not keyword:
+            return []
+        return [r["name"] for r in self._search(keyword, self.suggestion_limit)]
+
+    def _search(self, keyword: str, limit: int, typos: bool = True) -> List[dict]:
+        if self.fuzzy:
+            try:
+                return self.items.search_fuzzy(keyword, limit=limit, typos=typos)
+            except ImportError:
+                logger.warning("NumPy is not available; fuzzy search disabled")
+                self.fuzzy = False
+        return self.items.search(keyword, limit=limit)
+
+    def get_item(self, keyword: str) -> Optional[dict]:
+        if keyword is None:
+            return None
+        keyword = str(keyword).strip()
+        if not keyword:
+            return None
+        # Autocomplete passes the full name, so try an exact match first
+        item = self.items.get_by_name(keyword)
+        if item is None:
+            matches = self.items.search(keyword, limit=1)
+            if not matches and self.fuzzy:
+                # Multi-token matches ("bawang 25") only; a typo is shown as a
+                # suggestion, never sold without the cashier seeing it
+                matches = self._search(keyword, 1, typos=False)
+            item = matches[0] if matches else None
+        return self._to_row(item) if item else None
+
+    def update_stock(self, item_name: str, new_stock: int) -> None:
+        item = self.items.get_by_name(item_name)
+        if item is None:
+            raise ValueError(f"Item not found: {item_name}")
+        self.items.update_stock(item["id"], int(new_stock))
+
+    def save(self) -> None:
+        # Each update is already committed
+        pass
+
+    def checkout(self, lines: List[CartLine], person_name: str) -> None:
+        """Commit the cart as one `OUT` transaction, keyed by item id.
+
+        The decrement is relative under the write lock, so sales on other
+        tills are not overwritten, and the lines go to the ledger that
+        reconciliation, stock history and forecasts read.
+        """
+        from models.checkout import CheckoutRepository
+        CheckoutRepository(self.items.db).checkout(
+            [{"item_id": key, "key": item_name, "qty": qty} for key, item_name, _stock, qty in lines],
+            person_name,
+            # The receipt is already printed and the goods handed over
+            allow_negative=True,
+        )
+
+
+BACKENDS = {
+    "csv": CsvInventoryRepository,
+    "sqlite": SqliteInventoryRepository,
+    "compact": CompactInventoryRepository,
+}
+
+
+def repository_class(source: str) -> type[InventoryRepository]:
+    """Return the repository class for a `data.source` value (unknown -> CSV)."""
+    cls = BACKENDS.get(source)
+    if cls is None:
+        logger.warning("Unknown data source %r; falling back to CSV", source)
+        cls = CsvInventoryRepository
+    return cls
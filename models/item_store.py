@@ -0,0 +1,244 @@
+"""Memory-compact, array-backed item catalogue.
+
+Instead of one Python object per cell (DataFrame object columns, lists of
+dicts), each column is a flat buffer:
+
+- ids / stock: `array('q')` (8 bytes per item)
+- unit / group: small interned value tables plus `array('H')` indexes
+- names: one UTF-8 byte buffer with "\\n" separators and `array('I')` offsets,
+  and an ASCII-lowered copy of it used for substring search
+- exact-name lookup: crc32 hashes sorted in an `array('I')` with row numbers
+
+Suggestions run `bytes.find` over the lowered buffer (one C-level scan) and
+map hits back to rows with `bisect` on the offsets, so nothing per-item is
+allocated until results are returned. Only the standard library is used;
+the CSV backend built on it runs without pandas.
+
+Case-insensitive matching folds ASCII letters only (`bytes.lower`), which
+keeps the lowered buffer aligned with the name offsets.
+"""
+from __future__ import annotations
+import csv
+import sys
+import zlib
+import logging
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SEP = b"\n"
+
+# CSV layout of data/barang.csv
+CSV_COLUMNS = ("Item", "Group", "Stock", "Unit")
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+class _ValueTable:
+    """Interned values (units, groups) referenced by small integer codes."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.codes = array("H")
+
+    def append(self, value: Any) -> None:
+        value = "" if value is None else str(value)
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(sys.intern(value))
+            if code > 0xFFFF and self.codes.typecode == "H":
+                self.codes = array("I", self.codes)
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+    def nbytes(self) -> int:
+        return self.codes.itemsize * len(self.codes) + sum(sys.getsizeof(v) for v in self.values)
+
+    def __getstate__(self):
+        return {"values": self.values, "codes": self.codes}
+
+    def __setstate__(self, state):
+        self.values = [sys.intern(v) for v in state["values"]]
+        self._codes = {v: i for i, v in enumerate(self.values)}
+        self.codes = state["codes"]
+
+
+class ItemStore:
+    """Column-oriented item catalogue with substring and exact-name lookups.
+
+    Rows are immutable except for stock. Build with `from_rows`, `read_csv`
+    or `from_db`; `get_item` returns the same {"Item", "Stock", "Unit"}
+    mapping as the other inventory backends.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.stock = array("q")
+        self.units = _ValueTable()
+        self.groups = _ValueTable()
+        self._names = b""
+        self._lower = b""
+        self._offsets = array("I", [0])
+        self._hashes = array("I")
+        self._hash_rows = array("I")
+
+    def __len__(self) -> int:
+        return len(self.stock)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "ItemStore":
+        """Build from mappings with "name", "stock", "unit", optional "group" and "id"."""
+        store = cls()
+        # Append into one growing buffer so no per-row bytes objects accumulate
+        names = bytearray()
+        offsets = store._offsets
+        for n, row in enumerate(rows, start=1):
+            names += str(row["name"]).encode("utf-8")
+            names += SEP
+            offsets.append(len(names))
+            store.ids.append(int(row.get("id") or n))
+            store.stock.append(_to_int(row.get("stock")))
+            store.units.append(row.get("unit"))
+            store.groups.append(row.get("group"))
+        store._names = bytes(names)
+        del names
+        store._build_indexes()
+        return store
+
+    @classmethod
+    def read_csv(cls, path: str | Path, default_unit: str = "") -> "ItemStore":
+        """Stream a `barang.csv`-style file (Item, Stock required) into a store.
+
+        Raises:
+            ValueError: If the required columns are missing.
+        """
+        with Path(path).open(newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            columns = reader.fieldnames or []
+            if not {"Item", "Stock"}.issubset(columns):
+                raise ValueError("Missing required columns in CSV")
+            extra = [c for c in columns if c not in CSV_COLUMNS]
+            if extra:
+                raise ValueError(f"Unsupported columns for the compact store: {', '.join(extra)}")
+            return cls.from_rows(
+                {"name": r["Item"], "stock": r["Stock"], "unit": r.get("Unit") or default_unit, "group": r.get("Group")}
+                for r in reader
+                if r.get("Item")
+            )
+
+    @classmethod
+    def from_db(cls, db, active_only: bool = True) -> "ItemStore":
+        """Build from the `items` table of a `DatabaseManager` (streamed cursor)."""
+        sql = """
+            SELECT i.id, i.name, i.current_stock, i.unit, g.name
+            FROM items i LEFT JOIN product_groups g ON g.id = i.group_id
+        """
+        if active_only:
+            sql += " WHERE i.active = 1"
+        with db.connect() as conn:
+            cur = conn.execute(sql + " ORDER BY i.id")
+            return cls.from_rows(
+                {"id": r[0], "name": r[1], "stock": r[2], "unit": r[3], "group": r[4]} for r in cur
+            )
+
+    def _build_indexes(self) -> None:
+        self._lower = self._names.lower()
+        names, offsets = self._names, self._offsets
+        hashes = array("I", (zlib.crc32(names[offsets[i]:offsets[i + 1] - 1]) for i in range(len(self))))
+        self._hash_rows = array("I", sorted(range(len(hashes)), key=hashes.__getitem__))
+        self._hashes = array("I", (hashes[i] for i in self._hash_rows))
+
+    def name(self, row: int) -> str:
+        return self._names[self._offsets[row]:self._offsets[row + 1] - 1].decode("utf-8")
+
+    def row(self, row: int) -> Dict[str, Any]:
+        return {"Item": self.name(row), "Stock": self.stock[row], "Unit": self.units[row], "Group": self.groups[row]}
+
+    def find_rows(self, keyword: str, limit: Optional[int] = None) -> List[int]:
+        """Rows whose name contains `keyword` (ASCII case-insensitive), in catalogue order."""
+        needle = str(keyword).strip().encode("utf-8").lower()
+        if not needle or SEP in needle:
+            return []
+        out: List[int] = []
+        offsets, find = self._offsets, self._lower.find
+        pos = find(needle)
+        while pos != -1:
+            r = bisect_right(offsets, pos) - 1
+            out.append(r)
+            if limit is not None and len(out) >= limit:
+                break
+            # One hit per row: continue from the start of the next name
+            pos = find(needle, offsets[r + 1])
+        return out
+
+    def exact_rows(self, name: str) -> List[int]:
+        """Rows whose name equals `name` exactly (hash lookup, then byte compare)."""
+        encoded = str(name).encode("utf-8")
+        h = zlib.crc32(encoded)
+        lo = bisect_left(self._hashes, h)
+        hi = bisect_right(self._hashes, h, lo)
+        out = []
+        for k in range(lo, hi):
+            r = self._hash_rows[k]
+            if self._names[self._offsets[r]:self._offsets[r + 1] - 1] == encoded:
+                out.append(r)
+        return sorted(out)
+
+    def get_suggestions(self, keyword: str, limit: Optional[int] = None) -> List[str]:
+        if keyword is None:
+            return []
+        return [self.name(r) for r in self.find_rows(keyword, limit)]
+
+    def get_item(self, keyword: str) -> Optional[Dict[str, Any]]:
+        """Exact name match first (autocomplete passes full names), else first substring match."""
+        if keyword is None or not str(keyword).strip():
+            return None
+        keyword = str(keyword).strip()
+        rows = self.exact_rows(keyword) or self.find_rows(keyword, limit=1)
+        return self.row(rows[0]) if rows else None
+
+    def update_stock(self, item_name: str, new_stock: int) -> int:
+        """Set stock for every row named `item_name`; returns the number of rows changed."""
+        rows = self.exact_rows(item_name)
+        for r in rows:
+            self.stock[r] = int(new_stock)
+        return len(rows)
+
+    def write_csv(self, path: str | Path) -> None:
+        """Write the catalogue in the `barang.csv` layout."""
+        with Path(path).open("w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(CSV_COLUMNS)
+            for r in range(len(self)):
+                w.writerow((self.name(r), self.groups[r], self.stock[r], self.units[r]))
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the store's buffers."""
+        arrays = (self.ids, self.stock, self._offsets, self._hashes, self._hash_rows)
+        return (
+            sum(a.itemsize * len(a) for a in arrays)
+            + len(self._names) + len(self._lower)
+            + self.units.nbytes() + self.groups.nbytes()
+        )
+
+    def __getstate__(self):
+        # The lowered buffer is rebuilt on load; it is cheaper than reading it
+        state = dict(self.__dict__)
+        state.pop("_lower", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lower = self._names.lower()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import sqlite3
+import threading
 from typing import Optional, List, Dict, Any
 
 from .database_manager import DatabaseManager
@@ -10,14 +11,37 @@ def _row_to_dict(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
     return {k: v for k, v in zip(cols, row)}
 
 
+def resolve_item_keys(conn: sqlite3.Connection, table: str) -> None:
+    """Fill `item_id` in a temp table with a `key` column, in one statement.
+
+    Keys are matched by code, then barcode, then exact name; each branch is
+    an indexed lookup. Unmatched rows keep `item_id` NULL; rows that
+    already have one are left alone.
+    """
+    conn.execute(
+        f"""
+        UPDATE {table} SET item_id = COALESCE(
+            (SELECT id FROM items WHERE code = key),
+            (SELECT id FROM items WHERE barcode = key),
+            (SELECT id FROM items WHERE name = key ORDER BY id LIMIT 1)
+        )
+        WHERE item_id IS NULL
+        """
+    )
+
+
 class ItemsRepository:
     def __init__(self, db: DatabaseManager):
         self.db = db
+        # (catalogue_version, item ids, NameMatcher) for search_fuzzy
+        self._matcher = None
+        # Server worker threads share one repository; one of them rebuilds at a time
+        self._matcher_lock = threading.Lock()
 
     def get_by_id(self, item_id: int) -> Optional[Dict[str, Any]]:
         with self.db.connect() as conn:
             cur = conn.execute(
-                "SELECT id, code, name, group_id, unit, barcode, current_stock, active, created_at, updated_at FROM items WHERE id=?",
+                "SELECT id, code, name, group_id, unit, barcode, current_stock, min_stock, active, created_at, updated_at FROM items WHERE id=?",
                 (item_id,),
             )
             row = cur.fetchone()
@@ -26,28 +50,103 @@ class ItemsRepository:
     def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         with self.db.connect() as conn:
             cur = conn.execute(
-                "SELECT id, code, name, group_id, unit, barcode, current_stock, active, created_at, updated_at FROM items WHERE name=?",
+                "SELECT id, code, name, group_id, unit, barcode, current_stock, min_stock, active, created_at, updated_at FROM items WHERE name=?",
                 (name,),
             )
             row = cur.fetchone()
             return _row_to_dict(cur, row) if row else None
 
-    def search(self, keyword: str, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_by_keys(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up many scanned codes/barcodes in one query.
+
+        Returns a mapping key -> item for the keys that matched; a key that
+        is both some item's code and another's barcode resolves by code.
+        """
+        keys = list(dict.fromkeys(str(k) for k in keys))
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self.db.connect() as conn:
+            cur = conn.execute(
+                f"""
+                SELECT id, code, name, group_id, unit, barcode, current_stock, min_stock, active
+                FROM items WHERE code IN ({placeholders}) OR barcode IN ({placeholders})
+                """,
+                keys + keys,
+            )
+            rows = [_row_to_dict(cur, r) for r in cur.fetchall()]
+        found = {r["barcode"]: r for r in rows if r["barcode"] is not None}
+        found.update({r["code"]: r for r in rows if r["code"] is not None})
+        return {k: found[k] for k in keys if k in found}
+
+    def search(self, keyword: str, limit: int = 50, group_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Substring search on name/code/barcode.
+
+        Args:
+            group_id: Restrict to this product group and all of its subgroups.
+        """
         like = f"%{keyword}%"
+        group_join = ""
+        params: List[Any] = [like, like, like]
+        if group_id is not None:
+            group_join = "JOIN product_group_closure c ON c.descendant_id = items.group_id AND c.ancestor_id = ?"
+            params.insert(0, group_id)
+        params.append(limit)
         with self.db.connect() as conn:
             cur = conn.execute(
-                """
-                SELECT id, code, name, group_id, unit, barcode, current_stock, active
+                f"""
+                SELECT id, code, name, group_id, unit, barcode, current_stock, min_stock, active
                 FROM items
+                {group_join}
                 WHERE name LIKE ? OR code LIKE ? OR barcode LIKE ?
                 ORDER BY name ASC
                 LIMIT ?
                 """,
-                (like, like, like, limit),
+                tuple(params),
             )
             rows = cur.fetchall()
             return [_row_to_dict(cur, r) for r in rows]
 
+    def _name_matcher(self, conn: sqlite3.Connection):
+        """Matcher over active item names, rebuilt when `catalogue_version` moves."""
+        from .name_matcher import NameMatcher
+        version = conn.execute("SELECT version FROM catalogue_version WHERE id = 1").fetchone()[0]
+        cached = self._matcher
+        if cached is not None and cached[0] == version:
+            return cached
+        with self._matcher_lock:
+            # Another thread may have rebuilt it while this one waited
+            cached = self._matcher
+            if cached is None or cached[0] != version:
+                rows = conn.execute("SELECT id, name FROM items WHERE active = 1 ORDER BY name, id").fetchall()
+                cached = (version, [r[0] for r in rows], NameMatcher([r[1] for r in rows]))
+                self._matcher = cached
+            return cached
+
+    def search_fuzzy(self, keyword: str, limit: int = 50, typos: bool = True) -> List[Dict[str, Any]]:
+        """Ranked multi-token, typo-tolerant name search over active items.
+
+        "bawang 25" finds "Bawang Merah 25 kg"; "bawnag" still finds "Bawang".
+        The token index lives in memory and is rebuilt only after items are
+        added, renamed, (de)activated or deleted. Requires NumPy. With `typos`
+        off, tokens must match without edits (see `NameMatcher.search`).
+        """
+        with self.db.connect() as conn:
+            _, ids, matcher = self._name_matcher(conn)
+            ranked = [ids[i] for i in matcher.search(keyword, limit, typos=typos)]
+            if not ranked:
+                return []
+            placeholders = ",".join("?" * len(ranked))
+            cur = conn.execute(
+                f"""
+                SELECT id, code, name, group_id, unit, barcode, current_stock, min_stock, active
+                FROM items WHERE id IN ({placeholders})
+                """,
+                ranked,
+            )
+            by_id = {r[0]: _row_to_dict(cur, r) for r in cur.fetchall()}
+            return [by_id[i] for i in ranked if i in by_id]
+
     def insert(
         self,
         *,
@@ -58,14 +157,15 @@ class ItemsRepository:
         current_stock: int = 0,
         group_id: Optional[int] = None,
         active: int = 1,
+        min_stock: Optional[int] = None,
     ) -> int:
         with self.db.connect() as conn:
             cur = conn.execute(
                 """
-                INSERT INTO items (code, name, group_id, unit, barcode, current_stock, active)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO items (code, name, group_id, unit, barcode, current_stock, active, min_stock)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (code, name, group_id, unit, barcode, current_stock, active),
+                (code, name, group_id, unit, barcode, current_stock, active, min_stock),
             )
             return int(cur.lastrowid)
 
@@ -80,6 +180,7 @@ class ItemsRepository:
         current_stock: Optional[int] = None,
         group_id: Optional[int] = None,
         active: Optional[int] = None,
+        min_stock: Optional[int] = None,
     ) -> None:
         fields = []
         params: List[Any] = []
@@ -97,6 +198,8 @@ class ItemsRepository:
             fields.append("current_stock=?"); params.append(current_stock)
         if active is not None:
             fields.append("active=?"); params.append(active)
+        if min_stock is not None:
+            fields.append("min_stock=?"); params.append(min_stock)
         if not fields:
             return
         params.append(item_id)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .database_manager import DatabaseManager
+from .items_repository import resolve_item_keys
+
+logger = logging.getLogger(__name__)
+
+LOW_STOCK_WHERE = "current_stock <= min_stock"
+
+
+class LowStockRepository:
+    """Per-item `min_stock` thresholds and the low-stock set.
+
+    The set is never recomputed: `idx_items_low_stock` is a partial index over
+    exactly the items with `current_stock <= min_stock`, so SQLite maintains it
+    on every write and reading it costs O(low-stock items). Triggers record each
+    threshold crossing in `low_stock_events`, whichever code path wrote the stock.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def low_items(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Items at or below their threshold, largest shortage first.
+
+        The WHERE/ORDER BY terms match the partial index exactly so the
+        planner scans it instead of the items table.
+        """
+        sql = f"""
+            SELECT id, code, name, unit, current_stock, min_stock
+            FROM items
+            WHERE {LOW_STOCK_WHERE}
+            ORDER BY current_stock - min_stock ASC
+        """
+        params: Tuple[Any, ...] = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (int(limit),)
+        with self.db.connect() as conn:
+            cur = conn.execute(sql, params)
+            cols = [c[0] for c in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    def count(self) -> int:
+        with self.db.connect() as conn:
+            return int(conn.execute(f"SELECT COUNT(*) FROM items WHERE {LOW_STOCK_WHERE}").fetchone()[0])
+
+    def set_min_stock(self, item_id: int, min_stock: Optional[int]) -> None:
+        """Set an item's threshold; None disables alerts for it."""
+        self.set_min_stock_many([(item_id, min_stock)])
+
+    def set_min_stock_many(self, thresholds: Iterable[Tuple[int, Optional[int]]]) -> None:
+        rows = [(None if m is None else int(m), int(i)) for i, m in thresholds]
+        with self.db.transaction() as conn:
+            conn.executemany("UPDATE items SET min_stock=?, updated_at=datetime('now') WHERE id=?", rows)
+
+    def import_thresholds(self, thresholds: Iterable[Tuple[str, Optional[int]]]) -> List[str]:
+        """Set thresholds keyed by code/barcode/name in one statement; returns unresolved keys."""
+        rows = [(str(k).strip(), None if m is None else int(m)) for k, m in thresholds]
+        with self.db.transaction() as conn:
+            conn.execute("DROP TABLE IF EXISTS temp.min_stock_import")
+            conn.execute("CREATE TEMP TABLE min_stock_import (key TEXT NOT NULL, min_stock INTEGER, item_id INTEGER)")
+            conn.executemany("INSERT INTO temp.min_stock_import (key, min_stock) VALUES (?, ?)", rows)
+            resolve_item_keys(conn, "temp.min_stock_import")
+            conn.execute("CREATE INDEX temp.idx_min_stock_import ON min_stock_import(item_id)")
+            conn.execute(
+                """
+                UPDATE items
+                SET min_stock = (SELECT m.min_stock FROM temp.min_stock_import m WHERE m.item_id = items.id ORDER BY m.rowid DESC LIMIT 1),
+                    updated_at = datetime('now')
+                WHERE id IN (SELECT item_id FROM temp.min_stock_import)
+                """
+            )
+            return [r[0] for r in conn.execute("SELECT key FROM temp.min_stock_import WHERE item_id IS NULL")]
+
+    def last_event_id(self) -> int:
+        row = self.db.query_one("SELECT COALESCE(MAX(id), 0) FROM low_stock_events")
+        return int(row[0])
+
+    def events_since(self, last_id: int) -> List[Dict[str, Any]]:
+        """Threshold crossings after `last_id`, oldest first, with item names."""
+        with self.db.connect() as conn:
+            cur = conn.execute(
+                """
+                SELECT e.id, e.item_id, i.name, e.is_low, e.stock, e.min_stock, e.created_at
+                FROM low_stock_events e
+                JOIN items i ON i.id = e.item_id
+                WHERE e.id > ?
+                ORDER BY e.id
+                """,
+                (int(last_id),),
+            )
+            cols = [c[0] for c in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    def prune_events(self, keep_days: int = 30) -> int:
+        """Delete events older than `keep_days`, always keeping the newest.
+
+        Event ids are plain rowids: with the table emptied they would restart
+        at 1, below the `last_id` monitors have already drained.
+        """
+        with self.db.connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM low_stock_events WHERE created_at < datetime('now', ?) "
+                "AND id < (SELECT MAX(id) FROM low_stock_events)",
+                (f"-{int(keep_days)} days",),
+            )
+            return cur.rowcount
+
+
+class LowStockMonitor:
+    """Dispatch low-stock crossings to subscribers after writes.
+
+    Writers call `drain()` once their transaction commits; only events newer
+    than the last drained id are read, so nothing is rescanned and idle
+    periods cost nothing.
+    """
+
+    def __init__(self, repo: LowStockRepository):
+        self.repo = repo
+        self.last_id = repo.last_event_id()
+        self._subscribers: List[Callable[[List[Dict[str, Any]]], None]] = []
+
+    def subscribe(self, callback: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """Call `callback(events)` with each non-empty batch of crossings."""
+        self._subscribers.append(callback)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        events = self.repo.events_since(self.last_id)
+        if not events:
+            return []
+        self.last_id = events[-1]["id"]
+        for callback in list(self._subscribers):
+            try:
+                callback(events)
+            except Exception:
+                logger.exception("Low-stock subscriber failed")
+        return events
@@ -0,0 +1,278 @@
+"""Planner statistics and free-page reclaim for the SQLite database.
+
+`DatabaseMaintenance.run` is cheap enough to run whenever the till is idle
+and on shutdown:
+
+- `change_log` is pruned up to the lowest seq a central database has
+  acknowledged (`replication_marks`, written by `scripts/sync_branch.py`).
+  A database that has never synced keeps all of it: its first push starts
+  at seq 0 and needs every entry. Low-stock events older than
+  `log_keep_days` are pruned. Deletes run in chunks of PRUNE_CHUNK
+  entries, each its own short write transaction;
+- tables whose row count drifted from `sqlite_stat1` (or that have no
+  statistics, e.g. after a migration or archival) are ANALYZEd with a
+  bounded `analysis_limit`, then `PRAGMA optimize` runs. Counting rows
+  scans every indexed table, so the run at shutdown skips the drift check;
+- with `auto_vacuum=INCREMENTAL`, up to `vacuum_pages` free pages are
+  returned to the file system with `PRAGMA incremental_vacuum`.
+
+New databases are created with `auto_vacuum=INCREMENTAL`
+(`DatabaseManager.initialize`). Existing ones need a one-off VACUUM to
+switch: `scripts/db_maintenance.py --convert`, with the POS and server
+closed. The VACUUM holds an exclusive lock for the whole rewrite, and
+"idle" only means this till had no input, so idle runs convert only files
+up to `convert_max_mb` (default 0: never) and otherwise log a hint.
+
+Durations go to METRICS as `maintenance.*`; page counts are logged and
+returned in the summary.
+"""
+from __future__ import annotations
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from utils.metrics import METRICS
+from .database_manager import DatabaseManager
+from .low_stock import LowStockRepository
+
+logger = logging.getLogger(__name__)
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+# Re-analyze a table once its row count moved this much from its statistics
+STALE_RATIO = 0.25
+# change_log entries deleted per write transaction, so other writers wait briefly
+PRUNE_CHUNK = 10000
+
+
+class DatabaseMaintenance:
+    """ANALYZE/optimize and incremental vacuum for one database."""
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        vacuum_pages: int = 0,
+        analysis_limit: int = 1000,
+        convert_max_mb: float = 0.0,
+        log_keep_days: float = 30.0,
+    ):
+        self.db = db
+        self.vacuum_pages = max(0, vacuum_pages)
+        self.analysis_limit = max(0, analysis_limit)
+        self.convert_max_mb = convert_max_mb
+        self.log_keep_days = log_keep_days
+        self._hinted = False
+
+    def auto_vacuum(self) -> str:
+        return AUTO_VACUUM_MODES.get(int(self.db.query_one("PRAGMA auto_vacuum")[0]), "unknown")
+
+    def convert_to_incremental(self) -> Dict[str, Any]:
+        """Switch an existing database to `auto_vacuum=INCREMENTAL` (rewrites the whole file).
+
+        Raises:
+            sqlite3.OperationalError: If another connection is using the database.
+        """
+        size_before = self.db.db_path.stat().st_size
+        started = time.perf_counter()
+        conn = sqlite3.connect(str(self.db.db_path), isolation_level=None)
+        try:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        ms = (time.perf_counter() - started) * 1000.0
+        METRICS.record("maintenance.convert", ms)
+        size_after = self.db.db_path.stat().st_size
+        logger.info("Switched %s to auto_vacuum=INCREMENTAL in %.0f ms (%d -> %d bytes)", self.db.db_path, ms, size_before, size_after)
+        return {"convert_ms": round(ms, 1), "bytes_before": size_before, "bytes_after": size_after}
+
+    def prune_change_log(self, conn: sqlite3.Connection) -> int:
+        """Delete `change_log` entries no sync still needs; returns the number deleted.
+
+        Everything up to the lowest acknowledged seq goes. Without a recorded
+        sync nothing is deleted, whatever its age: a first push exports from
+        seq 0, and the central database cannot tell a pruned entry from one
+        that never existed. `change_log` is AUTOINCREMENT, so pruning never
+        reuses a seq that the change watcher or a branch has seen.
+        """
+        acked = conn.execute("SELECT MIN(acked_seq) FROM replication_marks").fetchone()[0]
+        if acked is None:
+            return 0
+        cutoff = int(acked)
+        deleted = 0
+        low = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+        while low is not None and low <= cutoff:
+            high = min(cutoff, int(low) + PRUNE_CHUNK - 1)
+            deleted += conn.execute("DELETE FROM change_log WHERE seq BETWEEN ? AND ?", (low, high)).rowcount
+            low = conn.execute("SELECT MIN(seq) FROM change_log WHERE seq > ?", (high,)).fetchone()[0]
+        return deleted
+
+    def stale_tables(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        """{table: current row count} for indexed tables without statistics or drifted past STALE_RATIO."""
+        indexed = [
+            r[0]
+            for r in conn.execute(
+                "SELECT DISTINCT tbl_name FROM sqlite_master WHERE type = 'index' AND tbl_name NOT LIKE 'sqlite_%'"
+            )
+        ]
+        has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+        known: Dict[str, int] = {}
+        if has_stats:
+            for tbl, stat in conn.execute("SELECT tbl, stat FROM sqlite_stat1 WHERE stat IS NOT NULL"):
+                known.setdefault(tbl, int(str(stat).split()[0]))
+        stale = {}
+        for table in indexed:
+            rows = int(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+            if table not in known:
+                # Empty tables get no stat1 row; nothing to learn from them yet
+                if rows:
+                    stale[table] = rows
+            elif abs(rows - known[table]) > STALE_RATIO * max(known[table], 1000):
+                stale[table] = rows
+        return stale
+
+    def run(self, reason: str = "idle", allow_convert: bool = False, check_stats: bool = True) -> Dict[str, Any]:
+        """Refresh planner statistics and reclaim free pages; returns a summary.
+
+        With `check_stats` False only `PRAGMA optimize` runs, without
+        counting rows for the drift check (for a quick run at shutdown).
+        """
+        started = time.perf_counter()
+        summary: Dict[str, Any] = {"reason": reason}
+        if allow_convert and self.auto_vacuum() != "incremental":
+            if self.db.db_path.stat().st_size <= self.convert_max_mb * 1024 * 1024:
+                summary["convert"] = self.convert_to_incremental()
+            elif not self._hinted:
+                self._hinted = True
+                logger.info(
+                    "%s is not auto_vacuum=INCREMENTAL; free pages are not reclaimed until "
+                    "`python scripts/db_maintenance.py --convert` runs with the POS and server closed",
+                    self.db.db_path,
+                )
+        conn = sqlite3.connect(str(self.db.db_path), isolation_level=None)
+        try:
+            # Prune first: the deletes change row counts (ANALYZE) and free pages (vacuum)
+            t0 = time.perf_counter()
+            log_pruned = self.prune_change_log(conn)
+            events_pruned = LowStockRepository(self.db).prune_events(self.log_keep_days) if self.log_keep_days > 0 else 0
+            prune_ms = (time.perf_counter() - t0) * 1000.0
+
+            t0 = time.perf_counter()
+            conn.execute(f"PRAGMA analysis_limit = {int(self.analysis_limit)}")
+            stale = self.stale_tables(conn) if check_stats else {}
+            for table, rows in stale.items():
+                conn.execute(f"ANALYZE {table}")
+                # A limited ANALYZE estimates the row count; store the exact one
+                # (the planner reads it, and the next drift check compares to it)
+                conn.execute(
+                    "UPDATE sqlite_stat1 SET stat = ? || CASE WHEN instr(stat, ' ') THEN substr(stat, instr(stat, ' ')) ELSE '' END "
+                    "WHERE tbl = ?",
+                    (str(rows), table),
+                )
+            conn.execute("PRAGMA optimize")
+            analyze_ms = (time.perf_counter() - t0) * 1000.0
+
+            t0 = time.perf_counter()
+            mode = AUTO_VACUUM_MODES.get(int(conn.execute("PRAGMA auto_vacuum").fetchone()[0]), "unknown")
+            free_before = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+            if mode == "incremental" and free_before:
+                # execute() steps this pragma only once (one page); a script runs it to the end
+                conn.executescript(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)});")
+            free_after = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+            vacuum_ms = (time.perf_counter() - t0) * 1000.0
+            page_size = int(conn.execute("PRAGMA page_size").fetchone()[0])
+        finally:
+            conn.close()
+        reclaimed = free_before - free_after
+        total_ms = (time.perf_counter() - started) * 1000.0
+        METRICS.record("maintenance.prune", prune_ms)
+        METRICS.record("maintenance.analyze", analyze_ms)
+        METRICS.record("maintenance.vacuum", vacuum_ms)
+        METRICS.record("maintenance.total", total_ms)
+        summary.update({
+            "change_log_pruned": log_pruned,
+            "low_stock_events_pruned": events_pruned,
+            "prune_ms": round(prune_ms, 1),
+            "auto_vacuum": mode,
+            "analyzed": sorted(stale),
+            "analyze_ms": round(analyze_ms, 1),
+            "free_pages_before": free_before,
+            "pages_reclaimed": reclaimed,
+            "bytes_reclaimed": reclaimed * page_size,
+            "vacuum_ms": round(vacuum_ms, 1),
+            "total_ms": round(total_ms, 1),
+        })
+        logger.info(
+            "Maintenance (%s): pruned %d change_log entries and %d low-stock events in %.0f ms, "
+            "analyzed %s in %.0f ms, reclaimed %d of %d free pages in %.0f ms",
+            reason, log_pruned, events_pruned, prune_ms,
+            ", ".join(stale) or "nothing", analyze_ms, reclaimed, free_before, vacuum_ms,
+        )
+        return summary
+
+
+class MaintenanceScheduler:
+    """Run `DatabaseMaintenance.run` on a daemon thread once the app has been idle long enough.
+
+    `idle_for` returns the seconds since the last user input. A run happens
+    at most every `interval_h`; `shutdown()` runs once more synchronously.
+    """
+
+    def __init__(
+        self,
+        maintenance: DatabaseMaintenance,
+        idle_for: Callable[[], float],
+        idle_s: float = 300.0,
+        interval_h: float = 6.0,
+        check_s: float = 60.0,
+    ):
+        self.maintenance = maintenance
+        self.idle_for = idle_for
+        self.idle_s = idle_s
+        self.interval_s = interval_h * 3600.0
+        self.check_s = check_s
+        self.last_run: Optional[float] = None
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def due(self) -> bool:
+        return self.last_run is None or time.monotonic() - self.last_run >= self.interval_s
+
+    def run_now(self, reason: str, allow_convert: bool = False, check_stats: bool = True) -> Optional[Dict[str, Any]]:
+        if not self.maintenance.db.db_path.exists():
+            return None
+        with self._lock:
+            try:
+                self.last_result = self.maintenance.run(reason, allow_convert=allow_convert, check_stats=check_stats)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.exception("Database maintenance (%s) failed", reason)
+            self.last_run = time.monotonic()
+            return self.last_result
+
+    def start(self) -> None:
+        self.stop()
+        self._stop = threading.Event()
+
+        def run(stop):
+            while not stop.wait(self.check_s):
+                if self.due() and self.idle_for() >= self.idle_s:
+                    self.run_now("idle", allow_convert=True)
+
+        self._thread = threading.Thread(target=run, args=(self._stop,), name="db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread = None
+
+    def shutdown(self) -> Optional[Dict[str, Any]]:
+        """Stop the thread and run once more (no file conversion or row counts, so closing stays quick)."""
+        self.stop()
+        return self.run_now("shutdown", check_stats=False)
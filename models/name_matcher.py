@@ -0,0 +1,204 @@
+"""Ranked multi-token fuzzy matching over item names (NumPy).
+
+Names are split into normalized tokens once ("Bawang Merah 25 kg" ->
+bawang, merah, 25, kg) and stored as a token vocabulary plus a flat
+name -> token-id array. A query is scored per vocabulary token with
+vectorized comparisons (exact, prefix, substring, bounded Levenshtein),
+the scores are spread onto names through an inverted index, and only
+names matching every query token are ranked. Cost per keystroke is a few
+array passes over the vocabulary and the token array, not a Python loop
+over names.
+
+Requires NumPy (installed with pandas); callers fall back to plain
+substring search when it is missing.
+"""
+from __future__ import annotations
+import re
+from bisect import bisect_left
+from typing import List, Sequence
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+ALPHABET_INDEX = {c: i for i, c in enumerate(ALPHABET)}
+
+# Per-token match scores; a name's score is the sum over query tokens
+SCORE_EXACT = 1.0
+SCORE_PREFIX = 0.8
+SCORE_SUBSTRING = 0.6
+SCORE_EDIT = (0.0, 0.5, 0.3)  # by edit distance 0 (unused), 1, 2
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def max_edits(length: int) -> int:
+    """Typos tolerated for a query token of `length` characters."""
+    if length >= 8:
+        return 2
+    if length >= 4:
+        return 1
+    return 0
+
+
+class NameMatcher:
+    """Precomputed token arrays for a fixed list of names.
+
+    `search` returns row positions into the `names` sequence it was built
+    from, best match first. Rebuild when names are added, renamed or removed.
+    """
+
+    def __init__(self, names: Sequence[str], max_token_len: int = 24):
+        tokenized = [tokenize(name) or [""] for name in names]
+        # Sorted vocabulary: prefix matches are one contiguous id range.
+        # "" sorts first, so id 0 is the placeholder for names without tokens.
+        words = sorted({t for tokens in tokenized for t in tokens} | {""})
+        vocab = {w: i for i, w in enumerate(words)}
+        counts = np.fromiter((len(t) for t in tokenized), dtype=np.int16, count=len(tokenized))
+        self.words = words
+        self.vocab = vocab
+        name_tokens = np.fromiter((vocab[t] for tokens in tokenized for t in tokens), dtype=np.int32)
+        self.token_counts = counts
+        del tokenized
+        # Inverted index (CSR): names containing vocabulary token v are
+        # postings[ptr[v]:ptr[v + 1]]
+        name_of = np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+        order = np.argsort(name_tokens, kind="stable")
+        self.postings = name_of[order]
+        self.posting_ptr = np.zeros(len(words) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(name_tokens, minlength=len(words)), out=self.posting_ptr[1:])
+        del name_of, order, name_tokens
+
+        # One newline-joined string for substring search, with word start offsets
+        self.text = "\n".join(words)
+        self.starts = np.cumsum([0] + [len(w) + 1 for w in words[:-1]], dtype=np.int64)
+
+        # Zero-padded code-point matrix for the vectorized edit distance
+        width = max(1, min(max_token_len, max((len(w) for w in words), default=1)))
+        chars = np.zeros((len(words), width), dtype=np.uint32)
+        lengths = np.zeros(len(words), dtype=np.int16)
+        for i, w in enumerate(words):
+            w = w[:width]
+            lengths[i] = len(w)
+            if w:
+                chars[i, : len(w)] = np.frombuffer(w.encode("utf-32-le"), dtype=np.uint32)
+        self.chars = chars
+        self.lengths = lengths
+        # Per-token character counts over [0-9a-z] for the edit-distance prefilter
+        hist = np.zeros((len(words), len(ALPHABET)), dtype=np.uint8)
+        for c, col in ALPHABET_INDEX.items():
+            hist[:, col] = np.minimum((chars == ord(c)).sum(axis=1), 255)
+        self.char_hist = hist
+        # Edit-distance candidates by length; tokens with digits (sizes, pack
+        # counts like "25", "1kg", "v12") must match literally, never fuzzily
+        alpha = np.fromiter((w.isalpha() for w in words), dtype=bool, count=len(words))
+        self.alpha_by_len = {
+            int(n): np.flatnonzero(alpha & (lengths == n)) for n in np.unique(lengths[alpha])
+        }
+
+    def __len__(self) -> int:
+        return len(self.token_counts)
+
+    def _token_scores(self, q: str, typos: bool = True) -> np.ndarray:
+        """Score of every vocabulary token against one query token."""
+        scores = np.zeros(len(self.words), dtype=np.float32)
+        m = len(q)
+        if m >= 3:
+            # Substring anywhere: C-level scan of the joined vocabulary
+            hits = []
+            find, pos = self.text.find, self.text.find(q)
+            while pos != -1:
+                hits.append(pos)
+                pos = find(q, pos + 1)
+            if hits:
+                scores[np.unique(np.searchsorted(self.starts, hits, side="right") - 1)] = SCORE_SUBSTRING
+        lo = bisect_left(self.words, q)
+        hi = bisect_left(self.words, q + "\uffff", lo)
+        scores[lo:hi] = SCORE_PREFIX
+        k = max_edits(m)
+        if typos and k and m <= self.chars.shape[1] and q.isalpha():
+            self._edit_scores(np.frombuffer(q.encode("utf-32-le"), dtype=np.uint32), k, scores)
+        exact = self.vocab.get(q)
+        if exact:
+            scores[exact] = SCORE_EXACT
+        return scores
+
+    def _edit_scores(self, codes: np.ndarray, k: int, scores: np.ndarray) -> None:
+        """Optimal-string-alignment distance (a swap counts as one edit) to
+        unmatched alphabetic tokens of similar length, all computed at once."""
+        m = len(codes)
+        groups = [self.alpha_by_len[n] for n in range(max(1, m - k), m + k + 1) if n in self.alpha_by_len]
+        if not groups:
+            return
+        cand = np.concatenate(groups)
+        cand = cand[scores[cand] == 0]
+        if cand.size == 0:
+            return
+        lengths = self.lengths[cand].astype(np.int32)
+        # Cheap lower bound first: distance >= max(len) - shared characters
+        chars, counts = np.unique(codes, return_counts=True)
+        cols = [ALPHABET_INDEX[chr(c)] for c in chars]
+        shared = np.minimum(self.char_hist[np.ix_(cand, cols)], counts.astype(np.uint8)).sum(axis=1, dtype=np.int32)
+        keep = np.maximum(lengths, m) - shared <= k
+        cand = cand[keep]
+        if cand.size == 0:
+            return
+        width = min(self.chars.shape[1], m + k)
+        words = self.chars[cand, :width]
+        n = cand.size
+        rows = [np.broadcast_to(np.arange(width + 1, dtype=np.int16), (n, width + 1))]
+        for i in range(1, m + 1):
+            prev = rows[-1]
+            cur = np.empty((n, width + 1), dtype=np.int16)
+            cur[:, 0] = i
+            cost = (words != codes[i - 1]).astype(np.int16)
+            # Deletion/substitution terms are vectorized over j; insertion is a running min
+            best = np.minimum(prev[:, 1:] + 1, prev[:, :-1] + cost)
+            if i > 1:
+                swap = (words[:, 1:] == codes[i - 2]) & (words[:, :-1] == codes[i - 1])
+                best[:, 1:] = np.where(swap, np.minimum(best[:, 1:], rows[-2][:, :-2] + 1), best[:, 1:])
+            for j in range(1, width + 1):
+                cur[:, j] = np.minimum(best[:, j - 1], cur[:, j - 1] + 1)
+            rows.append(cur)
+            if len(rows) > 2:
+                rows.pop(0)
+        dist = rows[-1][np.arange(n), self.lengths[cand]]
+        for d in range(1, k + 1):
+            scores[cand[dist == d]] = SCORE_EDIT[d]
+
+    def _name_scores(self, scores: np.ndarray) -> np.ndarray:
+        """Best token score per name, via the postings of matching tokens only."""
+        per_name = np.zeros(len(self), dtype=np.float32)
+        ids = np.flatnonzero(scores)
+        if ids.size == 0:
+            return per_name
+        starts = self.posting_ptr[ids]
+        lens = self.posting_ptr[ids + 1] - starts
+        # Positions of all postings of `ids`, concatenated
+        offsets = np.repeat(starts - np.cumsum(lens) + lens, lens) + np.arange(lens.sum())
+        np.maximum.at(per_name, self.postings[offsets], np.repeat(scores[ids], lens))
+        return per_name
+
+    def search(self, query: str, limit: int = 50, typos: bool = True) -> List[int]:
+        """Positions of names containing every query token (fuzzily), best first.
+
+        Ties are broken by fewer tokens (shorter names), then original order.
+        With `typos` off, every token must match exactly, as a prefix or as a
+        substring, so a hit is safe to pick without showing it first.
+        """
+        tokens = tokenize(query)
+        if not tokens or len(self) == 0:
+            return []
+        total = np.zeros(len(self), dtype=np.float32)
+        matched = np.ones(len(self), dtype=bool)
+        for q in dict.fromkeys(tokens):
+            per_name = self._name_scores(self._token_scores(q, typos))
+            matched &= per_name > 0
+            if not matched.any():
+                return []
+            total += per_name
+        idx = np.flatnonzero(matched)
+        order = np.lexsort((idx, self.token_counts[idx], -total[idx]))
+        return idx[order[:limit]].tolist()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+import logging
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from .database_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+class ProductGroupsRepository:
+    """Nested product groups backed by `product_group_closure`.
+
+    Triggers keep the closure table in step with `product_groups.parent_id`
+    on insert, move and delete, so "group including subgroups" is one
+    indexed join instead of a recursive CTE per query.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def create(self, name: str, parent_id: Optional[int] = None) -> int:
+        with self.db.connect() as conn:
+            cur = conn.execute("INSERT INTO product_groups (name, parent_id) VALUES (?, ?)", (name, parent_id))
+            return int(cur.lastrowid)
+
+    def move(self, group_id: int, new_parent_id: Optional[int]) -> None:
+        """Re-parent a group with its whole subtree (None = top level).
+
+        Raises:
+            ValueError: If the new parent is the group itself or one of its subgroups.
+        """
+        try:
+            with self.db.connect() as conn:
+                conn.execute("UPDATE product_groups SET parent_id=? WHERE id=?", (new_parent_id, group_id))
+        except sqlite3.IntegrityError as e:
+            if "moved under itself" in str(e):
+                raise ValueError(f"Cannot move group {group_id} under its own subtree") from e
+            raise
+
+    def delete(self, group_id: int) -> None:
+        """Delete a group; its subgroups and items move up to its parent."""
+        with self.db.transaction() as conn:
+            row = conn.execute("SELECT parent_id FROM product_groups WHERE id=?", (group_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"Group id {group_id} not found")
+            parent_id = row[0]
+            conn.execute("UPDATE product_groups SET parent_id=? WHERE parent_id=?", (parent_id, group_id))
+            conn.execute(
+                "UPDATE items SET group_id=?, updated_at=datetime('now') WHERE group_id=?",
+                (parent_id, group_id),
+            )
+            conn.execute("DELETE FROM product_groups WHERE id=?", (group_id,))
+
+    def subtree_ids(self, group_id: int) -> List[int]:
+        """The group and all of its subgroups."""
+        rows = self.db.query_all(
+            "SELECT descendant_id FROM product_group_closure WHERE ancestor_id=? ORDER BY depth, descendant_id",
+            (group_id,),
+        )
+        return [int(r[0]) for r in rows]
+
+    def path(self, group_id: int, sep: str = " > ") -> str:
+        """Display path from the top-level group down to `group_id`."""
+        rows = self.db.query_all(
+            """
+            SELECT g.name
+            FROM product_group_closure c
+            JOIN product_groups g ON g.id = c.ancestor_id
+            WHERE c.descendant_id = ?
+            ORDER BY c.depth DESC
+            """,
+            (group_id,),
+        )
+        return sep.join(r[0] for r in rows)
+
+    def items_in_group(self, group_id: int, include_subgroups: bool = True, active_only: bool = True) -> List[Dict[str, Any]]:
+        """Items of a group, optionally including every nested subgroup."""
+        depth_clause = "" if include_subgroups else " AND c.depth = 0"
+        active_clause = " AND i.active = 1" if active_only else ""
+        with self.db.connect() as conn:
+            cur = conn.execute(
+                f"""
+                SELECT i.id, i.code, i.name, i.group_id, i.unit, i.current_stock, i.min_stock
+                FROM product_group_closure c
+                JOIN items i ON i.group_id = c.descendant_id
+                WHERE c.ancestor_id = ?{depth_clause}{active_clause}
+                ORDER BY i.name
+                """,
+                (group_id,),
+            )
+            cols = [d[0] for d in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    def stock_by_group(self, parent_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rolled-up item count and stock for each child of `parent_id` (None = top level).
+
+        Each total includes all nested subgroups of that child.
+        """
+        with self.db.connect() as conn:
+            cur = conn.execute(
+                """
+                SELECT g.id AS group_id, g.name, COUNT(i.id) AS items, COALESCE(SUM(i.current_stock), 0) AS stock
+                FROM product_groups g
+                JOIN product_group_closure c ON c.ancestor_id = g.id
+                LEFT JOIN items i ON i.group_id = c.descendant_id AND i.active = 1
+                WHERE g.parent_id IS ?
+                GROUP BY g.id
+                ORDER BY g.name
+                """,
+                (parent_id,),
+            )
+            cols = [d[0] for d in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
@@ -0,0 +1,307 @@
+from __future__ import annotations
+import csv
+import io
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from .database_manager import DatabaseManager
+from .items_repository import resolve_item_keys
+
+logger = logging.getLogger(__name__)
+
+DeliveryLine = Union[Tuple[str, int], Dict[str, Any]]
+
+# Accepted column names in delivery lists (case-insensitive)
+KEY_COLUMNS = ("code", "barcode", "item", "name")
+QTY_COLUMNS = ("qty", "quantity", "received", "count")
+DELIMITERS = (",", ";", "\t")
+
+
+def parse_delivery_text(text: str) -> List[Tuple[str, int]]:
+    """Parse a pasted delivery list or scanner batch into (key, qty) lines.
+
+    Accepted forms:
+    - CSV/TSV with a header naming a key column (Code/Barcode/Item/Name)
+      and optionally a quantity column (Qty/Quantity/Received/Count)
+    - one `key<sep>qty` per line (sep is comma, semicolon or tab)
+    - one bare key per line, as a scanner produces; each scan counts as 1
+
+    Repeated keys are kept as separate lines; they are summed on commit.
+
+    Raises:
+        ValueError: If a quantity is not a positive whole number.
+    """
+    lines = [ln for ln in text.splitlines() if ln.strip()]
+    if not lines:
+        return []
+    delim = next((d for d in DELIMITERS if d in lines[0]), ",")
+    header = [c.strip().lower() for c in lines[0].split(delim)]
+    if any(c in KEY_COLUMNS for c in header):
+        return _parse_with_header(lines, delim)
+
+    out = []
+    for n, line in enumerate(lines, start=1):
+        # Scanner batches may mix bare codes with "code<sep>qty" lines
+        sep = next((d for d in DELIMITERS if d in line), None)
+        parts = [p.strip() for p in line.split(sep)] if sep else [line.strip()]
+        key = parts[0]
+        qty = parts[1] if len(parts) > 1 and parts[1] else "1"
+        if key:
+            out.append((key, _parse_qty(qty, n, key)))
+    return out
+
+
+def read_delivery_file(path: str | Path) -> List[Tuple[str, int]]:
+    """Read a delivery list from a CSV/TSV file or scanner export."""
+    return parse_delivery_text(Path(path).read_text(encoding="utf-8-sig"))
+
+
+def _parse_with_header(lines: List[str], delim: str) -> List[Tuple[str, int]]:
+    reader = csv.DictReader(io.StringIO("\n".join(lines)), delimiter=delim)
+    cols = {c.strip().lower(): c for c in (reader.fieldnames or [])}
+    key_col = next(cols[c] for c in KEY_COLUMNS if c in cols)
+    qty_col = next((cols[c] for c in QTY_COLUMNS if c in cols), None)
+    out = []
+    for n, row in enumerate(reader, start=2):
+        key = (row.get(key_col) or "").strip()
+        if not key:
+            continue
+        qty = (row.get(qty_col) or "").strip() if qty_col else ""
+        out.append((key, _parse_qty(qty or "1", n, key)))
+    return out
+
+
+def whole_number(value: Any) -> int:
+    """`value` as an int if it is a whole number ("3", 3.0); never truncates.
+
+    Raises:
+        ValueError: For fractions ("2.5", 0.5), booleans, blanks and non-numbers.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Not a whole number: {value!r}")
+    if isinstance(value, int):
+        return value
+    try:
+        # int() first keeps digits beyond float precision exact
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        pass
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Not a whole number: {value!r}")
+    if not number.is_integer():
+        raise ValueError(f"Not a whole number: {value!r}")
+    return int(number)
+
+
+def _parse_qty(value: str, line_no: int, key: str) -> int:
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"Line {line_no}: invalid quantity {value!r} for {key!r}")
+    # "3.0" from a spreadsheet export is fine; "2.5" is not silently truncated
+    if not number.is_integer():
+        raise ValueError(f"Line {line_no}: quantity must be a whole number, got {value!r} for {key!r}")
+    qty = int(number)
+    if qty <= 0:
+        raise ValueError(f"Line {line_no}: quantity must be positive for {key!r}")
+    return qty
+
+
+def next_transaction_number(conn, kind: str) -> str:
+    """Return `<kind>-YYYYMMDD-NNNN`, numbered per day (call under the write lock).
+
+    The sequence widens past 9999 (`-10000`); the last one handed out is
+    kept in `transaction_counters`, since MAX() over the text would sort
+    `-10000` below `-9999`.
+    """
+    prefix = f"{kind}-{datetime.now(timezone.utc):%Y%m%d}-"
+    row = conn.execute(
+        "UPDATE transaction_counters SET last_seq = last_seq + 1 WHERE prefix = ? RETURNING last_seq", (prefix,)
+    ).fetchone()
+    if row is not None:
+        return f"{prefix}{int(row[0]):04d}"
+    # First number of the day, or of a database numbered before the counter
+    # existed: continue after the longest, then highest, suffix
+    row = conn.execute(
+        # Range instead of LIKE so the UNIQUE index on transaction_number is used
+        "SELECT transaction_number FROM transactions WHERE transaction_number > ? AND transaction_number < ? "
+        "ORDER BY length(transaction_number) DESC, transaction_number DESC LIMIT 1",
+        (prefix, prefix + ":"),
+    ).fetchone()
+    seq = int(row[0][len(prefix):]) + 1 if row else 1
+    conn.execute("INSERT INTO transaction_counters (prefix, last_seq) VALUES (?, ?)", (prefix, seq))
+    return f"{prefix}{seq:04d}"
+
+
+def normalize_line(line: DeliveryLine) -> Tuple[str, int]:
+    """(key, qty) from a tuple or a dict with key/code/barcode/item/name and qty."""
+    if isinstance(line, dict):
+        key = line.get("key")
+        for col in KEY_COLUMNS:
+            if key is None:
+                key = line.get(col)
+        qty = line.get("qty", line.get("quantity", 1))
+    else:
+        key, qty = line
+    if key is None or str(key).strip() == "":
+        raise ValueError(f"Line without item key: {line!r}")
+    try:
+        qty = whole_number(qty)
+    except ValueError:
+        raise ValueError(f"Quantity must be a whole number for {key!r}, got {qty!r}")
+    if qty <= 0:
+        raise ValueError(f"Quantity must be positive for {key!r}")
+    return str(key).strip(), qty
+
+
+class ReceivingRepository:
+    """Receive deliveries as a single `IN` transaction.
+
+    Delivery lines are loaded into a temp table and resolved to items with
+    one set-based lookup (code, barcode, then name), so a truckload of lines
+    is previewed and committed without per-line queries.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def preview(self, lines: Iterable[DeliveryLine]) -> Dict[str, Any]:
+        """Resolve delivery lines without writing.
+
+        Returns:
+            {"items": [{item_id, name, unit, qty, stock_before, stock_after}],
+             "unresolved": [{line, key, qty}], "lines": int, "total_qty": int}
+        """
+        rows = [normalize_line(line) for line in lines]
+        with self.db.connect() as conn:
+            result = self._resolve(conn, rows)
+            conn.rollback()
+        return result
+
+    def receive(
+        self,
+        lines: Iterable[DeliveryLine],
+        person_name: str,
+        notes: str | None = None,
+        skip_unresolved: bool = False,
+    ) -> Dict[str, Any]:
+        """Commit a delivery as one `IN` transaction in one database transaction.
+
+        Lines for the same item are summed into one `transaction_items` row.
+        Stock before/after values are read under the write lock, so they are
+        consistent even if stock changed since the preview.
+
+        Args:
+            lines: (key, qty) tuples or dicts with "key" (or code/barcode/name) and "qty".
+            person_name: Who received the delivery.
+            notes: Stored on the transaction (e.g. supplier or delivery note number).
+            skip_unresolved: Commit the resolved lines even if some keys did
+                not match an item; otherwise nothing is written.
+
+        Returns:
+            The preview summary plus "transaction_id" and "transaction_number".
+
+        Raises:
+            ValueError: If person_name is empty, nothing resolves, or lines
+                are unresolved and skip_unresolved is False.
+        """
+        person_name = (person_name or "").strip()
+        if not person_name:
+            raise ValueError("Person name is required")
+        rows = [normalize_line(line) for line in lines]
+        with self.db.transaction(immediate=True) as conn:
+            return self.write(conn, rows, person_name, notes, skip_unresolved)
+
+    def write(
+        self,
+        conn,
+        rows: List[Tuple[str, int]],
+        person_name: str,
+        notes: str | None = None,
+        skip_unresolved: bool = False,
+    ) -> Dict[str, Any]:
+        """Write normalized (key, qty) rows as one `IN` transaction on an open write transaction."""
+        result = self._resolve(conn, rows)
+        if result["unresolved"] and not skip_unresolved:
+            keys = ", ".join(u["key"] for u in result["unresolved"][:10])
+            raise ValueError(f"{len(result['unresolved'])} unresolved line(s): {keys}")
+        if not result["items"]:
+            raise ValueError("No delivery lines matched an item")
+        number = next_transaction_number(conn, "IN")
+        cur = conn.execute(
+            "INSERT INTO transactions (transaction_number, person_name, transaction_type, notes) VALUES (?, ?, 'IN', ?)",
+            (number, person_name, notes),
+        )
+        trx_id = int(cur.lastrowid)
+        conn.execute(
+            """
+            INSERT INTO transaction_items (transaction_id, item_id, quantity, stock_before, stock_after, created_ts, created_day)
+            SELECT t.id, d.item_id, d.qty, i.current_stock, i.current_stock + d.qty, t.created_ts, t.created_day
+            FROM temp.receiving_delta d
+            JOIN items i ON i.id = d.item_id
+            JOIN transactions t ON t.id = ?
+            ORDER BY d.first_line
+            """,
+            (trx_id,),
+        )
+        conn.execute(
+            """
+            UPDATE items
+            SET current_stock = current_stock + (SELECT qty FROM temp.receiving_delta d WHERE d.item_id = items.id),
+                updated_at = datetime('now')
+            WHERE id IN (SELECT item_id FROM temp.receiving_delta)
+            """
+        )
+        result["transaction_id"] = trx_id
+        result["transaction_number"] = number
+        logger.info(
+            "Received %s by %s: %d lines, %d items, %d units, %d unresolved",
+            number, person_name, result["lines"], len(result["items"]), result["total_qty"], len(result["unresolved"]),
+        )
+        return result
+
+    @staticmethod
+    def _resolve(conn, rows: List[Tuple[str, int]]) -> Dict[str, Any]:
+        conn.execute("DROP TABLE IF EXISTS temp.receiving_lines")
+        conn.execute("DROP TABLE IF EXISTS temp.receiving_delta")
+        conn.execute(
+            "CREATE TEMP TABLE receiving_lines (line INTEGER PRIMARY KEY, key TEXT NOT NULL, qty INTEGER NOT NULL, item_id INTEGER)"
+        )
+        conn.executemany("INSERT INTO temp.receiving_lines (key, qty) VALUES (?, ?)", rows)
+        resolve_item_keys(conn, "temp.receiving_lines")
+        conn.execute(
+            "CREATE TEMP TABLE receiving_delta (item_id INTEGER PRIMARY KEY, qty INTEGER NOT NULL, first_line INTEGER NOT NULL)"
+        )
+        conn.execute(
+            """
+            INSERT INTO temp.receiving_delta (item_id, qty, first_line)
+            SELECT item_id, SUM(qty), MIN(line)
+            FROM temp.receiving_lines
+            WHERE item_id IS NOT NULL
+            GROUP BY item_id
+            """
+        )
+        cur = conn.execute(
+            """
+            SELECT d.item_id, i.name, i.unit, d.qty, i.current_stock AS stock_before, i.current_stock + d.qty AS stock_after
+            FROM temp.receiving_delta d
+            JOIN items i ON i.id = d.item_id
+            ORDER BY d.first_line
+            """
+        )
+        cols = [c[0] for c in cur.description]
+        items = [dict(zip(cols, r)) for r in cur.fetchall()]
+        unresolved = [
+            {"line": r[0], "key": r[1], "qty": r[2]}
+            for r in conn.execute("SELECT line, key, qty FROM temp.receiving_lines WHERE item_id IS NULL ORDER BY line")
+        ]
+        return {
+            "lines": len(rows),
+            "total_qty": sum(int(i["qty"]) for i in items),
+            "items": items,
+            "unresolved": unresolved,
+        }
@@ -0,0 +1,207 @@
+from __future__ import annotations
+import logging
+import sqlite3
+from typing import Optional, List, Dict, Any
+
+from .database_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+# Signed ledger entries with their recorded "before" value. Ledger order is
+# (created_at, src, transaction_id, entry_id): lines of one second follow
+# their transactions, as in TransactionEditRepository, because an edit can
+# add a line (higher id) to an earlier transaction.
+_LEDGER_ENTRIES_SQL = """
+    SELECT ti.item_id AS item_id, t.created_at AS created_at, 0 AS src, t.id AS transaction_id,
+           ti.id AS entry_id,
+           CASE t.transaction_type WHEN 'OUT' THEN -ti.quantity ELSE ti.quantity END AS delta,
+           ti.stock_before AS before
+    FROM transaction_items ti
+    JOIN transactions t ON t.id = ti.transaction_id
+    UNION ALL
+    SELECT item_id, created_at, 1, NULL, id, adjustment, old_stock
+    FROM stock_adjustments
+"""
+
+
+class StockReconciler:
+    """Compare denormalized `items.current_stock` against the stock ledger.
+
+    Expected stock per item is kept in `stock_reconciliation` and advanced
+    from checkpoint to checkpoint, so an incremental run only reads ledger
+    rows added since the previous run. Edits made with
+    `TransactionEditRepository` correct the expected stock themselves; other
+    edits or deletes of already processed ledger rows are only picked up by
+    a full rebuild.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def last_checkpoint(self) -> Optional[Dict[str, Any]]:
+        with self.db.connect() as conn:
+            cur = conn.execute(
+                "SELECT * FROM reconciliation_checkpoints ORDER BY id DESC LIMIT 1"
+            )
+            row = cur.fetchone()
+            return {d[0]: v for d, v in zip(cur.description, row)} if row else None
+
+    def run(self, full: bool = False) -> Dict[str, Any]:
+        """Reconcile stock and return a summary with the mismatching items.
+
+        Args:
+            full: Rebuild expected stock from the whole ledger instead of
+                processing only entries since the last checkpoint. A full
+                rebuild also runs when no checkpoint exists yet.
+        """
+        checkpoint = None if full else self.last_checkpoint()
+        with self.db.transaction() as conn:
+            marks = conn.execute(
+                """
+                SELECT (SELECT COALESCE(MAX(id), 0) FROM transaction_items),
+                       (SELECT COALESCE(MAX(id), 0) FROM stock_adjustments),
+                       (SELECT COALESCE(MAX(id), 0) FROM items)
+                """
+            ).fetchone()
+            if checkpoint is None:
+                processed, checked = self._rebuild(conn)
+                mode = "full"
+            else:
+                processed, checked = self._advance(conn, checkpoint, marks)
+                mode = "incremental"
+            mismatches = self._mismatches(conn)
+            conn.execute(
+                """
+                INSERT INTO reconciliation_checkpoints
+                    (last_trx_item_id, last_adjustment_id, last_item_id, mode,
+                     entries_processed, items_checked, mismatches)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (*marks, mode, processed, checked, len(mismatches)),
+            )
+        logger.info(
+            "Stock reconciliation (%s): %d entries, %d items checked, %d mismatches",
+            mode, processed, checked, len(mismatches),
+        )
+        return {
+            "mode": mode,
+            "entries_processed": processed,
+            "items_checked": checked,
+            "mismatches": mismatches,
+        }
+
+    def _rebuild(self, conn: sqlite3.Connection) -> tuple[int, int]:
+        """Recompute expected stock for every item with one grouped aggregation.
+
+        The opening balance of an item is the recorded "before" value of its
+        first ledger entry; items without entries are taken as correct.
+        """
+        conn.execute("DELETE FROM stock_reconciliation")
+        conn.execute(
+            f"""
+            INSERT INTO stock_reconciliation (item_id, expected_stock, mismatch)
+            SELECT i.id,
+                   COALESCE(g.opening + g.total, i.current_stock),
+                   i.current_stock != COALESCE(g.opening + g.total, i.current_stock)
+            FROM items i
+            LEFT JOIN (
+                SELECT item_id,
+                       SUM(delta) AS total,
+                       MAX(CASE WHEN rn = 1 THEN before END) AS opening
+                FROM (
+                    SELECT item_id, delta, before,
+                           ROW_NUMBER() OVER (PARTITION BY item_id ORDER BY created_at, src, transaction_id, entry_id) AS rn
+                    FROM ({_LEDGER_ENTRIES_SQL})
+                )
+                GROUP BY item_id
+            ) g ON g.item_id = i.id
+            """
+        )
+        processed = conn.execute(
+            "SELECT (SELECT COUNT(*) FROM transaction_items) + (SELECT COUNT(*) FROM stock_adjustments)"
+        ).fetchone()[0]
+        checked = conn.execute("SELECT COUNT(*) FROM stock_reconciliation").fetchone()[0]
+        return int(processed), int(checked)
+
+    def _advance(self, conn: sqlite3.Connection, checkpoint: Dict[str, Any], marks: tuple) -> tuple[int, int]:
+        """Apply ledger entries added since `checkpoint` and re-check touched items."""
+        last_ti, last_adj, last_item = marks
+        conn.execute("DROP TABLE IF EXISTS temp.recon_delta")
+        conn.execute(
+            "CREATE TEMP TABLE recon_delta (item_id INTEGER PRIMARY KEY, delta INTEGER NOT NULL, entries INTEGER NOT NULL)"
+        )
+        conn.execute(
+            """
+            INSERT INTO temp.recon_delta (item_id, delta, entries)
+            SELECT item_id, SUM(delta), COUNT(*)
+            FROM (
+                SELECT ti.item_id AS item_id,
+                       CASE t.transaction_type WHEN 'OUT' THEN -ti.quantity ELSE ti.quantity END AS delta
+                FROM transaction_items ti
+                JOIN transactions t ON t.id = ti.transaction_id
+                WHERE ti.id > :cp_ti AND ti.id <= :last_ti
+                UNION ALL
+                SELECT item_id, adjustment
+                FROM stock_adjustments
+                WHERE id > :cp_adj AND id <= :last_adj
+            )
+            GROUP BY item_id
+            """,
+            {
+                "cp_ti": checkpoint["last_trx_item_id"], "last_ti": last_ti,
+                "cp_adj": checkpoint["last_adjustment_id"], "last_adj": last_adj,
+            },
+        )
+        # New items: their opening stock is not in the ledger, so take it as given
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO stock_reconciliation (item_id, expected_stock)
+            SELECT i.id, i.current_stock - COALESCE(d.delta, 0)
+            FROM items i
+            LEFT JOIN temp.recon_delta d ON d.item_id = i.id
+            WHERE i.id > ? AND i.id <= ?
+            """,
+            (checkpoint["last_item_id"], last_item),
+        )
+        conn.execute(
+            """
+            UPDATE stock_reconciliation
+            SET expected_stock = expected_stock + (SELECT delta FROM temp.recon_delta d WHERE d.item_id = stock_reconciliation.item_id)
+            WHERE item_id IN (SELECT item_id FROM temp.recon_delta)
+            """
+        )
+        # Items to compare: touched by new entries, created or written since the
+        # checkpoint, or still mismatching from an earlier run
+        conn.execute(
+            """
+            UPDATE stock_reconciliation
+            SET mismatch = ((SELECT current_stock FROM items i WHERE i.id = stock_reconciliation.item_id) != expected_stock),
+                checked_at = datetime('now')
+            WHERE item_id IN (
+                SELECT item_id FROM temp.recon_delta
+                UNION SELECT id FROM items WHERE id > :cp_item
+                UNION SELECT id FROM items WHERE updated_ts >= CAST(strftime('%s', :cp_at) AS INTEGER)
+                UNION SELECT item_id FROM stock_reconciliation WHERE mismatch = 1
+            )
+            """,
+            {"cp_item": checkpoint["last_item_id"], "cp_at": checkpoint["created_at"]},
+        )
+        checked = conn.execute("SELECT changes()").fetchone()[0]
+        processed = conn.execute("SELECT COALESCE(SUM(entries), 0) FROM temp.recon_delta").fetchone()[0]
+        conn.execute("DROP TABLE temp.recon_delta")
+        return int(processed), int(checked)
+
+    def _mismatches(self, conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+        cur = conn.execute(
+            """
+            SELECT i.id AS item_id, i.name, i.current_stock, r.expected_stock,
+                   i.current_stock - r.expected_stock AS difference
+            FROM stock_reconciliation r
+            JOIN items i ON i.id = r.item_id
+            WHERE r.mismatch = 1
+            ORDER BY i.name ASC
+            """
+        )
+        cols = [d[0] for d in cur.description]
+        return [dict(zip(cols, r)) for r in cur.fetchall()]
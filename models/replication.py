@@ -0,0 +1,251 @@
+"""Branch -> central replication from the `change_log` table.
+
+Each warehouse keeps its own database. Triggers append (table, row id, op)
+to `change_log` for every write to the replicated tables (`CDC_TABLES`);
+`ChangeLog.export_batch` reads the log after a sequence number, collapses
+repeated changes of a row, attaches the rows' current values and returns a
+zlib-compressed JSON batch. `CentralStore.apply_batch` upserts those rows
+into `branch_<table>` mirrors keyed by (branch, id) in the central database
+and records the last applied sequence per branch.
+
+Applying is idempotent: rows are upserted with their latest values, deletes
+are deletes, and a batch entirely at or below the branch's recorded sequence
+is skipped. A batch that starts after the recorded sequence is rejected,
+so no change can be silently lost. Cost is proportional to the number of
+changes since the last sync.
+"""
+from __future__ import annotations
+import json
+import logging
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .database_manager import CDC_TABLES, DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+BATCH_FORMAT = 1
+DEFAULT_BATCH_CHANGES = 5000
+
+
+class ChangeLog:
+    """Branch side: export changes after a sequence number."""
+
+    def __init__(self, db: DatabaseManager, branch: str):
+        if not branch or not branch.strip():
+            raise ValueError("Branch name is required")
+        self.db = db
+        self.branch = branch.strip()
+
+    def last_seq(self) -> int:
+        row = self.db.query_one("SELECT COALESCE(MAX(seq), 0) FROM change_log")
+        return int(row[0])
+
+    def pending(self, since: int) -> int:
+        row = self.db.query_one("SELECT COUNT(*) FROM change_log WHERE seq > ?", (int(since),))
+        return int(row[0])
+
+    def export_batch(self, since: int, limit: int = DEFAULT_BATCH_CHANGES) -> Optional[bytes]:
+        """Compressed batch of up to `limit` changes after `since`; None when up to date."""
+        batch = self._build(since, limit)
+        return None if batch is None else compress_batch(batch)
+
+    def _build(self, since: int, limit: int) -> Optional[Dict[str, Any]]:
+        with self.db.connect() as conn:
+            changes = conn.execute(
+                "SELECT seq, table_name, row_id FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?",
+                (int(since), int(limit)),
+            ).fetchall()
+            if not changes:
+                return None
+            upto = changes[-1][0]
+            touched: Dict[str, set] = {}
+            for _seq, table, row_id in changes:
+                touched.setdefault(table, set()).add(row_id)
+            tables = {}
+            for table, ids in touched.items():
+                if table not in CDC_TABLES:
+                    continue
+                rows, columns = self._current_rows(conn, table, sorted(ids))
+                present = {r[0] for r in rows}
+                tables[table] = {
+                    "columns": columns,
+                    "rows": rows,
+                    # Not in the table any more: deleted since it was logged
+                    "deleted": sorted(ids - present),
+                }
+        return {
+            "format": BATCH_FORMAT,
+            "branch": self.branch,
+            "since": int(since),
+            "upto": int(upto),
+            "changes": len(changes),
+            "tables": tables,
+        }
+
+    @staticmethod
+    def _current_rows(conn: sqlite3.Connection, table: str, ids: List[int]):
+        columns = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+        # "id" first so mirrors can key on it positionally
+        columns = ["id"] + [c for c in columns if c != "id"]
+        rows: List[list] = []
+        chunk = 500
+        for i in range(0, len(ids), chunk):
+            part = ids[i:i + chunk]
+            cur = conn.execute(
+                f"SELECT {', '.join(columns)} FROM {table} WHERE id IN ({','.join('?' * len(part))})",
+                part,
+            )
+            rows.extend(list(r) for r in cur)
+        return rows, columns
+
+    def batches(self, since: int, limit: int = DEFAULT_BATCH_CHANGES) -> Iterator[bytes]:
+        """Successive batches from `since` until the log is exhausted."""
+        while True:
+            batch = self._build(since, limit)
+            if batch is None:
+                return
+            since = batch["upto"]
+            yield compress_batch(batch)
+
+    def acknowledge(self, seq: int) -> None:
+        """Record that the central database has applied this branch's changes up to `seq`.
+
+        Maintenance prunes `change_log` up to the lowest acknowledged seq.
+        """
+        with self.db.connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO replication_marks (branch, acked_seq) VALUES (?, ?)
+                ON CONFLICT (branch) DO UPDATE
+                SET acked_seq = MAX(acked_seq, excluded.acked_seq), acked_at = datetime('now')
+                """,
+                (self.branch, int(seq)),
+            )
+
+    def prune(self, upto: int) -> int:
+        """Delete log entries the central database has acknowledged."""
+        with self.db.connect() as conn:
+            return conn.execute("DELETE FROM change_log WHERE seq <= ?", (int(upto),)).rowcount
+
+
+def compress_batch(batch: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(batch, separators=(",", ":"), default=str).encode("utf-8"), 6)
+
+
+def read_batch(data: bytes) -> Dict[str, Any]:
+    batch = json.loads(zlib.decompress(data))
+    if batch.get("format") != BATCH_FORMAT:
+        raise ValueError(f"Unsupported batch format: {batch.get('format')!r}")
+    return batch
+
+
+class CentralStore:
+    """Central side: per-branch mirrors of the replicated tables."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path))
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sync_branches (
+                branch TEXT PRIMARY KEY,
+                last_seq INTEGER NOT NULL DEFAULT 0,
+                synced_at TEXT
+            )
+            """
+        )
+        return conn
+
+    def last_seq(self, branch: str) -> int:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT last_seq FROM sync_branches WHERE branch = ?", (branch,)).fetchone()
+            return int(row[0]) if row else 0
+        finally:
+            conn.close()
+
+    def status(self) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            cur = conn.execute("SELECT branch, last_seq, synced_at FROM sync_branches ORDER BY branch")
+            cols = [c[0] for c in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+        finally:
+            conn.close()
+
+    def apply_batch(self, data: bytes) -> Dict[str, Any]:
+        """Apply one batch in one transaction; returns counts (or skipped=True).
+
+        Raises:
+            ValueError: If the batch starts after this branch's last applied
+                sequence (an earlier batch is missing).
+        """
+        batch = read_batch(data)
+        branch, since, upto = batch["branch"], int(batch["since"]), int(batch["upto"])
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT last_seq FROM sync_branches WHERE branch = ?", (branch,)).fetchone()
+            last = int(row[0]) if row else 0
+            if upto <= last:
+                conn.rollback()
+                return {"branch": branch, "since": since, "upto": upto, "skipped": True}
+            if since > last:
+                raise ValueError(f"Batch for {branch} starts after seq {since}, central has {last}; export from {last}")
+            upserted = deleted = 0
+            for table, part in batch["tables"].items():
+                if table not in CDC_TABLES:
+                    continue
+                mirror = self._ensure_mirror(conn, table, part["columns"])
+                cols = part["columns"]
+                if part["rows"]:
+                    assignments = ", ".join(f"{c} = excluded.{c}" for c in cols if c != "id")
+                    conn.executemany(
+                        f"INSERT INTO {mirror} (branch, {', '.join(cols)}) VALUES (?, {', '.join('?' * len(cols))}) "
+                        f"ON CONFLICT (branch, id) DO UPDATE SET {assignments}",
+                        ([branch] + r for r in part["rows"]),
+                    )
+                    upserted += len(part["rows"])
+                if part["deleted"]:
+                    conn.executemany(
+                        f"DELETE FROM {mirror} WHERE branch = ? AND id = ?",
+                        ((branch, i) for i in part["deleted"]),
+                    )
+                    deleted += len(part["deleted"])
+            conn.execute(
+                """
+                INSERT INTO sync_branches (branch, last_seq, synced_at) VALUES (?, ?, datetime('now'))
+                ON CONFLICT (branch) DO UPDATE SET last_seq = excluded.last_seq, synced_at = excluded.synced_at
+                """,
+                (branch, upto),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        logger.info("Applied %s changes %d..%d: %d upserted, %d deleted", branch, since + 1, upto, upserted, deleted)
+        return {"branch": branch, "since": since, "upto": upto, "changes": batch["changes"], "upserted": upserted, "deleted": deleted}
+
+    @staticmethod
+    def _ensure_mirror(conn: sqlite3.Connection, table: str, columns: List[str]) -> str:
+        """Create `branch_<table>` or add columns the branch has gained since."""
+        mirror = f"branch_{table}"
+        existing = {r[1] for r in conn.execute(f"PRAGMA table_info({mirror})")}
+        if not existing:
+            others = ", ".join(c for c in columns if c != "id")
+            conn.execute(
+                f"CREATE TABLE {mirror} (branch TEXT NOT NULL, id INTEGER NOT NULL, {others}, PRIMARY KEY (branch, id)) WITHOUT ROWID"
+            )
+        else:
+            for c in columns:
+                if c not in existing:
+                    conn.execute(f"ALTER TABLE {mirror} ADD COLUMN {c}")
+        return mirror
@@ -0,0 +1,230 @@
+from __future__ import annotations
+import calendar
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Optional, List, Dict, Any
+
+from .archive import TransactionArchive
+from .database_manager import DatabaseManager
+
+
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+EPOCH_DATE = date(1970, 1, 1)
+
+
+def to_timestamp(value: str | date | datetime) -> str:
+    """Normalize a date/datetime/string to the `datetime('now')` text format."""
+    if isinstance(value, datetime):
+        return value.strftime(TS_FORMAT)
+    if isinstance(value, date):
+        # A bare date means "end of that day"
+        return f"{value.isoformat()} 23:59:59"
+    text = str(value).strip()
+    if len(text) == 10:
+        return f"{text} 23:59:59"
+    return text
+
+
+def to_epoch(value: str | date | datetime) -> int:
+    """Epoch seconds of a timestamp read as UTC, like the `*_ts` columns."""
+    return calendar.timegm(datetime.strptime(to_timestamp(value), TS_FORMAT).timetuple())
+
+
+def epoch_day(value: str | date | datetime) -> int:
+    """UTC day number (`created_day`) of a date or timestamp."""
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return (value - EPOCH_DATE).days
+    return to_epoch(value) // 86400
+
+
+def day_to_date(day: int) -> date:
+    return EPOCH_DATE + timedelta(days=int(day))
+
+
+def period_end(day: date, period: str = "day") -> str:
+    """Return the inclusive cutoff timestamp of the period containing `day`.
+
+    Weeks end on Sunday.
+    """
+    if period == "week":
+        day = day + timedelta(days=6 - day.weekday())
+    elif period != "day":
+        raise ValueError(f"Unknown snapshot period: {period}")
+    return to_timestamp(day)
+
+
+class StockHistoryRepository:
+    """Point-in-time stock queries backed by periodic snapshots.
+
+    A snapshot stores each item's stock at the end of a day or week. Historical
+    queries start from the nearest snapshot and replay only the `stock_ledger`
+    entries between it and the requested time. Ledger reads reaching back
+    into archived years go through `TransactionArchive.spanning`.
+    """
+
+    def __init__(self, db: DatabaseManager, archive: Optional[TransactionArchive] = None):
+        self.db = db
+        self.archive = archive if archive is not None else TransactionArchive(db)
+
+    @contextmanager
+    def _ledger(self, since: str):
+        """(connection, ledger view) covering every entry after `since`."""
+        if self.archive.covers(since):
+            with self.archive.spanning(since) as conn:
+                yield conn, "all_stock_ledger"
+        else:
+            with self.db.connect() as conn:
+                yield conn, "stock_ledger"
+
+    def take_snapshot(self, as_of: str | date | datetime | None = None, period: str = "day") -> int:
+        """Record the stock of every item as of the given cutoff.
+
+        The snapshot is derived from `items.current_stock` minus the ledger
+        entries after the cutoff, so running it right after a period closes
+        only touches that period's movements. Re-running replaces the rows.
+
+        Returns:
+            Number of snapshot rows written.
+        """
+        if as_of is None:
+            as_of = period_end(date.today() - timedelta(days=1), period)
+        elif isinstance(as_of, date) and not isinstance(as_of, datetime):
+            as_of = period_end(as_of, period)
+        cutoff = to_timestamp(as_of)
+        with self._ledger(cutoff) as (conn, ledger):
+            cur = conn.execute(
+                f"""
+                INSERT OR REPLACE INTO stock_snapshots (item_id, as_of, period, stock)
+                SELECT i.id, :cutoff, :period, i.current_stock - COALESCE(d.delta, 0)
+                FROM items i
+                LEFT JOIN (
+                    SELECT item_id, SUM(delta) AS delta
+                    FROM {ledger}
+                    WHERE created_at > :cutoff
+                    GROUP BY item_id
+                ) d ON d.item_id = i.id
+                WHERE i.created_at <= :cutoff
+                """,
+                {"cutoff": cutoff, "period": period},
+            )
+            return cur.rowcount
+
+    def latest_snapshot(self, at: str | date | datetime | None = None) -> Optional[str]:
+        """Return the `as_of` of the most recent snapshot at or before `at`."""
+        with self.db.connect() as conn:
+            if at is None:
+                row = conn.execute("SELECT MAX(as_of) FROM stock_snapshots").fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT MAX(as_of) FROM stock_snapshots WHERE as_of <= ?",
+                    (to_timestamp(at),),
+                ).fetchone()
+            return row[0] if row else None
+
+    def prune_snapshots(self, keep_daily_days: int = 62) -> int:
+        """Delete daily snapshots older than `keep_daily_days`; weekly ones are kept."""
+        cutoff = to_timestamp(date.today() - timedelta(days=keep_daily_days))
+        with self.db.transaction() as conn:
+            cur = conn.execute(
+                "DELETE FROM stock_snapshots WHERE period='day' AND as_of < ?",
+                (cutoff,),
+            )
+            return cur.rowcount
+
+    def stock_at(self, item_id: int, at: str | date | datetime) -> Optional[int]:
+        """Return the stock of one item at the given time, or None if unknown item.
+
+        Uses the nearest snapshot at or before `at` and adds later entries; if
+        none exists, the nearest later snapshot (or the live stock) is used and
+        the intervening entries are subtracted.
+        """
+        ts = to_timestamp(at)
+        with self._ledger(min(ts, self.latest_snapshot(ts) or ts)) as (conn, ledger):
+            row = conn.execute(
+                "SELECT as_of, stock FROM stock_snapshots WHERE item_id=? AND as_of<=? ORDER BY as_of DESC LIMIT 1",
+                (item_id, ts),
+            ).fetchone()
+            if row:
+                base_ts, base_stock = row
+                delta = conn.execute(
+                    f"SELECT COALESCE(SUM(delta), 0) FROM {ledger} WHERE item_id=? AND created_at>? AND created_at<=?",
+                    (item_id, base_ts, ts),
+                ).fetchone()[0]
+                return int(base_stock) + int(delta)
+
+            row = conn.execute(
+                "SELECT as_of, stock FROM stock_snapshots WHERE item_id=? AND as_of>? ORDER BY as_of ASC LIMIT 1",
+                (item_id, ts),
+            ).fetchone()
+            if row:
+                base_ts, base_stock = row
+                delta = conn.execute(
+                    f"SELECT COALESCE(SUM(delta), 0) FROM {ledger} WHERE item_id=? AND created_at>? AND created_at<=?",
+                    (item_id, ts, base_ts),
+                ).fetchone()[0]
+                return int(base_stock) - int(delta)
+
+            row = conn.execute("SELECT current_stock FROM items WHERE id=?", (item_id,)).fetchone()
+            if row is None:
+                return None
+            delta = conn.execute(
+                f"SELECT COALESCE(SUM(delta), 0) FROM {ledger} WHERE item_id=? AND created_at>?",
+                (item_id, ts),
+            ).fetchone()[0]
+            return int(row[0] or 0) - int(delta)
+
+    def stock_levels_at(self, at: str | date | datetime) -> List[Dict[str, Any]]:
+        """Return stock for all items existing at `at` (e.g. month-end valuation).
+
+        Replays only the ledger entries between the latest snapshot and `at`.
+        Items created after that snapshot fall back to their live stock.
+        """
+        ts = to_timestamp(at)
+        base = self.latest_snapshot(ts)
+        with self._ledger(base or ts) as (conn, ledger):
+            if base is None:
+                cur = conn.execute(
+                    f"""
+                    SELECT i.id, i.code, i.name, i.unit, i.current_stock - COALESCE(d.delta, 0) AS stock
+                    FROM items i
+                    LEFT JOIN (
+                        SELECT item_id, SUM(delta) AS delta
+                        FROM {ledger}
+                        WHERE created_at > :at
+                        GROUP BY item_id
+                    ) d ON d.item_id = i.id
+                    WHERE i.created_at <= :at
+                    ORDER BY i.name ASC
+                    """,
+                    {"at": ts},
+                )
+            else:
+                cur = conn.execute(
+                    f"""
+                    SELECT i.id, i.code, i.name, i.unit,
+                           CASE WHEN s.item_id IS NOT NULL
+                                THEN s.stock + COALESCE(fwd.delta, 0)
+                                ELSE i.current_stock - COALESCE(bwd.delta, 0)
+                           END AS stock
+                    FROM items i
+                    LEFT JOIN stock_snapshots s ON s.item_id = i.id AND s.as_of = :base
+                    LEFT JOIN (
+                        SELECT item_id, SUM(delta) AS delta
+                        FROM {ledger}
+                        WHERE created_at > :base AND created_at <= :at
+                        GROUP BY item_id
+                    ) fwd ON fwd.item_id = i.id
+                    LEFT JOIN (
+                        SELECT item_id, SUM(delta) AS delta
+                        FROM {ledger}
+                        WHERE created_at > :at
+                          AND item_id IN (SELECT id FROM items WHERE created_at > :base)
+                        GROUP BY item_id
+                    ) bwd ON bwd.item_id = i.id
+                    WHERE i.created_at <= :at
+                    ORDER BY i.name ASC
+                    """,
+                    {"base": base, "at": ts},
+                )
+            cols = [d[0] for d in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
@@ -0,0 +1,190 @@
+from __future__ import annotations
+import csv
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .database_manager import DatabaseManager
+from .items_repository import resolve_item_keys
+from .receiving import whole_number
+
+logger = logging.getLogger(__name__)
+
+CountLine = Union[Tuple[str, int], Dict[str, Any]]
+
+# Accepted column names in counted-quantity files (case-insensitive)
+KEY_COLUMNS = ("code", "barcode", "item", "name")
+COUNT_COLUMNS = ("counted", "count", "qty", "quantity", "stock")
+
+
+def read_counts_file(path: str | Path) -> List[Tuple[str, int]]:
+    """Read (key, counted) pairs from a CSV with an item key and a count column.
+
+    The key column is the first of Code/Barcode/Item/Name present; the count
+    column the first of Counted/Count/Qty/Quantity/Stock. Blank keys are skipped.
+
+    Raises:
+        ValueError: If either column is missing or a count is blank or not a whole number.
+    """
+    with Path(path).open(newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        cols = {c.strip().lower(): c for c in (reader.fieldnames or [])}
+        key_col = next((cols[c] for c in KEY_COLUMNS if c in cols), None)
+        count_col = next((cols[c] for c in COUNT_COLUMNS if c in cols), None)
+        if key_col is None or count_col is None:
+            raise ValueError(f"Counts file needs one of {KEY_COLUMNS} and one of {COUNT_COLUMNS}")
+        out = []
+        for n, row in enumerate(reader, start=2):
+            key = (row.get(key_col) or "").strip()
+            if not key:
+                continue
+            try:
+                # A blank cell is an uncounted item, not a count of 0
+                out.append((key, whole_number(row.get(count_col))))
+            except ValueError:
+                raise ValueError(f"Line {n}: invalid count {row.get(count_col)!r} for {key!r}")
+        return out
+
+
+class StocktakeRepository:
+    """Apply physical stocktake counts as `stock_adjustments` in bulk.
+
+    Counts are loaded into a temp table, resolved to items by code, barcode
+    or name, and turned into adjustments with set-based SQL, so thousands of
+    lines commit in a single transaction.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def apply_file(self, path: str | Path, reason: str = "Stocktake", dry_run: bool = False) -> Dict[str, Any]:
+        return self.apply_counts(read_counts_file(path), reason=reason, dry_run=dry_run)
+
+    def apply_counts(
+        self,
+        counts: Iterable[CountLine],
+        reason: str = "Stocktake",
+        dry_run: bool = False,
+        top: int = 20,
+    ) -> Dict[str, Any]:
+        """Adjust stock to the counted quantities and return a variance summary.
+
+        Args:
+            counts: (key, counted) tuples or dicts with "key"/"counted"
+                (or "code"/"barcode"/"name" and "counted"). Several lines for
+                the same item (e.g. counted in two locations) are summed.
+            reason: Stored in `stock_adjustments.reason`.
+            dry_run: Compute the summary but roll back all writes.
+            top: Number of largest variances to list.
+        """
+        rows = [self._normalize(line, n) for n, line in enumerate(counts, start=1)]
+        with self.db.transaction(immediate=True) as conn:
+            conn.execute("DROP TABLE IF EXISTS temp.stocktake_counts")
+            conn.execute("DROP TABLE IF EXISTS temp.stocktake_delta")
+            conn.execute(
+                "CREATE TEMP TABLE stocktake_counts (line INTEGER PRIMARY KEY, key TEXT NOT NULL, counted INTEGER NOT NULL, item_id INTEGER)"
+            )
+            conn.executemany("INSERT INTO temp.stocktake_counts (key, counted) VALUES (?, ?)", rows)
+            resolve_item_keys(conn, "temp.stocktake_counts")
+            unresolved = [
+                {"line": r[0], "key": r[1], "counted": r[2]}
+                for r in conn.execute(
+                    "SELECT line, key, counted FROM temp.stocktake_counts WHERE item_id IS NULL ORDER BY line"
+                )
+            ]
+            conn.execute(
+                "CREATE TEMP TABLE stocktake_delta (item_id INTEGER PRIMARY KEY, old_stock INTEGER NOT NULL, new_stock INTEGER NOT NULL)"
+            )
+            conn.execute(
+                """
+                INSERT INTO temp.stocktake_delta (item_id, old_stock, new_stock)
+                SELECT i.id, i.current_stock, c.counted
+                FROM (
+                    SELECT item_id, SUM(counted) AS counted
+                    FROM temp.stocktake_counts
+                    WHERE item_id IS NOT NULL
+                    GROUP BY item_id
+                ) c
+                JOIN items i ON i.id = c.item_id
+                """
+            )
+            conn.execute(
+                """
+                INSERT INTO stock_adjustments (item_id, old_stock, new_stock, adjustment, reason)
+                SELECT item_id, old_stock, new_stock, new_stock - old_stock, ?
+                FROM temp.stocktake_delta
+                WHERE new_stock != old_stock
+                """,
+                (reason,),
+            )
+            adjusted = conn.execute("SELECT changes()").fetchone()[0]
+            conn.execute(
+                """
+                UPDATE items
+                SET current_stock = (SELECT new_stock FROM temp.stocktake_delta d WHERE d.item_id = items.id),
+                    updated_at = datetime('now')
+                WHERE id IN (SELECT item_id FROM temp.stocktake_delta WHERE new_stock != old_stock)
+                """
+            )
+            summary = self._summary(conn, len(rows), unresolved, adjusted, top)
+            if dry_run:
+                conn.rollback()
+        logger.info(
+            "Stocktake %s: %d lines, %d items counted, %d adjusted, %d unresolved, net %+d",
+            "dry-run" if dry_run else "applied", summary["lines"], summary["items_counted"],
+            summary["items_adjusted"], len(unresolved), summary["net_variance"],
+        )
+        summary["dry_run"] = dry_run
+        return summary
+
+    @staticmethod
+    def _normalize(line: CountLine, n: int) -> Tuple[str, int]:
+        if isinstance(line, dict):
+            key: Optional[Any] = line.get("key")
+            for col in KEY_COLUMNS:
+                if key is None:
+                    key = line.get(col)
+            counted = line.get("counted", line.get("qty"))
+        else:
+            key, counted = line
+        if key is None or str(key).strip() == "":
+            raise ValueError(f"Line {n}: count line without item key: {line!r}")
+        key = str(key).strip()
+        try:
+            return key, whole_number(counted)
+        except ValueError:
+            raise ValueError(f"Line {n}: invalid count {counted!r} for {key!r}")
+
+    @staticmethod
+    def _summary(conn, lines: int, unresolved: list, adjusted: int, top: int) -> Dict[str, Any]:
+        row = conn.execute(
+            """
+            SELECT COUNT(*),
+                   COALESCE(SUM(CASE WHEN new_stock > old_stock THEN new_stock - old_stock ELSE 0 END), 0),
+                   COALESCE(SUM(CASE WHEN new_stock < old_stock THEN new_stock - old_stock ELSE 0 END), 0)
+            FROM temp.stocktake_delta
+            """
+        ).fetchone()
+        cur = conn.execute(
+            """
+            SELECT d.item_id, i.name, i.unit, d.old_stock, d.new_stock, d.new_stock - d.old_stock AS variance
+            FROM temp.stocktake_delta d
+            JOIN items i ON i.id = d.item_id
+            WHERE d.new_stock != d.old_stock
+            ORDER BY ABS(d.new_stock - d.old_stock) DESC, i.name ASC
+            LIMIT ?
+            """,
+            (top,),
+        )
+        cols = [c[0] for c in cur.description]
+        return {
+            "lines": lines,
+            "items_counted": int(row[0]),
+            "items_adjusted": int(adjusted),
+            "items_unchanged": int(row[0]) - int(adjusted),
+            "variance_gain": int(row[1]),
+            "variance_loss": int(row[2]),
+            "net_variance": int(row[1]) + int(row[2]),
+            "largest_variances": [dict(zip(cols, r)) for r in cur.fetchall()],
+            "unresolved": unresolved,
+        }
@@ -0,0 +1,389 @@
+"""Edit or void transactions that are already recorded.
+
+Every line stores the item's stock before and after it (`stock_before` /
+`stock_after`). Adjustments store `old_stock` / `new_stock`, and snapshots
+store the stock at a cutoff. Changing a past quantity by q changes all of
+those values after it, for that item only, by the same net delta
+(-q for OUT, +q for IN/ADJUST). So an edit never replays history:
+
+- per item, the net stock delta is computed once in `temp.edit_delta`;
+- one UPDATE per table shifts the later lines, adjustments and snapshots
+  of just the touched items (`item_id IN temp.edit_delta`, so the planner
+  walks the per-item indexes, e.g. `idx_trx_items_item_day`). The cost
+  follows the touched items' entries after the edited transaction, not
+  the size of the history;
+- `items.current_stock` moves by the delta;
+- the expected stock of the last reconciliation moves too, for lines
+  it had already counted, so the next incremental run stays exact.
+
+"Later" is ledger order: lines of later transactions by (`created_ts`,
+transaction id). Adjustments count as later from the edited transaction's
+second on, and snapshots do when their `as_of` is at or after it. Shifting
+rather than recomputing the chain keeps any gap (stock set directly,
+without a ledger entry) where it was.
+
+Each changed item is recorded in `transaction_edits`. A void removes every
+line and sets `transactions.voided_at`. Archived transactions cannot be
+edited.
+"""
+from __future__ import annotations
+import logging
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .database_manager import DatabaseManager
+from .items_repository import resolve_item_keys
+from .receiving import DeliveryLine, normalize_line
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionEditRepository:
+    """Change the lines of a recorded transaction with delta-only stock updates."""
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def get(self, transaction_id: int) -> Optional[Dict[str, Any]]:
+        """The transaction with its lines (item name/unit, qty, stock before/after), or None."""
+        with self.db.connect() as conn:
+            cur = conn.execute(
+                "SELECT id, transaction_number, person_name, transaction_type, notes, created_at, voided_at "
+                "FROM transactions WHERE id = ?",
+                (int(transaction_id),),
+            )
+            row = cur.fetchone()
+            if row is None:
+                return None
+            trx = dict(zip([d[0] for d in cur.description], row))
+            cur = conn.execute(
+                """
+                SELECT ti.id, ti.item_id, i.code, i.name, i.unit, ti.quantity AS qty, ti.stock_before, ti.stock_after
+                FROM transaction_items ti JOIN items i ON i.id = ti.item_id
+                WHERE ti.transaction_id = ?
+                ORDER BY ti.id
+                """,
+                (int(transaction_id),),
+            )
+            cols = [d[0] for d in cur.description]
+            trx["items"] = [dict(zip(cols, r)) for r in cur.fetchall()]
+            trx["edits"] = [
+                dict(zip(("item_id", "old_quantity", "new_quantity", "person_name", "reason", "created_at"), r))
+                for r in conn.execute(
+                    "SELECT item_id, old_quantity, new_quantity, person_name, reason, created_at "
+                    "FROM transaction_edits WHERE transaction_id = ? ORDER BY id",
+                    (int(transaction_id),),
+                )
+            ]
+            return trx
+
+    def edit(
+        self,
+        transaction_id: int,
+        lines: Iterable[DeliveryLine],
+        person_name: str,
+        reason: str | None = None,
+        allow_negative: bool = False,
+    ) -> Dict[str, Any]:
+        """Replace the transaction's lines with `lines` in one database transaction.
+
+        Items missing from `lines` are removed from the transaction; a key
+        listed twice counts once with the summed quantity.
+
+        Args:
+            lines: (key, qty) tuples or dicts, as for checkout and receiving.
+            person_name: Who made the change (stored in `transaction_edits`).
+            reason: Stored with each changed item.
+            allow_negative: Apply even if an item's current stock would drop below zero.
+
+        Returns:
+            {"transaction_id", "transaction_number", "voided",
+             "items": [{item_id, name, old_qty, new_qty, stock_delta, current_stock}],
+             "lines_shifted", "adjustments_shifted", "snapshots_shifted"}
+
+        Raises:
+            ValueError: If person_name is empty, `lines` is empty (use `void`),
+                a key does not resolve, the transaction is unknown, archived or
+                voided, or stock would go negative and allow_negative is False.
+        """
+        rows = [normalize_line(line) for line in lines]
+        if not rows:
+            raise ValueError("An edit needs at least one line; use void to cancel the transaction")
+        with self.db.transaction(immediate=True) as conn:
+            return self.write(conn, transaction_id, rows, person_name, reason, allow_negative=allow_negative)
+
+    def void(self, transaction_id: int, person_name: str, reason: str | None = None) -> Dict[str, Any]:
+        """Cancel the transaction: remove its lines, reverse their stock and set `voided_at`."""
+        with self.db.transaction(immediate=True) as conn:
+            return self.write(conn, transaction_id, [], person_name, reason, allow_negative=True, void=True)
+
+    def write(
+        self,
+        conn: sqlite3.Connection,
+        transaction_id: int,
+        rows: List[Tuple[str, int]],
+        person_name: str,
+        reason: str | None = None,
+        allow_negative: bool = False,
+        void: bool = False,
+    ) -> Dict[str, Any]:
+        """Apply normalized (key, qty) rows as the transaction's new lines on an open write transaction."""
+        person_name = (person_name or "").strip()
+        if not person_name:
+            raise ValueError("Person name is required")
+        trx = conn.execute(
+            "SELECT id, transaction_number, transaction_type, created_at, created_ts, created_day, voided_at "
+            "FROM transactions WHERE id = ?",
+            (int(transaction_id),),
+        ).fetchone()
+        if trx is None:
+            raise ValueError(f"Transaction {transaction_id} not found (archived transactions cannot be edited)")
+        trx_id, number, kind, created_at, created_ts, created_day, voided_at = trx
+        if voided_at is not None:
+            raise ValueError(f"Transaction {number} was voided at {voided_at}")
+        sign = -1 if kind == "OUT" else 1
+
+        self._load_delta(conn, trx_id, rows, sign)
+        changed = conn.execute("SELECT COUNT(*) FROM temp.edit_delta").fetchone()[0]
+        result: Dict[str, Any] = {
+            "transaction_id": trx_id,
+            "transaction_number": number,
+            "voided": void,
+            "items": [],
+            "lines_shifted": 0,
+            "adjustments_shifted": 0,
+            "snapshots_shifted": 0,
+        }
+        if not changed and not void:
+            return result
+        if not allow_negative:
+            short = conn.execute(
+                """
+                SELECT i.name, i.current_stock, d.delta
+                FROM temp.edit_delta d JOIN items i ON i.id = d.item_id
+                WHERE i.current_stock + d.delta < 0
+                ORDER BY d.first_line
+                """
+            ).fetchall()
+            if short:
+                detail = ", ".join(f"{name} (stock {stock}, change {delta})" for name, stock, delta in short[:10])
+                raise ValueError(f"Insufficient stock: {detail}")
+
+        counted = self._counted_line_id(conn)
+        processed_before = self._processed_effect(conn, trx_id, sign, counted)
+        # Stock at the transaction for items it did not contain yet, read
+        # before anything after it is shifted
+        opening = self._stock_at_transaction(conn, trx_id, created_at, created_ts, created_day)
+
+        params = {"trx": trx_id, "ts": created_ts, "day": created_day, "at": created_at}
+        result["lines_shifted"] = conn.execute(
+            """
+            UPDATE transaction_items
+            SET (stock_before, stock_after) = (
+                SELECT stock_before + d.delta, stock_after + d.delta
+                FROM temp.edit_delta d WHERE d.item_id = transaction_items.item_id
+            )
+            WHERE item_id IN (SELECT item_id FROM temp.edit_delta WHERE delta != 0)
+              AND created_day >= :day
+              AND (created_ts > :ts OR (created_ts = :ts AND transaction_id > :trx))
+            """,
+            params,
+        ).rowcount
+        result["adjustments_shifted"] = conn.execute(
+            """
+            UPDATE stock_adjustments
+            SET (old_stock, new_stock) = (
+                SELECT old_stock + d.delta, new_stock + d.delta
+                FROM temp.edit_delta d WHERE d.item_id = stock_adjustments.item_id
+            )
+            WHERE item_id IN (SELECT item_id FROM temp.edit_delta WHERE delta != 0) AND created_at >= :at
+            """,
+            params,
+        ).rowcount
+        result["snapshots_shifted"] = conn.execute(
+            """
+            UPDATE stock_snapshots
+            SET stock = stock + (SELECT delta FROM temp.edit_delta d WHERE d.item_id = stock_snapshots.item_id)
+            WHERE item_id IN (SELECT item_id FROM temp.edit_delta WHERE delta != 0) AND as_of >= :at
+            """,
+            params,
+        ).rowcount
+
+        self._rewrite_lines(conn, trx_id, sign, opening)
+        if counted is not None:
+            processed_after = self._processed_effect(conn, trx_id, sign, counted)
+            moved = {
+                item_id: processed_after.get(item_id, 0) - processed_before.get(item_id, 0)
+                for item_id in processed_before.keys() | processed_after.keys()
+            }
+            conn.executemany(
+                "UPDATE stock_reconciliation SET expected_stock = expected_stock + ? WHERE item_id = ?",
+                [(diff, item_id) for item_id, diff in moved.items() if diff],
+            )
+        conn.execute(
+            """
+            UPDATE items
+            SET current_stock = current_stock + (SELECT delta FROM temp.edit_delta d WHERE d.item_id = items.id),
+                updated_at = datetime('now')
+            WHERE id IN (SELECT item_id FROM temp.edit_delta WHERE delta != 0)
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO transaction_edits
+                (transaction_id, transaction_number, item_id, old_quantity, new_quantity, stock_delta, person_name, reason)
+            SELECT ?, ?, item_id, old_qty, new_qty, delta, ?, ? FROM temp.edit_delta ORDER BY first_line
+            """,
+            (trx_id, number, person_name, reason),
+        )
+        if void:
+            conn.execute("UPDATE transactions SET voided_at = datetime('now') WHERE id = ?", (trx_id,))
+        cur = conn.execute(
+            """
+            SELECT d.item_id, i.name, d.old_qty, d.new_qty, d.delta AS stock_delta, i.current_stock
+            FROM temp.edit_delta d JOIN items i ON i.id = d.item_id
+            ORDER BY d.first_line
+            """
+        )
+        cols = [c[0] for c in cur.description]
+        result["items"] = [dict(zip(cols, r)) for r in cur.fetchall()]
+        logger.info(
+            "%s %s by %s: %d items changed, %d later lines, %d adjustments and %d snapshots shifted",
+            "Voided" if void else "Edited", number, person_name, len(result["items"]),
+            result["lines_shifted"], result["adjustments_shifted"], result["snapshots_shifted"],
+        )
+        return result
+
+    @staticmethod
+    def _load_delta(conn: sqlite3.Connection, trx_id: int, rows: List[Tuple[str, int]], sign: int) -> None:
+        """Fill `temp.edit_delta` with the items whose quantity changes, and their stock delta."""
+        # Kept per connection like checkout's temp tables; emptied per edit
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS edit_lines (line INTEGER PRIMARY KEY, key TEXT NOT NULL, qty INTEGER NOT NULL, item_id INTEGER)"
+        )
+        conn.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS edit_delta (
+                item_id INTEGER PRIMARY KEY, old_qty INTEGER NOT NULL, new_qty INTEGER NOT NULL,
+                old_lines INTEGER NOT NULL, delta INTEGER NOT NULL, first_line INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute("DELETE FROM temp.edit_lines")
+        conn.execute("DELETE FROM temp.edit_delta")
+        conn.executemany("INSERT INTO temp.edit_lines (key, qty) VALUES (?, ?)", rows)
+        resolve_item_keys(conn, "temp.edit_lines")
+        unresolved = [r[0] for r in conn.execute("SELECT key FROM temp.edit_lines WHERE item_id IS NULL ORDER BY line")]
+        if unresolved:
+            raise ValueError(f"Unknown item(s): {', '.join(unresolved[:10])}")
+        # Existing lines sort first (by line id), then new items in list order.
+        # Items recorded on several lines (older data) are merged into one.
+        conn.execute(
+            """
+            INSERT INTO temp.edit_delta (item_id, old_qty, new_qty, old_lines, delta, first_line)
+            SELECT item_id, SUM(old_qty), SUM(new_qty), SUM(old_line), :sign * (SUM(new_qty) - SUM(old_qty)), MIN(pos)
+            FROM (
+                SELECT item_id, quantity AS old_qty, 0 AS new_qty, 1 AS old_line, id - :big AS pos
+                FROM transaction_items WHERE transaction_id = :trx
+                UNION ALL
+                SELECT item_id, 0, qty, 0, line FROM temp.edit_lines
+            )
+            GROUP BY item_id
+            HAVING SUM(new_qty) != SUM(old_qty) OR SUM(old_line) > 1
+            """,
+            {"trx": trx_id, "sign": sign, "big": 1 << 62},
+        )
+
+    @staticmethod
+    def _counted_line_id(conn: sqlite3.Connection) -> Optional[int]:
+        """Last line id the latest reconciliation counted (None: no run yet, the next one is full)."""
+        row = conn.execute("SELECT last_trx_item_id FROM reconciliation_checkpoints ORDER BY id DESC LIMIT 1").fetchone()
+        return int(row[0]) if row else None
+
+    @staticmethod
+    def _processed_effect(conn: sqlite3.Connection, trx_id: int, sign: int, counted: Optional[int]) -> Dict[int, int]:
+        """{item: stock effect} of the transaction's lines for changed items that reconciliation has counted."""
+        if counted is None:
+            return {}
+        return {
+            int(item_id): sign * int(qty)
+            for item_id, qty in conn.execute(
+                """
+                SELECT ti.item_id, SUM(ti.quantity)
+                FROM transaction_items ti JOIN temp.edit_delta d ON d.item_id = ti.item_id
+                WHERE ti.transaction_id = ? AND ti.id <= ?
+                GROUP BY ti.item_id
+                """,
+                (trx_id, counted),
+            )
+        }
+
+    @staticmethod
+    def _stock_at_transaction(conn: sqlite3.Connection, trx_id: int, created_at: str, created_ts: int, created_day: int) -> Dict[int, int]:
+        """{item: stock at the transaction} for changed items without a line in it.
+
+        That is the recorded "before" of the item's next ledger entry, or its
+        current stock if nothing came later.
+        """
+        opening = {}
+        for (item_id,) in conn.execute("SELECT item_id FROM temp.edit_delta WHERE old_lines = 0").fetchall():
+            line = conn.execute(
+                """
+                SELECT created_ts, stock_before FROM transaction_items
+                WHERE item_id = ? AND created_day >= ?
+                  AND (created_ts > ? OR (created_ts = ? AND transaction_id > ?))
+                ORDER BY created_ts, transaction_id, id
+                LIMIT 1
+                """,
+                (item_id, created_day, created_ts, created_ts, trx_id),
+            ).fetchone()
+            adjustment = conn.execute(
+                """
+                SELECT CAST(strftime('%s', created_at) AS INTEGER), old_stock FROM stock_adjustments
+                WHERE item_id = ? AND created_at >= ?
+                ORDER BY created_at, id
+                LIMIT 1
+                """,
+                (item_id, created_at),
+            ).fetchone()
+            # On the same second the ledger puts lines before adjustments
+            nearest = min((e for e in (line, adjustment) if e is not None), key=lambda e: e[0], default=None)
+            if nearest is None:
+                nearest = (None, conn.execute("SELECT current_stock FROM items WHERE id = ?", (item_id,)).fetchone()[0])
+            opening[int(item_id)] = int(nearest[1] or 0)
+        return opening
+
+    @staticmethod
+    def _rewrite_lines(conn: sqlite3.Connection, trx_id: int, sign: int, opening: Dict[int, int]) -> None:
+        """Give every changed item exactly one line with its new quantity (none if 0)."""
+        # Keep the first line of each changed item, drop the rest
+        conn.execute(
+            """
+            DELETE FROM transaction_items
+            WHERE transaction_id = :trx
+              AND item_id IN (SELECT item_id FROM temp.edit_delta)
+              AND (id > (SELECT MIN(id) FROM transaction_items f WHERE f.transaction_id = :trx AND f.item_id = transaction_items.item_id)
+                   OR item_id IN (SELECT item_id FROM temp.edit_delta WHERE new_qty = 0))
+            """,
+            {"trx": trx_id},
+        )
+        conn.execute(
+            """
+            UPDATE transaction_items
+            SET (quantity, stock_after) = (
+                SELECT d.new_qty, stock_before + :sign * d.new_qty
+                FROM temp.edit_delta d WHERE d.item_id = transaction_items.item_id
+            )
+            WHERE transaction_id = :trx AND item_id IN (SELECT item_id FROM temp.edit_delta)
+            """,
+            {"trx": trx_id, "sign": sign},
+        )
+        conn.executemany(
+            """
+            INSERT INTO transaction_items (transaction_id, item_id, quantity, stock_before, stock_after, created_ts, created_day)
+            SELECT t.id, d.item_id, d.new_qty, :before, :before + :sign * d.new_qty, t.created_ts, t.created_day
+            FROM temp.edit_delta d JOIN transactions t ON t.id = :trx
+            WHERE d.item_id = :item AND d.new_qty != 0
+            """,
+            [{"trx": trx_id, "item": item_id, "before": before, "sign": sign} for item_id, before in opening.items()],
+        )
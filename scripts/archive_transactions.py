@@ -0,0 +1,61 @@
+import sys
+import json
+import argparse
+from datetime import date
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.archive import TransactionArchive
+from models.database_manager import DatabaseManager
+from models.maintenance import DatabaseMaintenance
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move old transactions into per-year archive databases")
+    parser.add_argument('--db', dest='db_path', default=None, help='Path to SQLite DB (default: from config)')
+    parser.add_argument('--archive-dir', default=None, help='Directory for yearly archive files (default: <db dir>/archive)')
+    parser.add_argument('--before', default=None, help='Archive transactions before this date (YYYY-MM-DD)')
+    parser.add_argument('--keep-years', type=int, default=1,
+                        help='Without --before: keep the current year plus this many full years (default: 1)')
+    parser.add_argument('--vacuum', action='store_true', help='VACUUM afterwards so the DB file shrinks')
+    parser.add_argument('--list', action='store_true', help='Only list archived years')
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    db_path = Path(args.db_path or (ROOT / cfg.db_path))
+    if not db_path.exists():
+        print(f"DB not found: {db_path}")
+        sys.exit(1)
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    archive = TransactionArchive(db, args.archive_dir)
+
+    if args.list:
+        print(json.dumps(archive.years(), indent=2))
+        return
+    before = args.before or date(date.today().year - max(0, args.keep_years), 1, 1).isoformat()
+    size_before = db_path.stat().st_size
+    moved = archive.archive(before)
+    maintenance = None
+    if args.vacuum and moved:
+        db.execute("VACUUM")
+    if moved:
+        # Statistics of the shrunken tables are stale now
+        maintenance = DatabaseMaintenance(db).run("archive")
+    print(json.dumps({
+        "db": str(db_path),
+        "before": before,
+        "years": moved,
+        "db_bytes_before": size_before,
+        "db_bytes_after": db_path.stat().st_size,
+        "maintenance": maintenance,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
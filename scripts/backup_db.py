@@ -0,0 +1,88 @@
+import sys
+import json
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.backup import BackupManager
+
+
+def make_manager(args, cfg) -> BackupManager:
+    return BackupManager(
+        args.db_path or (ROOT / cfg.db_path),
+        args.dir or (ROOT / cfg.backup_dir),
+        keep=args.keep if args.keep is not None else cfg.backup_keep,
+        compress=cfg.backup_compress if args.compress is None else args.compress,
+        pages_per_step=cfg.backup_pages_per_step,
+    )
+
+
+def cmd_run(args, cfg):
+    print(json.dumps(make_manager(args, cfg).run(), indent=2))
+
+
+def cmd_list(args, cfg):
+    rows = [
+        {"file": str(p), "bytes": p.stat().st_size, "modified": datetime.fromtimestamp(p.stat().st_mtime).isoformat(timespec="seconds")}
+        for p in make_manager(args, cfg).backups()
+    ]
+    print(json.dumps(rows, indent=2))
+
+
+def cmd_verify(args, cfg):
+    manager = make_manager(args, cfg)
+    paths = [Path(p) for p in args.files] or manager.backups()
+    results = {str(p): manager.verify(p) for p in paths}
+    print(json.dumps(results, indent=2))
+    if any(r != "ok" for r in results.values()):
+        sys.exit(1)
+
+
+def cmd_restore(args, cfg):
+    manager = make_manager(args, cfg)
+    backups = manager.backups()
+    backup = Path(args.file) if args.file else (backups[0] if backups else None)
+    if backup is None:
+        print(f"No backups in {manager.backup_dir}")
+        sys.exit(1)
+    try:
+        target = manager.restore(backup, args.target)
+    except (RuntimeError, FileNotFoundError) as e:
+        print(e)
+        sys.exit(1)
+    print(json.dumps({"restored": str(backup), "into": str(target)}, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back up, verify and restore the SQLite database")
+    parser.add_argument('--db', dest='db_path', default=None, help='SQLite DB (default: from config)')
+    parser.add_argument('--dir', default=None, help='Backup directory (default: from config)')
+    parser.add_argument('--keep', type=int, default=None, help='Backups to keep (default: from config)')
+    parser.add_argument('--compress', dest='compress', action='store_true', default=None, help='Gzip the backup')
+    parser.add_argument('--no-compress', dest='compress', action='store_false', help='Store the backup uncompressed')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('run', help='Back up now, verify, and rotate old backups').set_defaults(func=cmd_run)
+    sub.add_parser('list', help='List backups, newest first').set_defaults(func=cmd_list)
+
+    p = sub.add_parser('verify', help='Run integrity_check on backups (default: all)')
+    p.add_argument('files', nargs='*', help='Backup files')
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser('restore', help='Verify a backup and copy it into the DB')
+    p.add_argument('file', nargs='?', default=None, help='Backup file (default: newest)')
+    p.add_argument('--target', default=None, help='Restore into this file instead of the live DB')
+    p.set_defaults(func=cmd_restore)
+
+    args = parser.parse_args()
+    args.func(args, ConfigManager())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from models.database_manager import DatabaseManager
+from models.items_repository import ItemsRepository
+from models.checkout import CheckoutRepository
+
+
+def main():
+    db_path = ROOT / 'db' / 'tmp_watcher.db'
+    if db_path.exists():
+        db_path.unlink()
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    items = ItemsRepository(db)
+    beras = items.insert(code='BRS-5', name='Beras 5kg', unit='Sak', current_stock=40)
+    items.insert(code='GLA-1', name='Gula 1kg', unit='Pcs', current_stock=25)
+
+    watcher = db.watcher()
+    seen = []
+    watcher.subscribe(lambda events: seen.extend((e['op'], e['row']['name'], e['row']['current_stock']) for e in events),
+                      tables=('items',))
+    print('idle', watcher.poll())                                   # expect []
+
+    # Every write below goes through its own connection, like another till
+    CheckoutRepository(db).checkout([('BRS-5', 3)], 'Budi')
+    for n in range(5):
+        items.update_stock(beras, 30 - n)
+    minyak = items.insert(code='MYK-2', name='Minyak 2L', unit='Btl', current_stock=12)
+    items.update_stock(minyak, 11)
+    events = watcher.poll()
+    print('tables', sorted({e['table'] for e in events}))           # expect items only (filtered)
+    print('items', seen)                                            # expect Beras once (26), Minyak as I (11)
+    print('after_poll', watcher.poll())                             # expect []
+
+    with db.connect() as conn:
+        conn.execute("DELETE FROM items WHERE id=?", (minyak,))
+    everything = []
+    watcher.subscribe(everything.extend)
+    watcher.poll()
+    print('delete', [(e['table'], e['id'], e['op'], e['row']) for e in everything])  # expect ('items', 3, 'D', None)
+
+    idle = 2000
+    started = time.perf_counter()
+    for _ in range(idle):
+        watcher.poll()
+    print('idle_poll_us', round((time.perf_counter() - started) / idle * 1e6, 1))
+    watcher.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.database_manager import DatabaseManager
+from models.maintenance import DatabaseMaintenance
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh planner statistics and reclaim free pages")
+    parser.add_argument('--db', dest='db_path', default=None, help='Path to SQLite DB (default: from config)')
+    parser.add_argument('--convert', action='store_true',
+                        help='Switch to auto_vacuum=INCREMENTAL first (full VACUUM; close the POS and server)')
+    parser.add_argument('--vacuum-pages', type=int, default=None, help='Free pages to reclaim (default: from config, 0 = all)')
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    db_path = Path(args.db_path or (ROOT / cfg.db_path))
+    if not db_path.exists():
+        print(f"DB not found: {db_path}")
+        sys.exit(1)
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    maintenance = DatabaseMaintenance(
+        db,
+        vacuum_pages=cfg.maintenance_vacuum_pages if args.vacuum_pages is None else args.vacuum_pages,
+        convert_max_mb=float('inf') if args.convert else cfg.maintenance_convert_max_mb,
+        log_keep_days=cfg.maintenance_log_keep_days,
+    )
+    print(json.dumps(maintenance.run("manual", allow_convert=args.convert), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.database_manager import DatabaseManager
+from models.transaction_edits import TransactionEditRepository
+
+
+def parse_line(text: str):
+    key, sep, qty = text.rpartition('=')
+    if not sep or not key.strip():
+        raise argparse.ArgumentTypeError(f"Expected KEY=QTY, got {text!r}")
+    try:
+        return key.strip(), int(qty)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Quantity must be an integer: {text!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show, edit or void a recorded transaction")
+    parser.add_argument('transaction_id', type=int)
+    parser.add_argument('lines', nargs='*', type=parse_line, metavar='KEY=QTY',
+                        help='New lines (code, barcode or name); items left out are removed. None: show the transaction')
+    parser.add_argument('--void', action='store_true', help='Cancel the transaction and reverse its stock')
+    parser.add_argument('--person', help='Who makes the change (required to edit or void)')
+    parser.add_argument('--reason', default=None, help='Stored with the change')
+    parser.add_argument('--allow-negative', action='store_true', help='Apply even if stock would drop below zero')
+    parser.add_argument('--db', dest='db_path', default=None, help='Path to SQLite DB (default: from config)')
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    db_path = Path(args.db_path or (ROOT / cfg.db_path))
+    if not db_path.exists():
+        print(f"DB not found: {db_path}")
+        sys.exit(1)
+
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    repo = TransactionEditRepository(db)
+    if not args.void and not args.lines:
+        trx = repo.get(args.transaction_id)
+        if trx is None:
+            print(f"Transaction {args.transaction_id} not found")
+            sys.exit(1)
+        print(json.dumps(trx, indent=2, ensure_ascii=False))
+        return
+    if args.void and args.lines:
+        parser.error("--void takes no lines")
+    try:
+        if args.void:
+            result = repo.void(args.transaction_id, args.person, reason=args.reason)
+        else:
+            result = repo.edit(args.transaction_id, args.lines, args.person, reason=args.reason,
+                               allow_negative=args.allow_negative)
+    except ValueError as e:
+        print(f"Transaction not changed: {e}")
+        sys.exit(1)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import sys
+import csv
+import json
+import argparse
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.database_manager import DatabaseManager
+from models.low_stock import LowStockRepository
+
+
+def read_thresholds(path: Path):
+    """Read (key, min_stock) pairs; an empty MinStock clears the threshold."""
+    with path.open(newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        cols = {c.strip().lower(): c for c in (reader.fieldnames or [])}
+        key_col = next((cols[c] for c in ('code', 'barcode', 'item', 'name') if c in cols), None)
+        min_col = next((cols[c] for c in ('minstock', 'min_stock', 'min') if c in cols), None)
+        if key_col is None or min_col is None:
+            raise ValueError("Thresholds file needs Code/Barcode/Item and MinStock columns")
+        return [
+            (row[key_col].strip(), int(row[min_col]) if (row[min_col] or '').strip() else None)
+            for row in reader if (row.get(key_col) or '').strip()
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List low-stock items or import per-item minimum stock")
+    parser.add_argument('--db', dest='db_path', default=None, help='Path to SQLite DB (default: from config)')
+    parser.add_argument('--import', dest='import_path', default=None, help='CSV with Code/Barcode/Item and MinStock')
+    parser.add_argument('--limit', type=int, default=50, help='Items to list')
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    db_path = Path(args.db_path or (ROOT / cfg.db_path))
+    if not db_path.exists():
+        print(f"DB not found: {db_path}")
+        sys.exit(1)
+
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    repo = LowStockRepository(db)
+    out = {}
+    if args.import_path:
+        try:
+            out["unresolved"] = repo.import_thresholds(read_thresholds(Path(args.import_path)))
+        except ValueError as e:
+            print(f"Invalid thresholds file: {e}")
+            sys.exit(1)
+    out["low_stock_count"] = repo.count()
+    out["items"] = repo.low_items(limit=args.limit)
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == '__main__':
+    main()
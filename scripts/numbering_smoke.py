@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from models.database_manager import DatabaseManager
+from models.receiving import next_transaction_number
+
+
+def main():
+    db_path = ROOT / 'db' / 'tmp_numbering.db'
+    if db_path.exists():
+        db_path.unlink()
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+
+    # A day that already has 9998 sales numbered before the counter existed
+    with db.transaction(immediate=True) as conn:
+        prefix = next_transaction_number(conn, 'OUT')[:-len('0001')]
+        conn.execute("DELETE FROM transaction_counters")
+        conn.executemany(
+            "INSERT INTO transactions (transaction_number, person_name, transaction_type) VALUES (?, 'smoke', 'OUT')",
+            [(f"{prefix}{i:04d}",) for i in range(1, 9999)],
+        )
+
+    numbers = []
+    for _ in range(3):
+        with db.transaction(immediate=True) as conn:
+            number = next_transaction_number(conn, 'OUT')
+            conn.execute(
+                "INSERT INTO transactions (transaction_number, person_name, transaction_type) VALUES (?, 'smoke', 'OUT')",
+                (number,),
+            )
+            numbers.append(number)
+
+    print('numbers', numbers)
+    print('rollover_ok', numbers == [f"{prefix}9999", f"{prefix}10000", f"{prefix}10001"])
+
+
+if __name__ == '__main__':
+    main()
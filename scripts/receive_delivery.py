@@ -0,0 +1,49 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.database_manager import DatabaseManager
+from models.receiving import ReceivingRepository, read_delivery_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Receive a delivery list as one IN transaction")
+    parser.add_argument('delivery', help='CSV/TSV delivery list or scanner export (one code per line)')
+    parser.add_argument('--person', required=True, help='Who received the delivery')
+    parser.add_argument('--notes', default=None, help='Notes stored on the transaction')
+    parser.add_argument('--db', dest='db_path', default=None, help='Path to SQLite DB (default: from config)')
+    parser.add_argument('--skip-unresolved', action='store_true', help='Commit matched lines even if some do not resolve')
+    parser.add_argument('--dry-run', action='store_true', help='Resolve and report without writing')
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    db_path = Path(args.db_path or (ROOT / cfg.db_path))
+    if not db_path.exists():
+        print(f"DB not found: {db_path}")
+        sys.exit(1)
+
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    repo = ReceivingRepository(db)
+    try:
+        lines = read_delivery_file(args.delivery)
+        if args.dry_run:
+            result = repo.preview(lines)
+        else:
+            result = repo.receive(lines, args.person, notes=args.notes, skip_unresolved=args.skip_unresolved)
+    except ValueError as e:
+        print(f"Delivery not received: {e}")
+        sys.exit(1)
+
+    print(json.dumps({k: v for k, v in result.items() if k != 'items'} | {"items": len(result["items"])}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
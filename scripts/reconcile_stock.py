@@ -0,0 +1,46 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.database_manager import DatabaseManager
+from models.reconciliation import StockReconciler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile items.current_stock against the stock ledger")
+    parser.add_argument('--db', dest='db_path', default=None, help='Path to SQLite DB (default: from config)')
+    parser.add_argument('--full', action='store_true', help='Rebuild expected stock from the whole ledger')
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    db_path = Path(args.db_path or (ROOT / cfg.db_path))
+    if not db_path.exists():
+        print(f"DB not found: {db_path}")
+        sys.exit(1)
+
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    result = StockReconciler(db).run(full=args.full)
+
+    report_path = ROOT / 'logs' / 'reconciliation_report.json'
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps({"db": str(db_path), **result}, indent=2), encoding='utf-8')
+    print(json.dumps({
+        "mode": result["mode"],
+        "entries_processed": result["entries_processed"],
+        "items_checked": result["items_checked"],
+        "mismatches": len(result["mismatches"]),
+        "report": str(report_path),
+    }, indent=2))
+    sys.exit(2 if result["mismatches"] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.database_manager import DatabaseManager
+from reports.forecast import (
+    DEFAULT_COVER_DAYS, DEFAULT_LEAD_TIME_DAYS, DEFAULT_RECENT_DAYS, DEFAULT_SERVICE_Z, DEFAULT_WINDOW_DAYS,
+    ReorderForecaster, to_records,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suggest reorder quantities from recent consumption")
+    parser.add_argument('--db', dest='db_path', default=None, help='Path to SQLite DB (default: from config)')
+    parser.add_argument('--as-of', default=None, help='Last day of the window, YYYY-MM-DD (default: today)')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW_DAYS, help='Days of history averaged')
+    parser.add_argument('--recent', type=int, default=DEFAULT_RECENT_DAYS, help='Days of the recent rate')
+    parser.add_argument('--lead-time', type=float, default=DEFAULT_LEAD_TIME_DAYS, help='Supplier lead time in days')
+    parser.add_argument('--cover-days', type=float, default=DEFAULT_COVER_DAYS, help='Days of stock to order beyond the lead time')
+    parser.add_argument('--service-z', type=float, default=DEFAULT_SERVICE_Z, help='Safety stock z-score')
+    parser.add_argument('--all', action='store_true', help='List every item, not only those to reorder')
+    parser.add_argument('--limit', type=int, default=50, help='Items to list')
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    db_path = Path(args.db_path or (ROOT / cfg.db_path))
+    if not db_path.exists():
+        print(f"DB not found: {db_path}")
+        sys.exit(1)
+
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    try:
+        forecaster = ReorderForecaster(
+            db, window_days=args.window, recent_days=args.recent, lead_time_days=args.lead_time,
+            cover_days=args.cover_days, service_z=args.service_z,
+        )
+        frame = forecaster.forecast(args.as_of)
+    except ValueError as e:
+        print(f"Invalid arguments: {e}")
+        sys.exit(1)
+    out = {
+        "items": len(frame),
+        "to_reorder": int((frame["suggested_qty"] > 0).sum()),
+    }
+    if args.all:
+        out["forecast"] = to_records(frame.sort_values(["days_of_cover", "name"], na_position="last").head(args.limit))
+    else:
+        out["suggestions"] = forecaster.suggestions(args.as_of, limit=args.limit)
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from models.database_manager import DatabaseManager
+from models.items_repository import ItemsRepository
+from models.checkout import CheckoutRepository
+from models.replication import CentralStore, ChangeLog
+
+
+def main():
+    branch_path = ROOT / 'db' / 'tmp_branch.db'
+    central_path = ROOT / 'db' / 'tmp_central.db'
+    for p in (branch_path, central_path):
+        if p.exists():
+            p.unlink()
+    db = DatabaseManager(str(branch_path))
+    db.initialize()
+    items = ItemsRepository(db)
+    log = ChangeLog(db, 'gudang-2')
+    central = CentralStore(central_path)
+
+    beras = items.insert(code='BRS-5', name='Beras 5kg', unit='Sak', current_stock=40)
+    gula = items.insert(code='GLA-1', name='Gula 1kg', unit='Pcs', current_stock=25)
+    CheckoutRepository(db).checkout([('BRS-5', 3), ('GLA-1', 5)], 'Budi')
+
+    first = [central.apply_batch(b) for b in log.batches(central.last_seq('gudang-2'), limit=4)]
+    print('first_sync', [(r['since'], r['upto'], r['upserted']) for r in first])
+
+    # Only changes after the last sync are shipped; ten updates of one row ship once
+    for n in range(10):
+        items.update_stock(beras, 30 - n)
+    items.set_active(gula, 0)
+    data = log.export_batch(central.last_seq('gudang-2'))
+    print('second_sync', central.apply_batch(data))           # expect changes=11, upserted=2
+    print('reapply', central.apply_batch(data))               # expect skipped
+    print('up_to_date', log.export_batch(central.last_seq('gudang-2')))  # expect None
+
+    with db.connect() as conn:
+        conn.execute("DELETE FROM items WHERE id=?", (items.insert(code='TMP', name='Temp', current_stock=0),))
+    print('delete_sync', central.apply_batch(log.export_batch(central.last_seq('gudang-2'))))  # expect deleted=1
+
+    import sqlite3
+    conn = sqlite3.connect(str(central_path))
+    print('central_items', conn.execute("SELECT branch, code, current_stock, active FROM branch_items ORDER BY id").fetchall())
+    print('central_trx', conn.execute("SELECT COUNT(*) FROM branch_transaction_items").fetchone()[0])  # expect 2
+    conn.close()
+    print('pruned', log.prune(central.last_seq('gudang-2')), 'status', central.status())
+
+
+if __name__ == '__main__':
+    main()
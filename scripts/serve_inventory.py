@@ -0,0 +1,66 @@
+import sys
+import asyncio
+import argparse
+import logging
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.database_manager import DatabaseManager
+from server.http import HttpServer
+from server.service import InventoryService, enable_wal
+from utils.constants import LOGS_DIR
+from utils.logging_setup import setup_logging
+
+
+async def serve(service: InventoryService, host: str, port: int, keepalive_s: float) -> None:
+    server = HttpServer(service.handle, keepalive_s=keepalive_s)
+    bound = await server.start(host, port)
+    print(f"Inventory server listening on http://{bound[0]}:{bound[1]}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the SQLite inventory over HTTP/JSON for handhelds and extra tills")
+    parser.add_argument('--db', dest='db_path', default=None, help='Path to SQLite DB (default: from config)')
+    parser.add_argument('--host', default=None, help='Listen address (default: server.host; 0.0.0.0 for the LAN)')
+    parser.add_argument('--port', type=int, default=None, help='Listen port (default: server.port)')
+    parser.add_argument('--workers', type=int, default=None, help='Database worker threads (default: server.db_workers)')
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    setup_logging(ROOT / LOGS_DIR, level=cfg.log_level, json_lines=cfg.log_json)
+    db_path = Path(args.db_path or (ROOT / cfg.db_path))
+    if not db_path.exists():
+        print(f"DB not found: {db_path}")
+        sys.exit(1)
+
+    db = DatabaseManager(str(db_path), slow_query_ms=cfg.slow_query_ms)
+    db.initialize()
+    enable_wal(db)
+    service = InventoryService(
+        db,
+        workers=args.workers or cfg.server_db_workers,
+        max_pending=cfg.server_max_pending,
+        batch_window_ms=cfg.server_batch_window_ms,
+        fuzzy=cfg.search_fuzzy,
+        commit_interval_ms=cfg.commit_interval_ms,
+        commit_max_commands=cfg.commit_max_commands,
+    )
+    try:
+        asyncio.run(serve(service, args.host or cfg.server_host, args.port or cfg.server_port, cfg.server_keepalive_s))
+    except KeyboardInterrupt:
+        logging.info("Inventory server stopped")
+    finally:
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
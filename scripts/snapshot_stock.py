@@ -0,0 +1,36 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.database_manager import DatabaseManager
+from models.stock_history import StockHistoryRepository
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record periodic stock snapshots (run nightly/weekly)")
+    parser.add_argument('--db', dest='db_path', default=None, help='Path to SQLite DB (default: from config)')
+    parser.add_argument('--period', choices=['day', 'week'], default='day', help='Snapshot period')
+    parser.add_argument('--as-of', dest='as_of', default=None, help='Cutoff date or timestamp (default: end of yesterday)')
+    parser.add_argument('--prune-days', type=int, default=None, help='Delete daily snapshots older than N days')
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    db_path = Path(args.db_path or (ROOT / cfg.db_path))
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    history = StockHistoryRepository(db)
+
+    written = history.take_snapshot(args.as_of, period=args.period)
+    pruned = history.prune_snapshots(args.prune_days) if args.prune_days is not None else 0
+    print(json.dumps({"db": str(db_path), "as_of": history.latest_snapshot(), "written": written, "pruned": pruned}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def import_times(module: str) -> list[dict]:
+    """Run `python -X importtime -c "import <module>"` and parse its report.
+
+    Returns:
+        One dict per imported module with self/cumulative microseconds.
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=str(ROOT), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"import {module} failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append({"module": name.rstrip()[1:], "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    return rows
+
+
+def summarize(rows: list[dict], top: int) -> dict:
+    # Top-level entries (no indentation) sum to the total import time
+    total = sum(r["cumulative_us"] for r in rows if not r["module"].startswith(' '))
+    heaviest = sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:top]
+    return {
+        "modules": len(rows),
+        "total_ms": round(total / 1000, 1),
+        "heaviest": [{"module": r["module"].strip(), "cumulative_ms": round(r["cumulative_us"] / 1000, 1)} for r in heaviest],
+    }
+
+
+def launch_times() -> dict:
+    """Time window creation and the deferred inventory load of POSApp."""
+    t0 = time.perf_counter()
+    from tkinter import Tk
+    from ui.pos_app import POSApp
+    t_import = time.perf_counter()
+    root = Tk()
+    app = POSApp(root)
+    root.update()
+    t_window = time.perf_counter()
+    while app.manager is None:
+        root.update()
+    t_ready = time.perf_counter()
+    root.destroy()
+    return {
+        "import_ms": round((t_import - t0) * 1000, 1),
+        "window_shown_ms": round((t_window - t0) * 1000, 1),
+        "data_ready_ms": round((t_ready - t0) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start: import times and time to first window")
+    parser.add_argument('--module', default='ui.pos_app', help='Module to profile with -X importtime')
+    parser.add_argument('--top', type=int, default=15, help='Number of heaviest imports to list')
+    parser.add_argument('--launch', action='store_true', help='Also create the POS window and time the data load (needs a display)')
+    args = parser.parse_args()
+
+    report = {"python": sys.version.split()[0], "import": {args.module: summarize(import_times(args.module), args.top)}}
+    if args.launch:
+        report["launch"] = launch_times()
+
+    report_path = ROOT / 'logs' / 'startup_report.json'
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
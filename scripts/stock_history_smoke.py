@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from models.database_manager import DatabaseManager
+from models.items_repository import ItemsRepository
+from models.stock_history import StockHistoryRepository
+
+
+def main():
+    db_path = ROOT / 'db' / 'tmp_history.db'
+    if db_path.exists():
+        db_path.unlink()
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    repo = ItemsRepository(db)
+    history = StockHistoryRepository(db)
+
+    item_id = repo.insert(name='Beras 5kg', unit='Sak', current_stock=0)
+    with db.transaction() as conn:
+        conn.execute("UPDATE items SET created_at='2026-01-01 00:00:00' WHERE id=?", (item_id,))
+        moves = [('2026-01-02 10:00:00', 'IN', 50), ('2026-01-05 09:00:00', 'OUT', 10),
+                 ('2026-01-09 15:00:00', 'OUT', 5), ('2026-01-12 08:00:00', 'IN', 20)]
+        stock = 0
+        for n, (ts, kind, qty) in enumerate(moves, start=1):
+            after = stock + qty if kind == 'IN' else stock - qty
+            cur = conn.execute(
+                "INSERT INTO transactions (transaction_number, person_name, transaction_type, created_at) VALUES (?,?,?,?)",
+                (f"TRX-{n:03d}", 'Budi', kind, ts),
+            )
+            conn.execute(
+                "INSERT INTO transaction_items (transaction_id, item_id, quantity, stock_before, stock_after) VALUES (?,?,?,?,?)",
+                (cur.lastrowid, item_id, qty, stock, after),
+            )
+            stock = after
+        conn.execute("UPDATE items SET current_stock=? WHERE id=?", (stock, item_id))
+
+    # Without snapshots: walks back from current stock
+    print('no_snapshot_jan06', history.stock_at(item_id, '2026-01-06'))
+    history.take_snapshot('2026-01-04', period='day')
+    history.take_snapshot('2026-01-10', period='day')
+    print('snapshots', history.latest_snapshot())
+    print('jan06', history.stock_at(item_id, '2026-01-06'))      # expect 40
+    print('jan11', history.stock_at(item_id, '2026-01-11'))      # expect 35
+    print('jan03', history.stock_at(item_id, '2026-01-03'))      # expect 50
+    print('levels_jan31', history.stock_levels_at('2026-01-31'))  # expect 55
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.database_manager import DatabaseManager
+from models.stocktake import StocktakeRepository
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply a stocktake counts file as bulk stock adjustments")
+    parser.add_argument('counts', help='CSV with an item key (Code/Barcode/Item) and a Counted column')
+    parser.add_argument('--db', dest='db_path', default=None, help='Path to SQLite DB (default: from config)')
+    parser.add_argument('--reason', default='Stocktake', help='Reason stored with each adjustment')
+    parser.add_argument('--dry-run', action='store_true', help='Report variances without writing')
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    db_path = Path(args.db_path or (ROOT / cfg.db_path))
+    if not db_path.exists():
+        print(f"DB not found: {db_path}")
+        sys.exit(1)
+
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    try:
+        summary = StocktakeRepository(db).apply_file(args.counts, reason=args.reason, dry_run=args.dry_run)
+    except ValueError as e:
+        print(f"Invalid counts file: {e}")
+        sys.exit(1)
+
+    report_path = ROOT / 'logs' / 'stocktake_report.json'
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(summary, indent=2), encoding='utf-8')
+    print(json.dumps({k: v for k, v in summary.items() if k not in ('largest_variances', 'unresolved')}
+                     | {"unresolved": len(summary["unresolved"]), "report": str(report_path)}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Ensure project root on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.manager import ConfigManager
+from models.database_manager import DatabaseManager
+from models.replication import DEFAULT_BATCH_CHANGES, CentralStore, ChangeLog, read_batch
+
+
+def open_branch(args, cfg):
+    db_path = Path(args.db_path or (ROOT / cfg.db_path))
+    if not db_path.exists():
+        print(f"DB not found: {db_path}")
+        sys.exit(1)
+    db = DatabaseManager(str(db_path))
+    db.initialize()
+    return ChangeLog(db, args.branch)
+
+
+def cmd_push(args, cfg):
+    """Ship new changes straight into a central DB file (shared drive, synced folder)."""
+    log = open_branch(args, cfg)
+    central = CentralStore(args.central)
+    since = central.last_seq(log.branch)
+    applied = []
+    for data in log.batches(since, args.batch_size):
+        result = central.apply_batch(data)
+        result["bytes"] = len(data)
+        applied.append(result)
+    upto = central.last_seq(log.branch)
+    log.acknowledge(upto)
+    pruned = log.prune(upto) if args.prune else 0
+    print(json.dumps({"branch": log.branch, "from_seq": since, "to_seq": upto, "batches": applied, "pruned": pruned}, indent=2))
+
+
+def cmd_export(args, cfg):
+    """Write batch files for changes after --since (carry them to the central site)."""
+    log = open_branch(args, cfg)
+    # Exporting from --since means the central DB has everything up to it
+    log.acknowledge(args.since)
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    for data in log.batches(args.since, args.batch_size):
+        batch = read_batch(data)
+        path = out_dir / f"{log.branch}-{batch['since'] + 1:012d}-{batch['upto']:012d}.cdc"
+        path.write_bytes(data)
+        files.append({"file": str(path), "changes": batch["changes"], "bytes": len(data)})
+    print(json.dumps({"branch": log.branch, "since": args.since, "files": files}, indent=2))
+
+
+def cmd_apply(args, cfg):
+    """Apply batch files to the central DB in sequence order; re-applying is harmless."""
+    central = CentralStore(args.central)
+    results = []
+    for path in sorted(Path(p) for p in args.files):
+        try:
+            results.append(central.apply_batch(path.read_bytes()) | {"file": str(path)})
+        except ValueError as e:
+            print(f"{path}: {e}")
+            sys.exit(1)
+    print(json.dumps(results, indent=2))
+
+
+def cmd_status(args, cfg):
+    print(json.dumps(CentralStore(args.central).status(), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replicate branch changes to a central database")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def branch_args(p):
+        p.add_argument('--branch', required=True, help='Name of this warehouse/branch')
+        p.add_argument('--db', dest='db_path', default=None, help='Branch SQLite DB (default: from config)')
+        p.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_CHANGES, help='Changes per batch')
+
+    p = sub.add_parser('push', help='Apply new changes directly to the central DB')
+    branch_args(p)
+    p.add_argument('--central', required=True, help='Central SQLite DB file')
+    p.add_argument('--prune', action='store_true', help='Delete change log entries the central DB has applied')
+    p.set_defaults(func=cmd_push)
+
+    p = sub.add_parser('export', help='Write compressed batch files')
+    branch_args(p)
+    p.add_argument('--since', type=int, required=True, help='Last sequence the central DB has (see status)')
+    p.add_argument('--out-dir', required=True, help='Directory for .cdc batch files')
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser('apply', help='Apply .cdc batch files to the central DB')
+    p.add_argument('--central', required=True, help='Central SQLite DB file')
+    p.add_argument('files', nargs='+', help='Batch files (applied in name order)')
+    p.set_defaults(func=cmd_apply)
+
+    p = sub.add_parser('status', help='Last applied sequence per branch')
+    p.add_argument('--central', required=True, help='Central SQLite DB file')
+    p.set_defaults(func=cmd_status)
+
+    args = parser.parse_args()
+    args.func(args, ConfigManager())
+
+
+if __name__ == '__main__':
+    main()
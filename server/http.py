@@ -0,0 +1,177 @@
+"""Minimal HTTP/1.1 JSON transport on asyncio streams.
+
+Only what the inventory API needs: request line, headers, Content-Length
+bodies, JSON responses and persistent (keep-alive) connections. Chunked
+request bodies and TLS are not supported; the server is meant for the
+shop's LAN behind the till PC.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 1 << 20
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    """Abort a request with an HTTP status and a JSON {"error": message} body."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        self.method = method
+        parts = urlsplit(target)
+        self.path = unquote(parts.path)
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        if not self.body:
+            return {}
+        try:
+            return json.loads(self.body)
+        except ValueError as e:
+            raise HttpError(400, f"Invalid JSON body: {e}")
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+
+Handler = Callable[[Request], Awaitable[Tuple[int, Any]]]
+
+
+async def read_line(reader: asyncio.StreamReader, status: int, message: str) -> bytes:
+    """One line of the request head; a line over the stream limit is `HttpError(status)`."""
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        # readline() reports an overrun as ValueError; the stream is no
+        # longer at a line boundary, so the connection must be closed
+        raise HttpError(status, message)
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Read one request; None when the client closed the connection."""
+    line = await read_line(reader, 400, "Request line too long")
+    if not line:
+        return None
+    try:
+        method, target, _version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+    headers: Dict[str, str] = {}
+    for _ in range(MAX_HEADER_LINES):
+        h = await read_line(reader, 431, "Header line too long")
+        if h in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = h.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HttpError(400, "Too many headers")
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return Request(method.upper(), target, headers, body)
+
+
+def encode_response(status: int, payload: Any, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+class HttpServer:
+    """Serve `handler(request) -> (status, payload)` over keep-alive connections.
+
+    Requests on one connection are handled in order (HTTP/1.1 pipelining
+    works); connections idle for `keepalive_s` are closed.
+    """
+
+    def __init__(self, handler: Handler, keepalive_s: float = 15.0):
+        self.handler = handler
+        self.keepalive_s = keepalive_s
+        self.connections = 0
+        self._server: Optional[asyncio.Server] = None
+
+    async def start(self, host: str, port: int) -> Tuple[str, int]:
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), self.keepalive_s)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except HttpError as e:
+                    writer.write(encode_response(e.status, {"error": e.message}, keep_alive=False))
+                    break
+                if request is None:
+                    break
+                status, payload = await self._dispatch(request)
+                writer.write(encode_response(status, payload, request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _dispatch(self, request: Request) -> Tuple[int, Any]:
+        try:
+            return await self.handler(request)
+        except HttpError as e:
+            return e.status, {"error": e.message}
+        except Exception:
+            logger.exception("Unhandled error for %s %s", request.method, request.path)
+            return 500, {"error": "Internal server error"}
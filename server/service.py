@@ -0,0 +1,295 @@
+"""Inventory API for handheld scanners and extra tills.
+
+Endpoints (JSON in and out):
+
+    GET  /api/health
+    GET  /api/items/search?q=<text>&limit=<n>
+    GET  /api/items/barcode/<code>          code or barcode, batched
+    GET  /api/items/<id>
+    GET  /api/stock?keys=<k1>,<k2>,...      current stock by code/barcode
+    POST /api/checkout                      {"person_name", "lines": [{"key", "qty"}], "notes"?, "allow_negative"?}
+    POST /api/receive                       {"person_name", "lines": [{"key", "qty"}], "notes"?, "skip_unresolved"?}
+    POST /api/adjust                        {"key", "delta" | "new_stock", "reason"?}
+    POST /api/batch                         {"requests": [{"method", "path", "body"?}]}
+
+The event loop only parses and routes; every SQLite call runs on a bounded
+thread pool (`DbPool`). Concurrent barcode lookups are coalesced into one
+`IN (...)` query by `KeyBatcher`, and `/api/batch` lets a handheld send a
+whole scan burst in one round trip. Writes go to a `GroupCommitWriter`, which
+commits concurrent sales from all clients in shared transactions.
+"""
+from __future__ import annotations
+import asyncio
+import functools
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from models.database_manager import DatabaseManager
+from models.group_commit import GroupCommitWriter
+from models.items_repository import ItemsRepository
+from utils.metrics import METRICS
+from .http import HttpError, Request
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_REQUESTS = 200
+MAX_SEARCH_LIMIT = 200
+
+
+class DbPool:
+    """Run blocking database calls on a fixed number of worker threads.
+
+    At most `max_pending` calls may be queued or running; beyond that the
+    request fails fast with 503 instead of growing an unbounded backlog.
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 256):
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="db")
+        self.max_pending = max_pending
+        self.pending = 0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        if self.pending >= self.max_pending:
+            METRICS.record("server.rejected", 0.0)
+            raise HttpError(503, "Server busy, retry shortly")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+class KeyBatcher:
+    """Coalesce concurrent single-key lookups into one multi-key query.
+
+    The first `get()` opens a batch window of `window_ms`; every key asked
+    for until the window closes is fetched with a single
+    `fetch_many(keys) -> {key: row}` call on the pool.
+    """
+
+    def __init__(self, pool: DbPool, fetch_many: Callable[[List[str]], Dict[str, Any]], window_ms: float = 2.0, max_keys: int = 500):
+        self.pool = pool
+        self.fetch_many = fetch_many
+        self.window_s = max(0.0, window_ms) / 1000.0
+        self.max_keys = max_keys
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def get(self, key: str) -> Any:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._waiters.setdefault(key, []).append(fut)
+        if len(self._waiters) >= self.max_keys:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        waiters, self._waiters = self._waiters, {}
+        if waiters:
+            asyncio.ensure_future(self._resolve(waiters))
+
+    async def _resolve(self, waiters: Dict[str, List[asyncio.Future]]) -> None:
+        METRICS.record("server.batch_keys", float(len(waiters)))
+        try:
+            found = await self.pool.run(self.fetch_many, list(waiters))
+        except Exception as e:
+            for futs in waiters.values():
+                for f in futs:
+                    if not f.done():
+                        f.set_exception(e)
+            return
+        for key, futs in waiters.items():
+            for f in futs:
+                if not f.done():
+                    f.set_result(found.get(key))
+
+
+def _item_json(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": item["id"],
+        "code": item["code"],
+        "barcode": item["barcode"],
+        "name": item["name"],
+        "unit": item["unit"],
+        "stock": item["current_stock"],
+        "min_stock": item.get("min_stock"),
+    }
+
+
+class InventoryService:
+    """Route API requests to the repositories through the DB pool."""
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        workers: int = 4,
+        max_pending: int = 256,
+        batch_window_ms: float = 2.0,
+        fuzzy: bool = False,
+        commit_interval_ms: float = 5.0,
+        commit_max_commands: int = 64,
+    ):
+        self.db = db
+        self.items = ItemsRepository(db)
+        self.writer = GroupCommitWriter(db, commit_interval_ms, commit_max_commands).start()
+        self.pool = DbPool(workers, max_pending)
+        self.lookups = KeyBatcher(self.pool, self.items.get_by_keys, batch_window_ms)
+        self.fuzzy = fuzzy
+        self.routes: List[Tuple[str, str, Callable]] = [
+            ("GET", "/api/health", self.health),
+            ("GET", "/api/items/search", self.search),
+            ("GET", "/api/items/barcode/", self.by_barcode),
+            ("GET", "/api/items/", self.by_id),
+            ("GET", "/api/stock", self.stock),
+            ("POST", "/api/checkout", self.checkout),
+            ("POST", "/api/receive", self.receive),
+            ("POST", "/api/adjust", self.adjust),
+            ("POST", "/api/batch", self.batch),
+        ]
+
+    async def handle(self, request: Request) -> Tuple[int, Any]:
+        started = time.perf_counter()
+        allowed = False
+        for method, path, fn in self.routes:
+            if request.path == path or (path.endswith("/") and request.path.startswith(path)):
+                if request.method != method:
+                    allowed = True
+                    continue
+                try:
+                    return 200, await fn(request, request.path[len(path):])
+                finally:
+                    METRICS.record(f"server.{fn.__name__}", (time.perf_counter() - started) * 1000.0)
+        raise HttpError(405 if allowed else 404, f"No route for {request.method} {request.path}")
+
+    async def health(self, request: Request, _rest: str) -> Dict[str, Any]:
+        return {"ok": True, "pending": self.pool.pending}
+
+    async def search(self, request: Request, _rest: str) -> List[Dict[str, Any]]:
+        q = request.query.get("q", "").strip()
+        if not q:
+            return []
+        try:
+            limit = min(int(request.query.get("limit", 50)), MAX_SEARCH_LIMIT)
+        except ValueError:
+            raise HttpError(400, "limit must be an integer")
+        rows = await self.pool.run(self._search, q, limit)
+        return [_item_json(r) for r in rows]
+
+    def _search(self, q: str, limit: int) -> List[Dict[str, Any]]:
+        if self.fuzzy:
+            try:
+                return self.items.search_fuzzy(q, limit=limit)
+            except ImportError:
+                logger.warning("NumPy is not available; fuzzy search disabled")
+                self.fuzzy = False
+        return self.items.search(q, limit=limit)
+
+    async def by_barcode(self, request: Request, key: str) -> Dict[str, Any]:
+        key = key.strip()
+        if not key:
+            raise HttpError(400, "Missing code")
+        item = await self.lookups.get(key)
+        if item is None:
+            raise HttpError(404, f"Item not found: {key}")
+        return _item_json(item)
+
+    async def by_id(self, request: Request, rest: str) -> Dict[str, Any]:
+        try:
+            item_id = int(rest)
+        except ValueError:
+            raise HttpError(404, f"No route for {request.method} {request.path}")
+        item = await self.pool.run(self.items.get_by_id, item_id)
+        if item is None:
+            raise HttpError(404, f"Item id {item_id} not found")
+        return _item_json(item)
+
+    async def stock(self, request: Request, _rest: str) -> Dict[str, Any]:
+        keys = [k.strip() for k in request.query.get("keys", "").split(",") if k.strip()]
+        if not keys:
+            raise HttpError(400, "keys is required")
+        found = await self.pool.run(self.items.get_by_keys, keys)
+        return {k: (None if k not in found else {"name": found[k]["name"], "stock": found[k]["current_stock"], "unit": found[k]["unit"]}) for k in keys}
+
+    async def checkout(self, request: Request, _rest: str) -> Dict[str, Any]:
+        body = self._lines_body(request)
+        return await self._write(
+            "checkout", lines=body["lines"], person_name=body.get("person_name"),
+            notes=body.get("notes"), allow_negative=bool(body.get("allow_negative", False)),
+        )
+
+    async def receive(self, request: Request, _rest: str) -> Dict[str, Any]:
+        body = self._lines_body(request)
+        return await self._write(
+            "receive", lines=body["lines"], person_name=body.get("person_name"),
+            notes=body.get("notes"), skip_unresolved=bool(body.get("skip_unresolved", False)),
+        )
+
+    async def adjust(self, request: Request, _rest: str) -> Dict[str, Any]:
+        body = request.json()
+        if not isinstance(body, dict) or not body.get("key"):
+            raise HttpError(400, "Body must be {\"key\", \"delta\" or \"new_stock\"}")
+        return await self._write(
+            "adjust", key=body["key"], delta=body.get("delta"), new_stock=body.get("new_stock"), reason=body.get("reason"),
+        )
+
+    @staticmethod
+    def _lines_body(request: Request) -> Dict[str, Any]:
+        body = request.json()
+        if not isinstance(body, dict) or not isinstance(body.get("lines"), list):
+            raise HttpError(400, "Body must be {\"person_name\", \"lines\": [...]}")
+        return body
+
+    async def _write(self, kind: str, **kwargs) -> Dict[str, Any]:
+        """Queue a write on the group-commit writer and wait for its commit."""
+        try:
+            return await asyncio.wrap_future(self.writer.submit(kind, **kwargs))
+        except (ValueError, TypeError) as e:
+            raise HttpError(409 if "Insufficient stock" in str(e) else 400, str(e))
+
+    async def batch(self, request: Request, _rest: str) -> List[Dict[str, Any]]:
+        """Run sub-requests concurrently; each gets its own status and body."""
+        body = request.json()
+        subs = body.get("requests") if isinstance(body, dict) else None
+        if not isinstance(subs, list):
+            raise HttpError(400, "Body must be {\"requests\": [...]}")
+        if len(subs) > MAX_BATCH_REQUESTS:
+            raise HttpError(413, f"At most {MAX_BATCH_REQUESTS} requests per batch")
+
+        async def one(sub: Any) -> Dict[str, Any]:
+            if not isinstance(sub, dict) or sub.get("path", "").startswith("/api/batch"):
+                return {"status": 400, "body": {"error": "Invalid sub-request"}}
+            payload = sub.get("body")
+            raw = b"" if payload is None else json.dumps(payload).encode("utf-8")
+            req = Request(str(sub.get("method", "GET")).upper(), str(sub.get("path", "")), {}, raw)
+            try:
+                status, result = await self.handle(req)
+            except HttpError as e:
+                status, result = e.status, {"error": e.message}
+            except Exception:
+                logger.exception("Unhandled error in batch for %s %s", req.method, req.path)
+                status, result = 500, {"error": "Internal server error"}
+            return {"status": status, "body": result}
+
+        return list(await asyncio.gather(*(one(s) for s in subs)))
+
+    def close(self) -> None:
+        self.writer.stop()
+        self.pool.shutdown()
+
+
+def enable_wal(db: DatabaseManager) -> None:
+    """Switch the database to WAL so API readers never wait for a writer (persistent)."""
+    row = db.query_one("PRAGMA journal_mode=WAL")
+    logger.info("Journal mode: %s", row[0] if row else "?")
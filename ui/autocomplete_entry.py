@@ -1,4 +1,5 @@
 import tkinter as tk
+from utils.metrics import timed
 
 class AutocompleteEntry(tk.Entry):
     """Entry widget with dropdown autocomplete behavior.
@@ -28,6 +29,7 @@ class AutocompleteEntry(tk.Entry):
         self.bind("<Up>", self.move_up)
         self.bind("<Return>", self.select_item)
 
+    @timed("ui.update_suggestions")
     def update_suggestions(self, event=None):
         """Update the dropdown based on the current typed text."""
         if event and event.keysym in ["Up", "Down", "Return"]:
@@ -0,0 +1,72 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from pathlib import Path
+from utils.constants import TITLE_DIAGNOSTICS, LOGS_DIR, METRICS_DUMP_FILE
+from utils.metrics import METRICS, MetricsRegistry
+
+
+class DiagnosticsDialog(tk.Toplevel):
+    """Show timing histograms (count, mean, p50/p95/p99, max) of instrumented hot paths."""
+
+    COLUMNS = ("Metric", "Count", "Mean", "p50", "p95", "p99", "Max")
+    REFRESH_MS = 2000
+
+    def __init__(self, parent, registry: MetricsRegistry = METRICS):
+        super().__init__(parent)
+        self.title(TITLE_DIAGNOSTICS)
+        self.geometry("720x400")
+        self.registry = registry
+        self._refresh_job = None
+
+        frm = ttk.Frame(self)
+        frm.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.tree = ttk.Treeview(frm, columns=self.COLUMNS, show="headings")
+        scroll = ttk.Scrollbar(frm, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        for col in self.COLUMNS:
+            self.tree.heading(col, text=col if col in ("Metric", "Count") else f"{col} (ms)")
+            self.tree.column(col, width=200 if col == "Metric" else 70, anchor="w" if col == "Metric" else "e")
+        self.tree.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+
+        btns = ttk.Frame(self)
+        btns.pack(fill="x", padx=10, pady=(0, 10))
+        ttk.Button(btns, text="Close", command=self.destroy).pack(side="right")
+        ttk.Button(btns, text="Save Dump", command=self.save_dump).pack(side="right", padx=8)
+        ttk.Button(btns, text="Reset", command=self.reset).pack(side="right")
+        ttk.Button(btns, text="Refresh", command=self.refresh).pack(side="right", padx=8)
+
+        self.bind("<Escape>", lambda e: self.destroy())
+        self.refresh()
+
+    def refresh(self):
+        """Reload the table from the registry and schedule the next refresh."""
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+        self.tree.delete(*self.tree.get_children())
+        for name, s in self.registry.snapshot().items():
+            self.tree.insert("", "end", values=(
+                name, s["count"], f"{s['mean_ms']:.2f}", f"{s['p50_ms']:.2f}",
+                f"{s['p95_ms']:.2f}", f"{s['p99_ms']:.2f}", f"{s['max_ms']:.2f}",
+            ))
+        self._refresh_job = self.after(self.REFRESH_MS, self.refresh)
+
+    def reset(self):
+        self.registry.reset()
+        self.refresh()
+
+    def save_dump(self):
+        path = Path(LOGS_DIR) / METRICS_DUMP_FILE
+        try:
+            self.registry.dump(path)
+        except Exception as e:
+            messagebox.showerror(TITLE_DIAGNOSTICS, f"Failed to write {path}:\n{e}", parent=self)
+            return
+        messagebox.showinfo(TITLE_DIAGNOSTICS, f"Metrics written to {path}", parent=self)
+
+    def destroy(self):
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        super().destroy()
@@ -1,22 +1,42 @@
 import logging
+import sqlite3
+import threading
+import time
 import tkinter as tk
+from pathlib import Path
 from tkinter import ttk, messagebox
-from models.inventory_manager import InventoryManager
 from utils.receipt_printer import ReceiptPrinter
 from ui.autocomplete_entry import AutocompleteEntry
 from config.manager import ConfigManager
-from ui.settings_dialog import SettingsDialog
+from models.inventory_repository import InventoryRepository, SqliteInventoryRepository, repository_class
+from models.backup import BackupManager, BackupScheduler
+from models.database_manager import DatabaseManager
+from models.maintenance import DatabaseMaintenance, MaintenanceScheduler
+from utils.metrics import METRICS, timed
+from utils.profiling import PROFILER
 from utils.constants import (
+    LOGS_DIR,
+    METRICS_DUMP_FILE,
     TITLE_NOT_FOUND,
     TITLE_INVALID_QUANTITY,
     TITLE_CONFIRM,
     TITLE_PRINT,
     TITLE_SAVE_ERROR,
     MSG_NOT_FOUND,
+    MSG_NOT_FOUND_SUGGEST,
     MSG_INVALID_QTY_NONNEG,
     MSG_INVALID_QTY_INT,
     MSG_PRINT_CONFIRM,
     MSG_CLEAR_CONFIRM,
+    MSG_PROFILE_ARMED,
+    MSG_PROFILE_WINDOW,
+    MSG_PROFILE_BUSY,
+    TITLE_DIAGNOSTICS,
+    TITLE_RECEIVING,
+    MSG_RECEIVING_SQLITE_ONLY,
+    TITLE_LOW_STOCK,
+    MSG_LOW_STOCK_COUNT,
+    DEFAULT_PROFILE_WINDOW_S,
 )
 from ui.common import confirm_modal
 
@@ -25,24 +45,183 @@ logger = logging.getLogger(__name__)
 class POSApp:
     """Tkinter-based POS UI for searching items, printing receipts, and updating stock."""
     def __init__(self, root):
-        """Initialize the application and load configuration, data, and printer.
+        """Initialize the application, build the UI and schedule the data load.
+
+        Inventory data is loaded after the window is shown so startup is not
+        blocked by pandas imports or CSV parsing.
 
         Args:
             root: Tk root window.
         """
         self.root = root
         self.config = ConfigManager()
-        self.manager = InventoryManager(self.config.csv_path)
+        self.manager = None
+        self.loaded_key = None
+        self.low_stock = None
+        self.watcher = None
+        self._watch_job = None
+        self._warm_thread = None
+        # (keyword, qty) entered before the backend was ready
+        self._pending_searches = []
+        self.backups = None
+        self.maintenance = None
+        self.last_input = time.monotonic()
         self.printer = ReceiptPrinter(
             self.config.printer_port,
             baudrate=self.config.printer_baudrate,
             timeout=self.config.printer_timeout,
         )
         self.columns = ("Item", "Stock", "Qty", "Unit")
+        # Cart row -> item key ("Key" from the backend, else the name)
+        self.cart_keys = {}
         self.qty_var = tk.StringVar(value="1")
         self.search_var = tk.StringVar()
 
         self.setup_ui()
+        # Idle time for background maintenance
+        self.root.bind_all("<Key>", self._touch_input, add="+")
+        self.root.bind_all("<Button>", self._touch_input, add="+")
+        METRICS.start_periodic_dump(Path(LOGS_DIR) / METRICS_DUMP_FILE, self.config.metrics_dump_interval_s)
+        self.start_backups()
+        self.start_maintenance()
+        # Draw the window now; load data once the event loop is idle
+        self.root.update_idletasks()
+        self.root.after_idle(self.load_inventory)
+
+    def load_inventory(self):
+        """Open the inventory backend selected by `data.source`.
+
+        A backend that is ready (e.g. a fresh catalogue cache) opens right
+        away; otherwise it is warmed in a background thread and opened when
+        that finishes.
+        """
+        if self._warm_thread is not None:
+            # A build is running; _finish_load picks up the current config
+            return
+        backend = repository_class(self.config.data_source)
+        if not backend.is_ready(self.config):
+            self._warm_thread = threading.Thread(
+                target=self._warm_backend, args=(backend,), daemon=True
+            )
+            self._warm_thread.start()
+            self.root.after(50, self._finish_load)
+            return
+        self._open_backend(backend)
+
+    def _open_backend(self, backend):
+        """Create the repository on the UI thread and remember what it reads."""
+        with timed("inventory.open"), PROFILER.action("load"):
+            self.manager = backend.from_config(self.config)
+        self.loaded_key = backend.source_key(self.config)
+        logger.info("Inventory backend ready: %s", self.loaded_key[0])
+        self._open_low_stock()
+        self._open_watcher()
+        self._replay_searches()
+
+    def _replay_searches(self):
+        """Add the items scanned or entered while the backend was loading, in order."""
+        pending, self._pending_searches = self._pending_searches, []
+        for keyword, qty in pending:
+            self.qty_var.set(qty)
+            self.search_items(keyword)
+
+    def _open_low_stock(self):
+        """Subscribe to low-stock crossings (SQLite only; CSV has no thresholds)."""
+        self.low_stock = None
+        self.low_stock_var.set("")
+        if not isinstance(self.manager, SqliteInventoryRepository):
+            return
+        from models.low_stock import LowStockRepository, LowStockMonitor
+        self.low_stock = LowStockMonitor(LowStockRepository(self.manager.items.db))
+        self.low_stock.subscribe(self.on_low_stock_events)
+        self.update_low_stock_label()
+
+    def _open_watcher(self):
+        """Follow commits from other tills and the server (SQLite only) to keep cart stock current."""
+        if self._watch_job is not None:
+            self.root.after_cancel(self._watch_job)
+            self._watch_job = None
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+        interval = self.config.watch_interval_ms
+        if not isinstance(self.manager, SqliteInventoryRepository) or interval <= 0:
+            return
+        self.watcher = self.manager.items.db.watcher()
+        self.watcher.subscribe(self.on_item_changes, tables=("items",))
+        # Opens the watcher's connection here, on the UI thread that polls it
+        self.watcher.changed()
+        self._watch_job = self.root.after(interval, self._poll_changes)
+
+    def _poll_changes(self):
+        """Tk timer: a no-op unless the database changed since the last tick."""
+        try:
+            self.watcher.poll()
+        except sqlite3.Error:
+            logger.exception("Change watcher poll failed")
+        self._watch_job = self.root.after(self.config.watch_interval_ms, self._poll_changes)
+
+    def on_item_changes(self, events):
+        """Update the Stock column (and low tag) of the cart rows whose items changed."""
+        changed = {e["id"]: e["row"] for e in events if e["row"] is not None}
+        for item_id in self.tree.get_children():
+            values = list(self.tree.item(item_id)["values"])
+            item = changed.get(self.cart_keys.get(item_id))
+            if item is None or str(values[1]) == str(item["current_stock"]):
+                continue
+            values[1] = item["current_stock"]
+            low = item["min_stock"] is not None and item["current_stock"] <= item["min_stock"]
+            self.tree.item(item_id, values=values, tags=("low",) if low else ())
+        # Crossings caused by other connections' writes
+        self.stock_written()
+
+    def stock_written(self):
+        """Call after committed stock writes to push low-stock changes to the UI."""
+        if self.low_stock is not None:
+            self.low_stock.drain()
+
+    def on_low_stock_events(self, events):
+        """Refresh the low-stock indicator and log items that crossed their threshold."""
+        for e in events:
+            logger.info("%s %s low stock (%s / min %s)", e["name"], "is" if e["is_low"] else "no longer", e["stock"], e["min_stock"])
+        self.update_low_stock_label()
+
+    def update_low_stock_label(self):
+        count = self.low_stock.repo.count() if self.low_stock is not None else 0
+        self.low_stock_var.set(MSG_LOW_STOCK_COUNT.format(count=count) if count else "")
+
+    def show_low_stock(self, event=None):
+        """List the items at or below their minimum stock."""
+        if self.low_stock is None:
+            return
+        items = self.low_stock.repo.low_items(limit=30)
+        if not items:
+            return
+        lines = [f"{i['name']}: {i['current_stock']} {i['unit']} (min {i['min_stock']})" for i in items]
+        messagebox.showwarning(TITLE_LOW_STOCK, "\n".join(lines))
+
+    def _warm_backend(self, backend):
+        """Background worker: prepare the backend (no UI calls)."""
+        try:
+            backend.warm(self.config)
+        except Exception:
+            # from_config() on the UI thread reports the error to the user
+            logger.exception("Background inventory load failed for %s", self.config.data_source)
+
+    def _finish_load(self):
+        """Poll the background warm-up and open the backend when done."""
+        if self._warm_thread is not None and self._warm_thread.is_alive():
+            self.root.after(50, self._finish_load)
+            return
+        self._warm_thread = None
+        self._open_backend(repository_class(self.config.data_source))
+
+    @timed("search.suggestions")
+    def get_suggestions(self, keyword):
+        """Return item suggestions, or none while the inventory is still loading."""
+        if self.manager is None:
+            return []
+        return self.manager.get_suggestions(keyword)
 
     def setup_ui(self):
         """Build the window title, menu, table, search bar, buttons, and shortcuts."""
@@ -53,12 +232,23 @@ class POSApp:
         menubar = tk.Menu(self.root)
         self.root.config(menu=menubar)
         app_menu = tk.Menu(menubar, tearoff=0)
+        app_menu.add_command(label="Receive Stock (F7)", command=self.open_receiving)
         app_menu.add_command(label="Settings", command=self.open_settings)
+        app_menu.add_command(label="Diagnostics", command=self.open_diagnostics)
+        profile_menu = tk.Menu(app_menu, tearoff=0)
+        profile_menu.add_command(label="Next Checkout", command=lambda: self.arm_profile("checkout"))
+        profile_menu.add_command(label="Next Search", command=lambda: self.arm_profile("search"))
+        profile_menu.add_command(
+            label=f"Next {DEFAULT_PROFILE_WINDOW_S} Seconds",
+            command=lambda: self.start_profile_window(DEFAULT_PROFILE_WINDOW_S),
+        )
+        app_menu.add_cascade(label="Profile", menu=profile_menu)
         menubar.add_cascade(label="App", menu=app_menu)
 
         self.setup_treeview()
         self.setup_search_bar()
         self.setup_buttons()
+        self.setup_status_bar()
         self.setup_shortcuts()
 
     def setup_treeview(self):
@@ -76,6 +266,7 @@ class POSApp:
         for col in self.columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=120)
+        self.tree.tag_configure("low", foreground="red")
 
     def setup_search_bar(self):
         """Create quantity input and autocomplete search entry."""
@@ -90,7 +281,7 @@ class POSApp:
 
         tk.Label(search_frame, text="Search:").pack(side="left", padx=5)
         self.search_entry = AutocompleteEntry(
-            self.manager.get_suggestions,
+            self.get_suggestions,
             self.search_items,
             self.qty_entry,
             search_frame,
@@ -108,9 +299,17 @@ class POSApp:
         tk.Button(button_frame, text="Remove (Backspace)", command=self.remove_selected).pack(side="left", padx=10)
         tk.Button(button_frame, text="Cancel (Del)", command=self.remove_all).pack(side="left", padx=10)
 
+    def setup_status_bar(self):
+        """Create the low-stock indicator; click it to list the items."""
+        self.low_stock_var = tk.StringVar()
+        label = tk.Label(self.root, textvariable=self.low_stock_var, fg="red", cursor="hand2", anchor="w")
+        label.pack(fill="x", padx=10, pady=(0, 5))
+        label.bind("<Button-1>", self.show_low_stock)
+
     def setup_shortcuts(self):
         """Bind keyboard shortcuts for core actions."""
         self.root.bind("<F4>", lambda e: self.edit_quantity())
+        self.root.bind("<F7>", lambda e: self.open_receiving())
         self.root.bind("<F12>", lambda e: self.print_receipt())
         self.root.bind("<BackSpace>", lambda e: self.remove_selected())
         self.root.bind("<Delete>", lambda e: self.remove_all())
@@ -122,20 +321,67 @@ class POSApp:
             return
         for item_id in selected_items:
             self.tree.delete(item_id)
+            self.cart_keys.pop(item_id, None)
         self.focus_qty()
 
     def open_settings(self):
         """Open the settings dialog and apply changes when saved."""
+        from ui.settings_dialog import SettingsDialog
         SettingsDialog(self.root, self.config, on_saved=self.apply_config)
 
+    def open_receiving(self):
+        """Open stock-in mode for bulk delivery lists (SQLite backend only)."""
+        if not isinstance(self.manager, SqliteInventoryRepository):
+            messagebox.showinfo(TITLE_RECEIVING, MSG_RECEIVING_SQLITE_ONLY)
+            return
+        from ui.receiving_dialog import ReceivingDialog
+        from models.receiving import ReceivingRepository
+        ReceivingDialog(self.root, ReceivingRepository(self.manager.items.db), on_received=self.refresh_cart_stock)
+
+    def refresh_cart_stock(self, received):
+        """Show the post-delivery stock for cart rows of received items."""
+        after = {row["item_id"]: row["stock_after"] for row in received["items"]}
+        for item_id in self.tree.get_children():
+            values = list(self.tree.item(item_id)["values"])
+            key = self.cart_keys.get(item_id)
+            if key in after:
+                values[1] = after[key]
+                self.tree.item(item_id, values=values)
+        self.stock_written()
+
+    def open_diagnostics(self):
+        """Open the timing metrics dialog."""
+        from ui.diagnostics_dialog import DiagnosticsDialog
+        DiagnosticsDialog(self.root)
+
+    def arm_profile(self, action, notify=True):
+        """Profile the next run of `action` (checkout, search, load)."""
+        PROFILER.arm(action)
+        if notify:
+            messagebox.showinfo(TITLE_DIAGNOSTICS, MSG_PROFILE_ARMED.format(action=action))
+
+    def start_profile_window(self, seconds, notify=True):
+        """Profile the UI thread for `seconds`, then write the output files."""
+        if not PROFILER.start("window"):
+            if notify:
+                messagebox.showwarning(TITLE_DIAGNOSTICS, MSG_PROFILE_BUSY)
+            return
+        self.root.after(int(seconds * 1000), PROFILER.stop)
+        if notify:
+            messagebox.showinfo(TITLE_DIAGNOSTICS, MSG_PROFILE_WINDOW.format(seconds=seconds))
+
     def apply_config(self):
         """Reload configuration and recreate dependent components (title, data, printer)."""
         # Reload config from disk and apply to app
         self.config.load()
         # Update title
         self.update_title()
-        # Recreate manager with potentially new CSV path
-        self.manager = InventoryManager(self.config.csv_path)
+        # Reload data only if the data source or its path changed
+        if InventoryRepository.source_key(self.config) != self.loaded_key:
+            self.load_inventory()
+        METRICS.start_periodic_dump(Path(LOGS_DIR) / METRICS_DUMP_FILE, self.config.metrics_dump_interval_s)
+        self.start_backups()
+        self.start_maintenance()
         # Recreate printer with new settings
         self.printer = ReceiptPrinter(
             self.config.printer_port,
@@ -143,6 +389,56 @@ class POSApp:
             timeout=self.config.printer_timeout,
         )
 
+    def start_backups(self):
+        """(Re)start scheduled backups of the SQLite database on a background thread."""
+        if self.backups is not None:
+            self.backups.stop()
+            self.backups = None
+        if not self.config.backup_enabled:
+            return
+        manager = BackupManager(
+            self.config.db_path,
+            self.config.backup_dir,
+            keep=self.config.backup_keep,
+            compress=self.config.backup_compress,
+            pages_per_step=self.config.backup_pages_per_step,
+        )
+        self.backups = BackupScheduler(manager, interval_h=self.config.backup_interval_h)
+        self.backups.start()
+
+    def start_maintenance(self):
+        """(Re)start database maintenance, run on a background thread once input has been idle."""
+        if self.maintenance is not None:
+            self.maintenance.stop()
+            self.maintenance = None
+        if not self.config.maintenance_enabled:
+            return
+        maintenance = DatabaseMaintenance(
+            DatabaseManager(self.config.db_path),
+            vacuum_pages=self.config.maintenance_vacuum_pages,
+            convert_max_mb=self.config.maintenance_convert_max_mb,
+            log_keep_days=self.config.maintenance_log_keep_days,
+        )
+        self.maintenance = MaintenanceScheduler(
+            maintenance,
+            idle_for=lambda: time.monotonic() - self.last_input,
+            idle_s=self.config.maintenance_idle_minutes * 60.0,
+            interval_h=self.config.maintenance_interval_h,
+        )
+        self.maintenance.start()
+
+    def _touch_input(self, event=None):
+        self.last_input = time.monotonic()
+
+    def shutdown(self):
+        """Stop background jobs after the window closes; runs maintenance once more."""
+        if self.watcher is not None:
+            self.watcher.close()
+        if self.backups is not None:
+            self.backups.stop()
+        if self.maintenance is not None:
+            self.maintenance.shutdown()
+
     def update_title(self):
         """Compute and set the window title from current configuration."""
         title = self.config.app_name or "Inventory App"
@@ -155,18 +451,34 @@ class POSApp:
         self.qty_entry.focus()
         self.qty_entry.select_range(0, tk.END)
 
+    @timed("ui.search_items")
     def search_items(self, keyword=None):
         """Search the inventory and add or update an item row in the cart.
 
         Args:
             keyword: Text to search for; provided by autocomplete on selection or Enter.
         """
-        row = self.manager.get_item(keyword)
+        if self.manager is None:
+            # Still loading in the background: keep the scan for _replay_searches
+            self._pending_searches.append((self.search_var.get() if keyword is None else keyword, self.qty_var.get()))
+            self.reset_search()
+            return
+        with timed("search.lookup"), PROFILER.action("search"):
+            row = self.manager.get_item(keyword)
         if row is None:
-            messagebox.showinfo(TITLE_NOT_FOUND, MSG_NOT_FOUND.format(keyword=keyword))
+            # Typo matches are not picked automatically; offer them instead
+            suggestions = self.manager.get_suggestions(keyword)[:5]
+            if suggestions:
+                message = MSG_NOT_FOUND_SUGGEST.format(keyword=keyword, suggestions="\n".join(suggestions))
+            else:
+                message = MSG_NOT_FOUND.format(keyword=keyword)
+            messagebox.showinfo(TITLE_NOT_FOUND, message)
             self.reset_search()
             return
         item_name = row["Item"]
+        key = row.get("Key")
+        if key is None:
+            key = item_name
         stock = row["Stock"]
         unit = row.get("Unit", self.config.default_unit)
         try:
@@ -180,13 +492,16 @@ class POSApp:
             return
         for item_id in self.tree.get_children():
             values = self.tree.item(item_id)["values"]
-            if values[0] == item_name:
+            if self.cart_keys.get(item_id) == key:
                 new_values = list(values)
                 new_values[2] = int(new_values[2]) + qty
                 self.tree.item(item_id, values=new_values)
                 self.reset_search()
                 return
-        self.tree.insert("", "end", values=(item_name, stock, qty, unit))
+        min_stock = row.get("MinStock")
+        low = min_stock is not None and int(stock) <= int(min_stock)
+        row_id = self.tree.insert("", "end", values=(item_name, stock, qty, unit), tags=("low",) if low else ())
+        self.cart_keys[row_id] = key
         self.reset_search()
 
     def edit_quantity(self):
@@ -215,6 +530,7 @@ class POSApp:
                 new_qty = int(qty_entry_popup.get())
                 if new_qty <= 0:
                     self.tree.delete(selected)
+                    self.cart_keys.pop(selected, None)
                 else:
                     item_data[2] = new_qty
                     self.tree.item(selected, values=item_data)
@@ -232,6 +548,7 @@ class POSApp:
             return
         for item_id in self.tree.get_children():
             self.tree.delete(item_id)
+        self.cart_keys.clear()
         self.focus_qty()
 
     def print_receipt(self):
@@ -243,21 +560,24 @@ class POSApp:
         if not confirm_modal(self.root, TITLE_PRINT, MSG_PRINT_CONFIRM):
             return
         items = []
+        lines = []
         for item_id in all_items:
             item_data = self.tree.item(item_id)["values"]
             item_name, stock, qty, unit = item_data
             items.append((item_name, stock, qty, unit))
-        success = self.printer.print(items)
-        if not success:
-            return
-        try:
-            for item_name, stock, qty, unit in items:
-                new_stock = int(stock) - int(qty)
-                self.manager.update_stock(item_name, new_stock)
-            self.manager.save()
-        except Exception as e:
-            messagebox.showerror(TITLE_SAVE_ERROR, f"Failed to update stock:\n{e}")
-            return
+            lines.append((self.cart_keys.get(item_id, item_name), item_name, stock, qty))
+        with PROFILER.action("checkout"):
+            success = self.printer.print(items)
+            if not success:
+                return
+            try:
+                with timed("checkout.save"):
+                    # One transaction for the whole cart on SQLite
+                    self.manager.checkout(lines, self.config.app_name or "POS")
+            except Exception as e:
+                messagebox.showerror(TITLE_SAVE_ERROR, f"Failed to update stock:\n{e}")
+                return
+        self.stock_written()
         self.remove_all()
 
     def reset_search(self):
@@ -0,0 +1,155 @@
+import logging
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from models.receiving import ReceivingRepository, parse_delivery_text
+from utils.constants import TITLE_RECEIVING, MSG_RECEIVING_DONE, MSG_RECEIVING_UNRESOLVED
+from utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+
+class ReceivingDialog(tk.Toplevel):
+    """Stock-in mode: paste or import a delivery list and commit it as one IN transaction.
+
+    Lines are resolved in one batch when "Check" is pressed; matched items and
+    unresolved lines are listed side by side before anything is written.
+    """
+
+    COLUMNS = ("Item", "Stock", "Qty", "After", "Unit")
+
+    def __init__(self, parent, receiving: ReceivingRepository, on_received=None):
+        super().__init__(parent)
+        self.title(TITLE_RECEIVING)
+        self.geometry("760x520")
+        self.transient(parent)
+        self.grab_set()
+        self.receiving = receiving
+        self.on_received = on_received
+        self._lines = []
+        self._preview = None
+
+        top = ttk.Frame(self)
+        top.pack(fill="x", padx=10, pady=(10, 4))
+        ttk.Label(top, text="Received by").pack(side="left")
+        self.person_var = tk.StringVar()
+        person_entry = ttk.Entry(top, textvariable=self.person_var, width=20)
+        person_entry.pack(side="left", padx=(4, 12))
+        ttk.Label(top, text="Notes").pack(side="left")
+        self.notes_var = tk.StringVar()
+        ttk.Entry(top, textvariable=self.notes_var, width=30).pack(side="left", padx=4)
+
+        body = ttk.Panedwindow(self, orient="horizontal")
+        body.pack(fill="both", expand=True, padx=10, pady=4)
+
+        # Left: raw delivery list (pasted, imported or scanned one code per line)
+        left = ttk.Labelframe(body, text="Delivery list (Code/Barcode/Name [, Qty])")
+        self.text = tk.Text(left, width=30, undo=True)
+        self.text.pack(fill="both", expand=True, padx=4, pady=4)
+        body.add(left, weight=1)
+
+        # Right: resolved lines and unresolved keys
+        right = ttk.Frame(body)
+        self.tree = ttk.Treeview(right, columns=self.COLUMNS, show="headings", height=12)
+        for col in self.COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=180 if col == "Item" else 60, anchor="w" if col in ("Item", "Unit") else "e")
+        self.tree.pack(fill="both", expand=True)
+        ttk.Label(right, text="Unresolved").pack(anchor="w", pady=(6, 0))
+        self.unresolved = tk.Listbox(right, height=5)
+        self.unresolved.pack(fill="x")
+        body.add(right, weight=2)
+
+        self.status_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.status_var).pack(anchor="w", padx=10)
+
+        btns = ttk.Frame(self)
+        btns.pack(fill="x", padx=10, pady=(4, 10))
+        ttk.Button(btns, text="Close", command=self.destroy).pack(side="right")
+        ttk.Button(btns, text="Receive (F12)", command=self.commit).pack(side="right", padx=8)
+        ttk.Button(btns, text="Check (F5)", command=self.check).pack(side="right")
+        ttk.Button(btns, text="Import...", command=self.import_file).pack(side="left")
+
+        self.bind("<F5>", lambda e: self.check())
+        self.bind("<F12>", lambda e: self.commit())
+        self.bind("<Escape>", lambda e: self.destroy())
+        person_entry.focus_set()
+
+    def import_file(self):
+        """Load a CSV/TSV delivery list or scanner export into the text box."""
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="Import delivery list",
+            filetypes=[("Delivery lists", "*.csv *.tsv *.txt"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            with open(path, encoding="utf-8-sig") as f:
+                content = f.read()
+        except OSError as e:
+            messagebox.showerror(TITLE_RECEIVING, f"Failed to read {path}:\n{e}", parent=self)
+            return
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", content)
+        self.check()
+
+    @timed("receiving.check")
+    def check(self):
+        """Parse the list and resolve every line in one batch lookup."""
+        try:
+            self._lines = parse_delivery_text(self.text.get("1.0", tk.END))
+            self._preview = self.receiving.preview(self._lines)
+        except ValueError as e:
+            messagebox.showerror(TITLE_RECEIVING, str(e), parent=self)
+            return False
+        except Exception as e:
+            logger.exception("Delivery preview failed")
+            messagebox.showerror(TITLE_RECEIVING, f"Failed to check delivery:\n{e}", parent=self)
+            return False
+        self.tree.delete(*self.tree.get_children())
+        for row in self._preview["items"]:
+            self.tree.insert("", "end", values=(row["name"], row["stock_before"], row["qty"], row["stock_after"], row["unit"]))
+        self.unresolved.delete(0, tk.END)
+        for u in self._preview["unresolved"]:
+            self.unresolved.insert(tk.END, f"line {u['line']}: {u['key']} x{u['qty']}")
+        self.status_var.set(
+            f"{self._preview['lines']} lines, {len(self._preview['items'])} items, "
+            f"{self._preview['total_qty']} units, {len(self._preview['unresolved'])} unresolved"
+        )
+        return True
+
+    @timed("receiving.commit")
+    def commit(self):
+        """Write the delivery as one IN transaction."""
+        if not self.check() or not self._preview["items"]:
+            return
+        person = self.person_var.get().strip()
+        if not person:
+            messagebox.showerror(TITLE_RECEIVING, "Enter who received the delivery.", parent=self)
+            return
+        skip = False
+        if self._preview["unresolved"]:
+            skip = messagebox.askyesno(
+                TITLE_RECEIVING,
+                MSG_RECEIVING_UNRESOLVED.format(count=len(self._preview["unresolved"])),
+                parent=self,
+            )
+            if not skip:
+                return
+        try:
+            result = self.receiving.receive(self._lines, person, notes=self.notes_var.get().strip() or None, skip_unresolved=skip)
+        except ValueError as e:
+            messagebox.showerror(TITLE_RECEIVING, str(e), parent=self)
+            return
+        except Exception as e:
+            logger.exception("Receiving failed")
+            messagebox.showerror(TITLE_RECEIVING, f"Failed to save delivery:\n{e}", parent=self)
+            return
+        messagebox.showinfo(
+            TITLE_RECEIVING,
+            MSG_RECEIVING_DONE.format(number=result["transaction_number"], items=len(result["items"]), qty=result["total_qty"]),
+            parent=self,
+        )
+        if self.on_received:
+            self.on_received(result)
+        self.destroy()
@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from utils.constants import TITLE_INVALID_SETTINGS
+from utils.constants import TITLE_INVALID_SETTINGS, DATA_SOURCES
 from config.manager import ConfigManager
 
 class SettingsDialog(tk.Toplevel):
@@ -54,13 +54,17 @@ class SettingsDialog(tk.Toplevel):
         ttk.Entry(db_row, textvariable=self.db_path_var, width=28).pack(side="left")
         ttk.Button(db_row, text="Browse", command=self.browse_db).pack(side="left", padx=4)
 
-        ttk.Label(frm, text="Default Unit").grid(row=7, column=0, sticky="w", **pad)
+        ttk.Label(frm, text="Data Source").grid(row=7, column=0, sticky="w", **pad)
+        self.source_var = tk.StringVar(value=self.config_manager.data_source)
+        ttk.Combobox(frm, textvariable=self.source_var, values=DATA_SOURCES, state="readonly", width=10).grid(row=7, column=1, sticky="w", **pad)
+
+        ttk.Label(frm, text="Default Unit").grid(row=8, column=0, sticky="w", **pad)
         self.unit_var = tk.StringVar(value=self.config_manager.default_unit)
-        ttk.Entry(frm, textvariable=self.unit_var, width=12).grid(row=7, column=1, sticky="w", **pad)
+        ttk.Entry(frm, textvariable=self.unit_var, width=12).grid(row=8, column=1, sticky="w", **pad)
 
         # Actions
         btns = ttk.Frame(frm)
-        btns.grid(row=8, column=0, columnspan=2, sticky="e", pady=(10, 0))
+        btns.grid(row=9, column=0, columnspan=2, sticky="e", pady=(10, 0))
         ttk.Button(btns, text="Cancel", command=self.destroy).pack(side="right")
         ttk.Button(btns, text="Save", command=self.save).pack(side="right", padx=8)
 
@@ -114,19 +118,22 @@ class SettingsDialog(tk.Toplevel):
             messagebox.showerror(TITLE_INVALID_SETTINGS, str(e))
             return
 
-        data = {
-            "app_name": self.app_name_var.get().strip() or "Inventory App",
-            "company_name": self.company_var.get().strip(),
-            "printer": {
-                "port": port or "COM6",
-                "baudrate": baud,
-                "timeout": timeout,
-            },
-            "data": {
-                "csv_path": csv_path,
-                "db_path": db_path,
-                "default_unit": self.unit_var.get().strip() or "pcs",
-            },
+        # Merge into the existing config so sections not edited here are kept
+        data = dict(self.config_manager._data)
+        data["app_name"] = self.app_name_var.get().strip() or "Inventory App"
+        data["company_name"] = self.company_var.get().strip()
+        data["printer"] = {
+            **data.get("printer", {}),
+            "port": port or "COM6",
+            "baudrate": baud,
+            "timeout": timeout,
+        }
+        data["data"] = {
+            **data.get("data", {}),
+            "csv_path": csv_path,
+            "db_path": db_path,
+            "source": self.source_var.get() or "csv",
+            "default_unit": self.unit_var.get().strip() or "pcs",
         }
         self.config_manager._data = data
         self.config_manager.save()
@@ -7,6 +7,11 @@ DEFAULT_UNIT = "pcs"
 # Data paths (relative to project root by default)
 DEFAULT_CSV_PATH = "data/barang.csv"
 DEFAULT_DB_PATH = "db/app.db"
+DEFAULT_DATA_SOURCE = "csv"
+# Poll for other tills' commits this often (SQLite source; 0 disables)
+DEFAULT_WATCH_INTERVAL_MS = 1000
+# "compact": the CSV file held in the array-backed ItemStore (no pandas)
+DATA_SOURCES = ("csv", "sqlite", "compact")
 
 # Printer defaults
 DEFAULT_PRINTER_PORT = "COM6"
@@ -17,6 +22,49 @@ DEFAULT_PRINTER_TIMEOUT = 1
 LOGS_DIR = "logs"
 APP_LOG_FILE = "app.log"
 
+# Diagnostics
+DEFAULT_SLOW_QUERY_MS = 100
+DEFAULT_METRICS_DUMP_INTERVAL_S = 300
+METRICS_DUMP_FILE = "metrics.json"
+DEFAULT_PROFILE_WINDOW_S = 60
+
+# Search
+DEFAULT_SEARCH_FUZZY = True
+DEFAULT_SUGGESTION_LIMIT = 50
+
+# Local inventory server (handhelds, extra tills)
+DEFAULT_SERVER_HOST = "127.0.0.1"
+DEFAULT_SERVER_PORT = 8765
+DEFAULT_SERVER_DB_WORKERS = 4
+DEFAULT_SERVER_MAX_PENDING = 256
+DEFAULT_SERVER_BATCH_WINDOW_MS = 2
+DEFAULT_SERVER_KEEPALIVE_S = 15
+DEFAULT_COMMIT_INTERVAL_MS = 5
+DEFAULT_COMMIT_MAX_COMMANDS = 64
+
+# Database backups
+DEFAULT_BACKUP_ENABLED = True
+DEFAULT_BACKUP_DIR = "backups"
+DEFAULT_BACKUP_INTERVAL_H = 24
+DEFAULT_BACKUP_KEEP = 7
+DEFAULT_BACKUP_COMPRESS = True
+DEFAULT_BACKUP_PAGES_PER_STEP = 256
+
+# Database maintenance (ANALYZE/optimize, incremental vacuum)
+DEFAULT_MAINTENANCE_ENABLED = True
+DEFAULT_MAINTENANCE_IDLE_MINUTES = 5
+DEFAULT_MAINTENANCE_INTERVAL_H = 6
+DEFAULT_MAINTENANCE_VACUUM_PAGES = 0
+# 0: idle runs never VACUUM (it locks out other tills and the server)
+DEFAULT_MAINTENANCE_CONVERT_MAX_MB = 0
+# change_log entries (when no branch sync is recorded) and low-stock events older than this are pruned
+DEFAULT_MAINTENANCE_LOG_KEEP_DAYS = 30
+
+# Startup cache
+CACHE_DIR = "cache"
+CATALOGUE_CACHE_FILE = "catalogue.pickle"
+COMPACT_CACHE_FILE = "catalogue-compact.pickle"
+
 # UI message titles
 TITLE_INVALID_SETTINGS = "Invalid Settings"
 TITLE_INVALID_QUANTITY = "Invalid Quantity"
@@ -27,10 +75,21 @@ TITLE_PRINT_ERROR = "Print Error"
 TITLE_SAVE_ERROR = "Save Error"
 TITLE_CONFIG_ERROR = "Config Error"
 TITLE_INVENTORY_ERROR = "Inventory Error"
+TITLE_DIAGNOSTICS = "Diagnostics"
+TITLE_RECEIVING = "Receive Stock"
+TITLE_LOW_STOCK = "Low Stock"
 
 # UI message bodies
 MSG_INVALID_QTY_NONNEG = "Please enter a valid non-negative integer for quantity."
 MSG_INVALID_QTY_INT = "Please enter a valid integer quantity."
 MSG_NOT_FOUND = "No item found matching: {keyword}"
+MSG_NOT_FOUND_SUGGEST = "No item found matching: {keyword}\n\nDid you mean:\n{suggestions}"
 MSG_PRINT_CONFIRM = "Print the receipt and update stock?"
 MSG_CLEAR_CONFIRM = "Clear all items from the cart?"
+MSG_PROFILE_ARMED = "The next {action} will be profiled. Output goes to the logs folder."
+MSG_PROFILE_WINDOW = "Profiling for {seconds} seconds. Output goes to the logs folder."
+MSG_PROFILE_BUSY = "A profiling capture is already running."
+MSG_RECEIVING_SQLITE_ONLY = "Receiving needs the SQLite data source (Settings > Data Source)."
+MSG_RECEIVING_UNRESOLVED = "{count} line(s) did not match an item. Receive the matched lines anyway?"
+MSG_LOW_STOCK_COUNT = "{count} item(s) at or below minimum stock - click to list"
+MSG_RECEIVING_DONE = "Saved {number}: {items} items, {qty} units."
@@ -0,0 +1,90 @@
+import json
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+from utils.constants import LOGS_DIR, APP_LOG_FILE
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+_listener = None
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def is_configured() -> bool:
+    return _listener is not None
+
+
+def setup_logging(logs_dir=LOGS_DIR, level=logging.INFO, json_lines: bool = False, console: bool = True):
+    """Route all logging through a queue drained by a background listener.
+
+    Callers (e.g. the Tk thread) only enqueue records; file and console I/O
+    happen on the listener thread. Configures the root logger once; later
+    calls return the existing listener.
+
+    Args:
+        logs_dir: Directory for the rotating log file.
+        level: Root logger level (name or number).
+        json_lines: Write the file as JSON lines instead of text.
+        console: Also echo records to stderr (always text).
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    if isinstance(level, str):
+        # getLevelName maps known names to numbers and echoes unknown ones back
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+
+    logs_dir = Path(logs_dir)
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    file_handler = RotatingFileHandler(logs_dir / APP_LOG_FILE, maxBytes=512_000, backupCount=3, encoding="utf-8")
+    file_handler.setFormatter(JsonLineFormatter() if json_lines else logging.Formatter(TEXT_FORMAT))
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(console_handler)
+
+    q = queue.SimpleQueue()
+    root = logging.getLogger()
+    # Replace any direct handlers so records are written exactly once
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(QueueHandler(q))
+    root.setLevel(level)
+
+    _listener = QueueListener(q, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for h in listener.handlers:
+        h.close()
@@ -0,0 +1,157 @@
+"""In-process timing metrics for hot paths.
+
+Usage:
+    from utils.metrics import timed, METRICS
+
+    @timed("printer.print")
+    def print(...): ...
+
+    with timed("checkout.save"):
+        ...
+
+    METRICS.snapshot()  # {"printer.print": {"count": .., "p50_ms": .., ...}}
+"""
+import json
+import time
+import logging
+import threading
+from collections import deque
+from functools import wraps
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Samples kept per metric for percentiles (most recent window)
+WINDOW_SIZE = 2048
+
+
+class Histogram:
+    """Duration samples of one metric: lifetime count/total/max plus a recent window."""
+
+    __slots__ = ("count", "total_ms", "max_ms", "samples")
+
+    def __init__(self, window: int = WINDOW_SIZE):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=window)
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        self.samples.append(ms)
+
+    def summary(self) -> dict:
+        values = sorted(self.samples)
+
+        def pct(p):
+            if not values:
+                return 0.0
+            return values[min(len(values) - 1, int(p / 100.0 * len(values)))]
+
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(pct(50), 3),
+            "p95_ms": round(pct(95), 3),
+            "p99_ms": round(pct(99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe collection of named histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._dump_thread = None
+        self._dump_stop = threading.Event()
+
+    def record(self, name: str, ms: float) -> None:
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram()
+            hist.add(ms)
+
+    def snapshot(self) -> dict:
+        """Return {name: summary} for all metrics, sorted by name."""
+        with self._lock:
+            return {name: self._histograms[name].summary() for name in sorted(self._histograms)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def dump(self, path) -> None:
+        """Write the current snapshot as JSON (atomic replace)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        payload = {"timestamp": time.strftime("%Y-%m-%d %H:%M:%S"), "metrics": self.snapshot()}
+        tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        tmp.replace(path)
+
+    def start_periodic_dump(self, path, interval_s: float) -> None:
+        """Dump to `path` every `interval_s` seconds from a daemon thread."""
+        self.stop_periodic_dump()
+        if interval_s <= 0:
+            return
+        self._dump_stop = threading.Event()
+
+        def run(stop):
+            while not stop.wait(interval_s):
+                try:
+                    self.dump(path)
+                except Exception:
+                    logger.exception("Failed writing metrics dump to %s", path)
+
+        self._dump_thread = threading.Thread(target=run, args=(self._dump_stop,), name="metrics-dump", daemon=True)
+        self._dump_thread.start()
+
+    def stop_periodic_dump(self) -> None:
+        if self._dump_thread is not None:
+            self._dump_stop.set()
+            self._dump_thread = None
+
+
+METRICS = MetricsRegistry()
+
+
+class timed:
+    """Record the duration of a block or function call into METRICS.
+
+    Works as a context manager (`with timed("name"):`) and as a decorator
+    (`@timed("name")`).
+    """
+
+    __slots__ = ("name", "registry", "_start")
+
+    def __init__(self, name: str, registry: MetricsRegistry = METRICS):
+        self.name = name
+        self.registry = registry
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.record(self.name, (time.perf_counter() - self._start) * 1000.0)
+        return False
+
+    def __call__(self, fn):
+        name, registry = self.name, self.registry
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                registry.record(name, (time.perf_counter() - start) * 1000.0)
+
+        return wrapper
@@ -0,0 +1,115 @@
+"""On-demand cProfile + tracemalloc capture for the running POS.
+
+Two modes, both writing into logs/:
+- window: profile everything on the UI thread for a bounded number of seconds
+- action: arm an action name (e.g. "checkout"); the next `PROFILER.action(name)`
+  block is profiled, then the profiler disarms itself
+
+When nothing is armed or running, `PROFILER.action(...)` costs one attribute
+check and no profiler or tracemalloc hooks are installed.
+"""
+import io
+import time
+import pstats
+import logging
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+from utils.constants import LOGS_DIR
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ACTIONS = ("checkout", "search", "load")
+
+
+class Profiler:
+    """Capture cProfile stats and tracemalloc snapshots to files."""
+
+    def __init__(self, out_dir=LOGS_DIR, top: int = 40):
+        self.out_dir = Path(out_dir)
+        self.top = top
+        self.armed_action = None
+        self._profile = None
+        self._tag = None
+        self._started_tracemalloc = False
+
+    @property
+    def running(self) -> bool:
+        return self._profile is not None
+
+    def start(self, tag: str) -> bool:
+        """Start profiling the calling thread; False if a capture is already running."""
+        if self.running:
+            return False
+        self._tag = tag
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            self._started_tracemalloc = True
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        logger.info("Profiling started (%s)", tag)
+        return True
+
+    def stop(self) -> list:
+        """Stop the running capture and write its files; returns the written paths."""
+        if not self.running:
+            return []
+        profile, self._profile = self._profile, None
+        profile.disable()
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        try:
+            return self._write(profile, snapshot)
+        except Exception:
+            logger.exception("Failed writing profile output for %s", self._tag)
+            return []
+
+    def _write(self, profile, snapshot) -> list:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        base = self.out_dir / f"profile-{self._tag}-{time.strftime('%Y%m%d-%H%M%S')}"
+        prof_path = base.with_suffix(".prof")
+        profile.dump_stats(str(prof_path))
+        paths = [prof_path]
+
+        # Human-readable summary next to the binary files for quick triage
+        buf = io.StringIO()
+        pstats.Stats(profile, stream=buf).sort_stats("cumulative").print_stats(self.top)
+        if snapshot is not None:
+            snap_path = base.with_suffix(".tracemalloc")
+            snapshot.dump(str(snap_path))
+            paths.append(snap_path)
+            buf.write("\nTop allocations by line:\n")
+            for stat in snapshot.statistics("lineno")[: self.top]:
+                buf.write(f"{stat}\n")
+        txt_path = base.with_suffix(".txt")
+        txt_path.write_text(buf.getvalue(), encoding="utf-8")
+        paths.append(txt_path)
+        logger.info("Profiling stopped (%s); wrote %s", self._tag, ", ".join(str(p) for p in paths))
+        return paths
+
+    def arm(self, action: str) -> None:
+        """Profile the next run of `action`."""
+        if action not in PROFILE_ACTIONS:
+            raise ValueError(f"Unknown profile action: {action}")
+        self.armed_action = action
+        logger.info("Profiling armed for next %s", action)
+
+    @contextmanager
+    def action(self, name: str):
+        """Profile this block if `name` is armed (one-shot)."""
+        if self.armed_action != name or self.running:
+            yield
+            return
+        self.armed_action = None
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+
+PROFILER = Profiler()
@@ -1,9 +1,9 @@
 import datetime
-from escpos.printer import Serial
 from tkinter import messagebox
 import logging
 import time
 from utils.constants import TITLE_PRINT_ERROR
+from utils.metrics import timed
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +21,7 @@ class ReceiptPrinter:
         self.baudrate = baudrate
         self.timeout = timeout
 
+    @timed("printer.print")
     def print(self, items):
         """Print a simple receipt.
 
@@ -37,6 +38,8 @@ class ReceiptPrinter:
         attempts = 2
         for attempt in range(1, attempts + 1):
             try:
+                # Imported on first print: escpos/pyserial are slow to import and not needed at startup
+                from escpos.printer import Serial
                 printer = Serial(devfile=self.port, baudrate=self.baudrate, timeout=self.timeout)
                 printer.set(align='center')
                 printer.text("Barang Gudang\n")